@@ -0,0 +1,40 @@
+"""
+Measures the rate at which a :py:class:`~itsim.machine.node.Node` binds and closes sockets on ephemeral ports, as a
+function of the number of sockets it keeps open throughout.
+
+Usage::
+
+    python benchmarks/bind_sockets.py [num_sockets_open ...]
+"""
+
+import sys
+from time import perf_counter
+from typing import List
+
+from itsim.machine.endpoint import Endpoint
+
+
+NUMS_SOCKETS_OPEN = [0, 1000, 20000, 28000]
+NUM_BINDS = 50000
+
+
+def binds_per_second(num_sockets_open: int, num_binds: int = NUM_BINDS) -> float:
+    endpoint = Endpoint()
+    sockets_open = [endpoint.bind() for _ in range(num_sockets_open)]
+    start = perf_counter()
+    for _ in range(num_binds):
+        endpoint.bind().close()
+    elapsed = perf_counter() - start
+    for socket in sockets_open:
+        socket.close()
+    return num_binds / elapsed
+
+
+def main(nums_sockets_open: List[int]) -> None:
+    print(f"{'Open':>8}  {'Binds/s':>12}")
+    for num_sockets_open in nums_sockets_open:
+        print(f"{num_sockets_open:>8}  {binds_per_second(num_sockets_open):>12.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_SOCKETS_OPEN)
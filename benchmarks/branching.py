@@ -0,0 +1,83 @@
+"""
+Measures the wall time of trying several scenarios from the same warmed-up state of a simulation: either by replaying
+the warm-up for each scenario, or by warming up once, then branching the simulation for each scenario.
+
+Usage::
+
+    python benchmarks/branching.py [num_branches ...]
+"""
+
+from random import Random
+import sys
+from time import perf_counter
+from typing import Any, Dict, List
+
+from itsim.simulator import Simulator, advance, now
+
+
+NUMS_BRANCHES = [1, 4, 16]
+NUM_WORKSTATIONS = 200
+WARM_UP = 2 * 3600.0
+DURATION_SCENARIO = 60.0
+
+
+def workstation(rng: Random) -> None:
+    while True:
+        advance(rng.expovariate(0.1))
+
+
+def attacker(hits: List[float], period: float) -> None:
+    while True:
+        advance(period)
+        hits.append(now())
+
+
+def warm_up() -> Simulator:
+    sim = Simulator()
+    for n in range(NUM_WORKSTATIONS):
+        sim.add(workstation, Random(n))
+    sim.run(WARM_UP)
+    return sim
+
+
+def attack(sim: Simulator, period: float) -> Dict[str, Any]:
+    hits: List[float] = []
+    sim.add(attacker, hits, period)
+    return {"hits": hits}
+
+
+def num_hits(model: Dict[str, Any]) -> int:
+    return len(model["hits"])
+
+
+def replayed(num_branches: int) -> float:
+    start = perf_counter()
+    for n in range(num_branches):
+        sim = warm_up()
+        model = attack(sim, n + 1.0)
+        sim.run(DURATION_SCENARIO)
+        num_hits(model)
+        sim._clear()
+    return perf_counter() - start
+
+
+def branched(num_branches: int) -> float:
+    start = perf_counter()
+    sim = warm_up()
+    outcomes = sim.branch(attack, [n + 1.0 for n in range(num_branches)], {"hits": num_hits}, DURATION_SCENARIO)
+    assert all(outcome.is_success() for outcome in outcomes)
+    sim._clear()
+    return perf_counter() - start
+
+
+def main(nums_branches: List[int]) -> None:
+    print(f"{'Branches':>8}  {'Replayed (s)':>12}  {'Branched (s)':>12}  {'Speedup':>7}")
+    for num_branches in nums_branches:
+        time_replayed = replayed(num_branches)
+        time_branched = branched(num_branches)
+        speedup = time_replayed / time_branched
+        print(f"{num_branches:>8}  {time_replayed:>12.2f}  {time_branched:>12.2f}  {speedup:>7.2f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_BRANCHES)
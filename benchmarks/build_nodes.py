@@ -0,0 +1,62 @@
+"""
+Measures the time and memory it takes to build a topology of many nodes, each connected to one of a few links. Memory
+is traced by :py:mod:`tracemalloc`, in a separate build from that timed.
+
+Usage::
+
+    python benchmarks/build_nodes.py [num_nodes ...]
+"""
+
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import List, Tuple
+
+from greensim.random import constant
+
+from itsim.machine.endpoint import Endpoint
+from itsim.network.link import Link
+from itsim.units import MS, MbPS
+
+
+NUMS_NODES = [1000, 10000]
+NUM_NODES_PER_LINK = 250
+
+
+def build_topology(num_nodes: int) -> List[Endpoint]:
+    links = [
+        Link(f"10.{n // 256}.{n % 256}.0/24", constant(1 * MS), constant(100 * MbPS))
+        for n in range((num_nodes + NUM_NODES_PER_LINK - 1) // NUM_NODES_PER_LINK)
+    ]
+    nodes = []
+    for n in range(num_nodes):
+        node = Endpoint()
+        node.connected_to_static(links[n // NUM_NODES_PER_LINK], n % NUM_NODES_PER_LINK + 1)
+        nodes.append(node)
+    return nodes
+
+
+def build(num_nodes: int) -> Tuple[float, float]:
+    start = perf_counter()
+    build_topology(num_nodes)
+    elapsed = perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        nodes = build_topology(num_nodes)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, (after - before) / len(nodes)
+
+
+def main(nums_nodes: List[int]) -> None:
+    print(f"{'Nodes':>8}  {'Build (s)':>10}  {'Bytes/node':>11}")
+    for num_nodes in nums_nodes:
+        elapsed, bytes_per_node = build(num_nodes)
+        print(f"{num_nodes:>8}  {elapsed:>10.3f}  {bytes_per_node:>11.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_NODES)
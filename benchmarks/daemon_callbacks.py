@@ -0,0 +1,64 @@
+"""
+Measures the rate at which a networking daemon that never blocks handles bursts of packets, when triggered from greensim
+processes (the default) and when triggered as callback computations.
+
+Usage::
+
+    python benchmarks/daemon_callbacks.py [size_burst ...]
+"""
+
+import sys
+from time import perf_counter
+from typing import List
+
+from itsim.machine.endpoint import Endpoint
+from itsim.machine.process_management.daemon import Daemon
+from itsim.network.location import Location
+from itsim.network.packet import Packet
+from itsim.simulator import Simulator, advance
+from itsim.types import Protocol
+
+
+SIZES_BURST = [1, 10, 100]
+NUM_PACKETS = 50000
+PORT = 53
+
+
+def packets_per_second(size_burst: int, blocking: bool, num_packets: int = NUM_PACKETS) -> float:
+    endpoint = Endpoint()
+    packet = Packet(Location("10.0.0.2", 32768), Location("10.0.0.1", PORT), 300)
+    num_bursts = num_packets // size_burst
+    num_handled = [0]
+
+    def handle(context, packet, socket) -> None:
+        num_handled[0] += 1
+
+    sim = Simulator()
+    endpoint.run_networking_daemon(sim, Daemon(handle, blocking), Protocol.UDP, PORT)
+
+    def send() -> None:
+        socket = endpoint._sockets[PORT]()
+        for _ in range(num_bursts):
+            advance(1.0)
+            for _ in range(size_burst):
+                socket._enqueue(packet)
+
+    sim.add(send)
+    start = perf_counter()
+    sim.run()
+    elapsed = perf_counter() - start
+    assert num_handled[0] == num_bursts * size_burst
+    return num_handled[0] / elapsed
+
+
+def main(sizes_burst: List[int]) -> None:
+    print(f"{'Burst':>6}  {'process (pkt/s)':>16}  {'callback (pkt/s)':>17}")
+    for size_burst in sizes_burst:
+        print(
+            f"{size_burst:>6}  {packets_per_second(size_burst, True):>16.0f}  "
+            f"{packets_per_second(size_burst, False):>17.0f}"
+        )
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or SIZES_BURST)
@@ -0,0 +1,64 @@
+"""
+Measures the rate at which a networking daemon handles bursts of packets, and the peak number of threads it runs, when
+it clones a thread for each packet received and when it runs as a pool of worker threads.
+
+Usage::
+
+    python benchmarks/daemon_workers.py [size_burst ...]
+"""
+
+import sys
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+from itsim.machine.endpoint import Endpoint
+from itsim.machine.process_management.daemon import Daemon
+from itsim.network.location import Location
+from itsim.network.packet import Packet
+from itsim.simulator import Simulator, advance
+from itsim.types import Protocol
+
+
+SIZES_BURST = [10, 100, 1000]
+NUM_PACKETS = 20000
+NUM_WORKERS = 8
+PORT = 80
+
+
+def run(size_burst: int, num_workers: Optional[int], num_packets: int = NUM_PACKETS) -> Tuple[float, int]:
+    endpoint = Endpoint()
+    packet = Packet(Location("10.0.0.2", 32768), Location("10.0.0.1", PORT), 300)
+    num_bursts = num_packets // size_burst
+    peak = [0]
+
+    def handle(context, packet, socket) -> None:
+        peak[0] = max(peak[0], len(context.process._threads))
+        advance(0.01)
+
+    sim = Simulator()
+    endpoint.run_networking_daemon(sim, Daemon(handle), Protocol.TCP, PORT, num_workers=num_workers)
+
+    def send() -> None:
+        socket = endpoint._sockets[PORT]()
+        for _ in range(num_bursts):
+            advance(1.0)
+            for _ in range(size_burst):
+                socket._enqueue(packet)
+
+    sim.add(send)
+    start = perf_counter()
+    sim.run()
+    elapsed = perf_counter() - start
+    return num_bursts * size_burst / elapsed, peak[0]
+
+
+def main(sizes_burst: List[int]) -> None:
+    print(f"{'Burst':>6}  {'clone (pkt/s)':>14}  {'threads':>8}  {'pool (pkt/s)':>13}  {'threads':>8}")
+    for size_burst in sizes_burst:
+        rate_clone, peak_clone = run(size_burst, None)
+        rate_pool, peak_pool = run(size_burst, NUM_WORKERS)
+        print(f"{size_burst:>6}  {rate_clone:>14.0f}  {peak_clone:>8}  {rate_pool:>13.0f}  {peak_pool:>8}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or SIZES_BURST)
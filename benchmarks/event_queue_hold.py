@@ -0,0 +1,61 @@
+"""
+Measures the throughput of the event queues of a simulator under the hold model: with a given number of events pending,
+each event run schedules a new one, at an exponentially distributed delay. The queue thus stays the same size, and each
+event costs one dequeue and one enqueue.
+
+Usage::
+
+    python benchmarks/event_queue_hold.py [num_pending ...]
+
+The largest size takes a few gigabytes of memory.
+"""
+
+import gc
+from random import Random
+import sys
+from time import perf_counter
+from typing import Callable, List, Optional
+
+from itsim.event_queue import CalendarQueue, EventQueue
+from itsim.simulator import Simulator
+
+
+NUMS_PENDING = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+NUM_HOLDS = 200000
+
+
+def holds_per_second(
+    num_pending: int,
+    new_queue: Callable[[], Optional[EventQueue]],
+    num_holds: int = NUM_HOLDS
+) -> float:
+    rng = Random(1)
+    sim = Simulator(queue=new_queue())
+    left = num_holds
+
+    def hold() -> None:
+        nonlocal left
+        sim._schedule(rng.expovariate(1.0), hold)
+        left -= 1
+        if left == 0:
+            sim.stop()
+
+    for _ in range(num_pending):
+        sim._schedule(rng.expovariate(1.0), hold)
+    start = perf_counter()
+    sim.run()
+    return num_holds / (perf_counter() - start)
+
+
+def main(nums_pending: List[int]) -> None:
+    print(f"{'Pending':>9}  {'Heap (holds/s)':>14}  {'Calendar (holds/s)':>18}  {'Speedup':>7}")
+    for num_pending in nums_pending:
+        heap = holds_per_second(num_pending, lambda: None)
+        gc.collect()
+        calendar = holds_per_second(num_pending, CalendarQueue)
+        gc.collect()
+        print(f"{num_pending:>9}  {heap:>14.0f}  {calendar:>18.0f}  {calendar / heap:>7.2f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_PENDING)
@@ -0,0 +1,65 @@
+"""
+Compares the cost of simulating a bulk transfer between two nodes sent packet by packet, to that of sending it as a
+single flow.
+
+Usage::
+
+    python benchmarks/flow_transfer.py [num_megabytes ...]
+"""
+
+import sys
+from time import perf_counter
+from typing import List, Tuple
+
+from greensim.random import constant
+
+from itsim.machine.endpoint import Endpoint
+from itsim.network.link import Link
+from itsim.simulator import Simulator
+from itsim.software.context import Context
+from itsim.types import Protocol
+from itsim.units import MS, MB
+
+
+NUMS_MEGABYTES = [1, 10, 100]
+SIZE_PACKET = 1500
+BANDWIDTH = 80 * MB  # 10 MB per second.
+
+
+def transfer(num_bytes: int, as_flow: bool) -> Tuple[float, float]:
+    link = Link("10.0.0.0/24", constant(1 * MS), constant(BANDWIDTH))
+    sender = Endpoint().connected_to_static(link, 1)
+    receiver = Endpoint().connected_to_static(link, 2)
+    num_packets = 1 if as_flow else -(-num_bytes // SIZE_PACKET)
+
+    def receive(context: Context) -> None:
+        with context.node.bind(Protocol.TCP, 80) as socket:
+            for _ in range(num_packets):
+                socket.recv()
+
+    def send(context: Context) -> None:
+        with context.node.bind(Protocol.TCP) as socket:
+            if as_flow:
+                socket.send_flow(("10.0.0.2", 80), num_bytes).wait()
+            else:
+                for _ in range(num_packets):
+                    socket.send(("10.0.0.2", 80), SIZE_PACKET)
+
+    sim = Simulator()
+    receiver.run_proc(sim, receive)
+    sender.run_proc(sim, send)
+    start = perf_counter()
+    sim.run()
+    return perf_counter() - start, sim.now()
+
+
+def main(nums_megabytes: List[int]) -> None:
+    print(f"{'MB':>6}  {'Packets (s)':>12}  {'Flow (s)':>12}")
+    for num_megabytes in nums_megabytes:
+        time_packets, _ = transfer(num_megabytes * MB, False)
+        time_flow, _ = transfer(num_megabytes * MB, True)
+        print(f"{num_megabytes:>6}  {time_packets:>12.4f}  {time_flow:>12.4f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_MEGABYTES)
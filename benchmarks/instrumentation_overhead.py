@@ -0,0 +1,47 @@
+"""
+Measures the rate at which a simulator runs the events of many concurrent processes, without instruments and with
+:py:class:`~itsim.instrumentation.Instruments` attached.
+
+Usage::
+
+    python benchmarks/instrumentation_overhead.py [num_processes ...]
+"""
+
+from io import StringIO
+import sys
+from time import perf_counter
+from typing import List
+
+from itsim.simulator import Simulator, advance
+
+
+NUMS_PROCESSES = [10, 1000]
+NUM_EVENTS = 200000
+
+
+def sleeper(num: int) -> None:
+    for _ in range(num):
+        advance(1.0)
+
+
+def events_per_second(num_processes: int, instrumented: bool, num_events: int = NUM_EVENTS) -> float:
+    sim = Simulator()
+    if instrumented:
+        sim.instrument(file=StringIO())
+    for _ in range(num_processes):
+        sim.add(sleeper, num_events // num_processes)
+    start = perf_counter()
+    sim.run()
+    return num_events / (perf_counter() - start)
+
+
+def main(nums_processes: List[int]) -> None:
+    print(f"{'Processes':>9}  {'Plain (ev/s)':>12}  {'Instrumented (ev/s)':>19}  {'Overhead':>8}")
+    for num_processes in nums_processes:
+        plain = events_per_second(num_processes, False)
+        instrumented = events_per_second(num_processes, True)
+        print(f"{num_processes:>9}  {plain:>12.0f}  {instrumented:>19.0f}  {plain / instrumented - 1.0:>8.0%}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_PROCESSES)
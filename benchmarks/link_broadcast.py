@@ -0,0 +1,59 @@
+"""
+Measures the cost of broadcasting on a :py:class:`~itsim.network.link.Link`, as a function of the number of nodes
+connected to the link: the number of events queued in the simulator per broadcast, and the rate at which broadcast
+packets are sent and delivered.
+
+Usage::
+
+    python benchmarks/link_broadcast.py [num_nodes ...]
+"""
+
+import sys
+from time import perf_counter
+from typing import List, Tuple
+
+from greensim.random import constant
+
+from itsim.machine.endpoint import Endpoint
+from itsim.network.link import Link
+from itsim.network.location import Location
+from itsim.network.packet import Packet
+from itsim.simulator import Simulator
+from itsim.types import as_address
+from itsim.units import MS, MbPS
+
+
+NUMS_NODES = [100, 500, 2000]
+NUM_BROADCASTS = 50
+
+
+def broadcast(num_nodes: int, num_broadcasts: int = NUM_BROADCASTS) -> Tuple[float, float]:
+    link = Link("10.0.0.0/16", constant(1 * MS), constant(100 * MbPS))
+    for n in range(num_nodes):
+        Endpoint().connected_to_static(link, as_address(n + 1, link.cidr))
+    broadcast_address = link.cidr.broadcast_address
+    packet = Packet(Location(as_address(1, link.cidr), 68), Location(broadcast_address, 67), 300)
+    num_events = 0
+
+    def send_all() -> None:
+        nonlocal num_events
+        for _ in range(num_broadcasts):
+            link._transfer_packet(packet, broadcast_address)
+        num_events = len(sim._events)
+
+    sim = Simulator()
+    sim.add(send_all)
+    start = perf_counter()
+    sim.run()
+    return num_events / num_broadcasts, num_broadcasts / (perf_counter() - start)
+
+
+def main(nums_nodes: List[int]) -> None:
+    print(f"{'Nodes':>8}  {'Events/broadcast':>16}  {'Broadcasts/s':>12}")
+    for num_nodes in nums_nodes:
+        events, rate = broadcast(num_nodes)
+        print(f"{num_nodes:>8}  {events:>16.0f}  {rate:>12.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_NODES)
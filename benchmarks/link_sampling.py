@@ -0,0 +1,45 @@
+"""
+Measures the rate at which a :py:class:`~itsim.network.link.Link` samples the latency and bandwidth of the packets it
+transfers, with models given as Python generators or as NumPy-backed block samplers.
+
+Usage::
+
+    python benchmarks/link_sampling.py [num_samples]
+"""
+
+from random import Random
+import sys
+from time import perf_counter
+
+from greensim.random import constant, normal
+
+from itsim.network.link import Link
+from itsim.random import block_constant, block_normal
+from itsim.units import MS, MbPS
+
+
+NUM_SAMPLES = 1000000
+
+
+def samples_per_second(link: Link, num_samples: int) -> float:
+    latency = link._latency
+    bandwidth = link._bandwidth
+    start = perf_counter()
+    for _ in range(num_samples):
+        next(latency)
+        next(bandwidth)
+    return num_samples / (perf_counter() - start)
+
+
+def main(num_samples: int) -> None:
+    links = [
+        ("generators", Link("10.0.0.0/24", normal(10 * MS, 3 * MS, Random(1)), constant(100 * MbPS))),
+        ("blocks", Link("10.0.0.0/24", block_normal(10 * MS, 3 * MS, Random(1)), block_constant(100 * MbPS)))
+    ]
+    print(f"{'Models':>12}  {'Packets/s':>12}")
+    for name, link in links:
+        print(f"{name:>12}  {samples_per_second(link, num_samples):>12.0f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else NUM_SAMPLES)
@@ -0,0 +1,62 @@
+"""
+Measures the rate at which a :py:class:`~itsim.network.link.Link` hands unicast packets over to their recipient, as a
+function of the number of nodes connected to the link.
+
+Usage::
+
+    python benchmarks/link_unicast.py [num_nodes ...]
+"""
+
+from random import Random
+import sys
+from time import perf_counter
+from typing import List
+
+from greensim.random import constant
+
+from itsim.machine.endpoint import Endpoint
+from itsim.network.link import Link
+from itsim.network.location import Location
+from itsim.network.packet import Packet
+from itsim.simulator import Simulator
+from itsim.types import as_address
+from itsim.units import MS, MbPS
+
+
+NUMS_NODES = [100, 1000, 10000]
+NUM_PACKETS = 20000
+
+
+def packets_per_second(num_nodes: int, num_packets: int = NUM_PACKETS) -> float:
+    link = Link("10.0.0.0/16", constant(1 * MS), constant(100 * MbPS))
+    addresses = [as_address(n + 1, link.cidr) for n in range(num_nodes)]
+    for address in addresses:
+        Endpoint().connected_to_static(link, address)
+
+    rng = Random(num_nodes)
+    hops = [rng.choice(addresses) for _ in range(num_packets)]
+    packets = [Packet(Location(addresses[0], 9887), Location(hop, 9887), 1000) for hop in hops]
+    elapsed = 0.0
+
+    def transfer_all() -> None:
+        nonlocal elapsed
+        start = perf_counter()
+        for packet, hop in zip(packets, hops):
+            link._transfer_packet(packet, hop)
+        elapsed = perf_counter() - start
+
+    # The deliveries are left unexecuted: only the cost of the transfer itself is measured.
+    with Simulator() as sim:
+        sim.add(transfer_all)
+        sim.step()
+    return num_packets / elapsed
+
+
+def main(nums_nodes: List[int]) -> None:
+    print(f"{'Nodes':>8}  {'Packets/s':>12}")
+    for num_nodes in nums_nodes:
+        print(f"{num_nodes:>8}  {packets_per_second(num_nodes):>12.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_NODES)
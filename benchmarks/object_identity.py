@@ -0,0 +1,45 @@
+"""
+Measures the rate at which IT objects are built, and their UUIDs read, under each identity scheme: random UUIDs drawn
+for every object, and objects numbered by a counter, their UUIDs derived on demand.
+
+Usage::
+
+    python benchmarks/object_identity.py [num_objects ...]
+"""
+
+import sys
+from time import perf_counter
+from typing import List
+
+from itsim import CounterIdentity, IdentityScheme, identity_scheme, RandomIdentity
+from itsim.simulator import SimulatedComputation
+
+
+NUMS_OBJECTS = [10000, 100000]
+
+
+def objects_per_second(scheme: IdentityScheme, num_objects: int, read_uuid: bool) -> float:
+    with identity_scheme(scheme):
+        start = perf_counter()
+        for _ in range(num_objects):
+            computation = SimulatedComputation()
+            # Computations are routinely hashed, as they are kept in sets by their process.
+            hash(computation)
+            if read_uuid:
+                computation.uuid
+        return num_objects / (perf_counter() - start)
+
+
+def main(nums_objects: List[int]) -> None:
+    print(f"{'Objects':>8}  {'Scheme':>8}  {'Built/s':>10}  {'Built+UUID/s':>12}")
+    for num_objects in nums_objects:
+        for name, scheme in [("random", RandomIdentity()), ("counter", CounterIdentity())]:
+            print(
+                f"{num_objects:>8}  {name:>8}  "
+                f"{objects_per_second(scheme, num_objects, False):>10.0f}  "
+                f"{objects_per_second(scheme, num_objects, True):>12.0f}"
+            )
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_OBJECTS)
@@ -0,0 +1,53 @@
+"""
+Measures the memory held by packets in flight, in bytes per packet, as traced by :py:mod:`tracemalloc`. The packets are
+built the way a :py:class:`~itsim.machine.node.Node` builds them when its sockets send, in a ping-pong exchange between
+a handful of hosts like that of ``tests/integ/test_packet_transfer.py``.
+
+Usage::
+
+    python benchmarks/packet_memory.py [num_packets ...]
+"""
+
+import sys
+import tracemalloc
+from typing import List
+
+from itsim.network.location import Location
+from itsim.network.packet import Packet
+from itsim.types import as_address
+
+
+NUMS_PACKETS = [1000, 10000, 100000]
+NUM_HOSTS = 8
+PORT_SERVER = 9887
+
+
+def bytes_per_packet(num_packets: int) -> float:
+    hosts = [as_address(f"10.11.12.{n + 10}") for n in range(NUM_HOSTS)]
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        packets = []
+        for n in range(num_packets):
+            client = hosts[n % NUM_HOSTS]
+            server = hosts[(n + 1) % NUM_HOSTS]
+            port_client = 32768 + n % 64
+            if n % 2 == 0:
+                packet = Packet(Location(client, port_client), Location(server, PORT_SERVER), 4, {"content": "ping"})
+            else:
+                packet = Packet(Location(server, PORT_SERVER), Location(client, port_client), 8, {"content": "pong"})
+            packets.append(packet)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / len(packets)
+
+
+def main(nums_packets: List[int]) -> None:
+    print(f"{'Packets':>8}  {'Bytes/packet':>12}")
+    for num_packets in nums_packets:
+        print(f"{num_packets:>8}  {bytes_per_packet(num_packets):>12.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_PACKETS)
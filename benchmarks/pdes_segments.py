@@ -0,0 +1,95 @@
+"""
+Measures the time taken to simulate a routed topology of 4 segments, joined by a backbone link, sequentially and
+partitioned by segment through :py:mod:`itsim.pdes`. Each host of a segment pings hosts of the other segments, and the
+lookahead is the latency of the backbone.
+
+Usage::
+
+    python benchmarks/pdes_segments.py [num_hosts_per_segment ...]
+"""
+
+from functools import partial
+from random import Random
+import sys
+from time import perf_counter
+from typing import List, Optional
+
+from greensim.random import constant
+
+from itsim.machine.endpoint import Endpoint
+from itsim.network.link import Link
+from itsim.network.route import Relay
+from itsim.network.router import Router
+from itsim.pdes import Partition, partition_by_links, run_partitioned, run_sequential
+from itsim.simulator import Simulator, advance
+from itsim.types import Protocol
+from itsim.units import MS, MbPS
+
+
+NUMS_HOSTS = [10, 50]
+NUM_SEGMENTS = 4
+LATENCY_BACKBONE = 10 * MS
+DURATION = 20.0
+PORT_ECHO = 7
+
+
+def client(context, rng: Random, dests: List[str], count: List[int]) -> None:
+    with context.node.bind(Protocol.UDP) as socket:
+        while True:
+            advance(rng.expovariate(5.0))
+            socket.send((rng.choice(dests), PORT_ECHO), 500)
+            socket.recv()
+            count[0] += 1
+
+
+def echo(context) -> None:
+    with context.node.bind(Protocol.UDP, PORT_ECHO) as socket:
+        while True:
+            packet = socket.recv()
+            socket.send(packet.source, packet.byte_size)
+
+
+def segments(num_hosts: int, index: Optional[int]) -> Partition:
+    sim = Simulator()
+    backbone = Link("10.0.0.0/24", constant(LATENCY_BACKBONE), constant(1000 * MbPS), latency_min=LATENCY_BACKBONE)
+    nodes = []
+    hosts = []
+    for s in range(NUM_SEGMENTS):
+        lan = Link(f"10.{s + 1}.0.0/16", constant(1 * MS), constant(100 * MbPS))
+        routes = [Relay(f"10.0.0.{t + 1}", f"10.{t + 1}.0.0/16") for t in range(NUM_SEGMENTS) if t != s]
+        nodes.append(Router().connected_to_static(backbone, f"10.0.0.{s + 1}", routes).connected_to_static(lan, 1))
+        for h in range(num_hosts):
+            address = f"10.{s + 1}.{h // 200}.{h % 200 + 10}"
+            host = Endpoint().connected_to_static(lan, address, [Relay(f"10.{s + 1}.0.1", "10.0.0.0/8")])
+            nodes.append(host)
+            hosts.append((s, address, host))
+
+    count = [0]
+    partition = Partition(sim, nodes, partition_by_links(nodes, [backbone], NUM_SEGMENTS), index, count)
+    for n, (s, _, host) in enumerate(hosts):
+        if partition.is_local(host):
+            host.run_proc(sim, client, Random(n), [address for t, address, _ in hosts if t != s], count)
+            host.run_proc(sim, echo)
+    return partition
+
+
+def num_pings(partition: Partition) -> int:
+    return partition.model[0]
+
+
+def main(nums_hosts: List[int]) -> None:
+    print(f"{'Hosts':>6}  {'Pings':>7}  {'Sequential (s)':>14}  {'Partitioned (s)':>15}")
+    for num_hosts in nums_hosts:
+        scenario = partial(segments, num_hosts)
+        start = perf_counter()
+        pings = run_sequential(scenario, DURATION, {"pings": num_pings})["pings"]
+        sequential = perf_counter() - start
+        start = perf_counter()
+        results = run_partitioned(scenario, NUM_SEGMENTS, DURATION, {"pings": num_pings})
+        partitioned = perf_counter() - start
+        assert sum(result["pings"] for result in results) == pings
+        print(f"{NUM_SEGMENTS * num_hosts:>6}  {pings:>7}  {sequential:>14.2f}  {partitioned:>15.2f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_HOSTS)
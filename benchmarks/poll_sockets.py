@@ -0,0 +1,84 @@
+"""
+Compares serving many sockets of a node with one process per socket blocking on ``recv``, to serving them all from a
+single process through a :py:class:`~itsim.machine.socket.Poller`. Reports the memory taken by the serving processes
+(as traced by :py:mod:`tracemalloc`) and the rate at which packets are served.
+
+Usage::
+
+    python benchmarks/poll_sockets.py [num_sockets ...]
+"""
+
+from random import Random
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import List, Tuple
+
+from itsim.machine.endpoint import Endpoint
+from itsim.machine.socket import Poller
+from itsim.network.location import Location
+from itsim.network.packet import Packet
+from itsim.simulator import Simulator, advance
+from itsim.types import Protocol
+
+
+NUMS_SOCKETS = [10, 100, 1000]
+NUM_PACKETS = 20000
+SIZE_BURST = 20
+
+
+def serve(num_sockets: int, poll: bool, num_packets: int = NUM_PACKETS) -> Tuple[float, float]:
+    endpoint = Endpoint()
+    sockets = [endpoint.bind(Protocol.UDP, 1000 + n) for n in range(num_sockets)]
+    packet = Packet(Location("10.0.0.2", 9887), Location("10.0.0.1", 1000), 100)
+    rng = Random(num_sockets)
+    num_served = 0
+
+    def serve_one(socket) -> None:
+        nonlocal num_served
+        while True:
+            socket.recv()
+            num_served += 1
+
+    def serve_all() -> None:
+        nonlocal num_served
+        poller = Poller(sockets)
+        while True:
+            for socket in poller.poll():
+                num_served += len(socket.recv_many(SIZE_BURST))
+
+    def feed() -> None:
+        for _ in range(num_packets // SIZE_BURST):
+            advance(1.0)
+            for _ in range(SIZE_BURST):
+                rng.choice(sockets)._enqueue(packet)
+
+    sim = Simulator()
+    tracemalloc.start()
+    if poll:
+        sim.add(serve_all)
+    else:
+        for socket in sockets:
+            sim.add(serve_one, socket)
+    sim.run(0.5)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sim.add(feed)
+    start = perf_counter()
+    sim.run()
+    elapsed = perf_counter() - start
+    sim.stop()
+    return memory, num_served / elapsed
+
+
+def main(nums_sockets: List[int]) -> None:
+    print(f"{'Sockets':>8}  {'Mode':>8}  {'Memory (KB)':>12}  {'Packets/s':>10}")
+    for num_sockets in nums_sockets:
+        for poll in [False, True]:
+            memory, rate = serve(num_sockets, poll)
+            print(f"{num_sockets:>8}  {'poll' if poll else 'threads':>8}  {memory / 1024:>12.0f}  {rate:>10.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_SOCKETS)
@@ -0,0 +1,74 @@
+"""
+Measures the time it takes to snapshot the process tree of a topology every simulated minute, while a few of its nodes
+start and complete processes. Snapshots are timed against a rebuild of every node's records at each minute, as done
+without caching.
+
+Usage::
+
+    python benchmarks/process_tree.py [num_nodes ...]
+"""
+
+from random import Random
+import sys
+from time import perf_counter
+from typing import List, Tuple
+
+from itsim.machine.endpoint import Endpoint
+from itsim.machine.process_management.table import process_tree
+from itsim.simulator import Simulator, advance
+from itsim.units import MIN
+
+
+NUMS_NODES = [100, 1000, 10000]
+NUM_PROCS_PER_NODE = 8
+NUM_MINUTES = 30
+NUM_NODES_ACTIVE_PER_MINUTE = 10
+
+
+def sleep(_, delay: float) -> None:
+    advance(delay)
+
+
+def seconds_per_snapshot(num_nodes: int, cached: bool) -> Tuple[float, int]:
+    rng = Random(num_nodes)
+    sim = Simulator()
+    nodes = [Endpoint() for _ in range(num_nodes)]
+    for node in nodes:
+        for _ in range(NUM_PROCS_PER_NODE):
+            node.run_proc(sim, sleep, 2 * NUM_MINUTES * MIN)
+    elapsed = [0.0]
+    num_records = [0]
+
+    def churn() -> None:
+        while True:
+            advance(rng.uniform(0, 2 * MIN / NUM_NODES_ACTIVE_PER_MINUTE))
+            rng.choice(nodes).run_proc(sim, sleep, rng.uniform(0, 2 * MIN))
+
+    def snapshot() -> None:
+        for _ in range(NUM_MINUTES):
+            advance(MIN)
+            if not cached:
+                for node in nodes:
+                    node.procs()._invalidate()
+            start = perf_counter()
+            tree = process_tree(nodes)
+            elapsed[0] += perf_counter() - start
+            num_records[0] = sum(len(records) for records in tree.values())
+        sim.stop()
+
+    sim.add(churn)
+    sim.add(snapshot)
+    sim.run()
+    return elapsed[0] / NUM_MINUTES, num_records[0]
+
+
+def main(nums_nodes: List[int]) -> None:
+    print(f"{'Nodes':>7}  {'Processes':>10}  {'rebuilt (ms)':>13}  {'cached (ms)':>12}")
+    for num_nodes in nums_nodes:
+        rebuilt, num_records = seconds_per_snapshot(num_nodes, False)
+        cached, _ = seconds_per_snapshot(num_nodes, True)
+        print(f"{num_nodes:>7}  {num_records:>10}  {1000 * rebuilt:>13.2f}  {1000 * cached:>12.2f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_NODES)
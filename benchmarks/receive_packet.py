@@ -0,0 +1,54 @@
+"""
+Measures the rate at which a :py:class:`~itsim.machine.node.Node` dispatches the packets it receives, as a function of
+the number of interfaces it has. Half the packets are addressed to the node, the other half are in transit.
+
+Usage::
+
+    python benchmarks/receive_packet.py [num_interfaces ...]
+"""
+
+import sys
+from time import perf_counter
+from typing import List
+
+from greensim.random import constant
+
+from itsim.machine.node import Node
+from itsim.network.link import Link
+from itsim.network.location import Location
+from itsim.network.packet import Packet
+from itsim.types import as_address
+from itsim.units import MS, MbPS
+
+
+NUMS_INTERFACES = [2, 16, 128]
+NUM_PACKETS = 100000
+
+
+def packets_per_second(num_interfaces: int, num_packets: int = NUM_PACKETS) -> float:
+    router = Node()
+    for n in range(num_interfaces):
+        router.connected_to_static(Link(f"10.{n}.0.0/16", constant(1 * MS), constant(100 * MbPS)), 1)
+    socket = router.bind(pr=9887)
+    source = Location("10.0.0.2", 9887)
+    packets = [
+        Packet(source, Location(as_address(1 + n % 2, f"10.{n % num_interfaces}.0.0/16"), 9887), 100)
+        for n in range(num_packets)
+    ]
+    socket._enqueue = lambda packet: None  # type: ignore
+    start = perf_counter()
+    for packet in packets:
+        router._receive_packet(packet)
+    elapsed = perf_counter() - start
+    socket.close()
+    return num_packets / elapsed
+
+
+def main(nums_interfaces: List[int]) -> None:
+    print(f"{'Interfaces':>10}  {'Packets/s':>12}")
+    for num_interfaces in nums_interfaces:
+        print(f"{num_interfaces:>10}  {packets_per_second(num_interfaces):>12.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_INTERFACES)
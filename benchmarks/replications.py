@@ -0,0 +1,69 @@
+"""
+Measures the time taken to run replications of a small scenario, in a loop in the current process and through
+:py:func:`itsim.runner.replicate`, with as many worker processes as the machine has cores.
+
+Usage::
+
+    python benchmarks/replications.py [num_replications ...]
+"""
+
+import os
+import sys
+from time import perf_counter
+from typing import List
+
+from greensim.random import expo
+
+from itsim.runner import replicate, run_replication
+from itsim.simulator import Simulator, advance
+
+
+NUMS_REPLICATIONS = [8, 32]
+DURATION = 2000.0
+
+
+class Queueing:
+
+    def __init__(self, seed: int) -> None:
+        self.sim = Simulator()
+        self.num_events = 0
+        self.sim.add(self._generate, expo(0.1))
+
+    def _generate(self, delays) -> None:
+        while True:
+            advance(next(delays))
+            self.num_events += 1
+
+    def run(self, duration: float) -> None:
+        self.sim.run(duration)
+
+
+def num_events(model: Queueing) -> int:
+    return model.num_events
+
+
+def seconds_serial(num_replications: int) -> float:
+    start = perf_counter()
+    for seed in range(num_replications):
+        run_replication(Queueing, seed, seed, {"events": num_events}, DURATION)
+    return perf_counter() - start
+
+
+def seconds_pool(num_replications: int) -> float:
+    start = perf_counter()
+    for _ in replicate(Queueing, range(num_replications), {"events": num_events}, DURATION):
+        pass
+    return perf_counter() - start
+
+
+def main(nums_replications: List[int]) -> None:
+    print(f"Cores: {os.cpu_count()}")
+    print(f"{'Replications':>12}  {'Serial (s)':>10}  {'Pool (s)':>8}")
+    for num_replications in nums_replications:
+        serial = seconds_serial(num_replications)
+        pool = seconds_pool(num_replications)
+        print(f"{num_replications:>12}  {serial:>10.2f}  {pool:>8.2f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_REPLICATIONS)
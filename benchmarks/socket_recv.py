@@ -0,0 +1,68 @@
+"""
+Measures the rate at which a process receives bursts of packets from a :py:class:`~itsim.machine.socket.Socket`, one
+packet per call to ``recv``, or a burst at a time with ``recv_many`` where available.
+
+Usage::
+
+    python benchmarks/socket_recv.py [size_burst ...]
+"""
+
+import sys
+from time import perf_counter
+from typing import List, Optional
+
+from itsim.machine.endpoint import Endpoint
+from itsim.machine.socket import Socket
+from itsim.network.location import Location
+from itsim.network.packet import Packet
+from itsim.simulator import Simulator, advance
+from itsim.types import Protocol
+
+
+SIZES_BURST = [1, 10, 100]
+NUM_PACKETS = 50000
+
+
+def packets_per_second(size_burst: int, batch: bool, num_packets: int = NUM_PACKETS) -> Optional[float]:
+    if batch and not hasattr(Socket, "recv_many"):
+        return None
+    endpoint = Endpoint()
+    socket = endpoint.bind(Protocol.UDP, 67)
+    packet = Packet(Location("10.0.0.2", 68), Location("10.0.0.1", 67), 300)
+    num_bursts = num_packets // size_burst
+
+    def send() -> None:
+        for _ in range(num_bursts):
+            advance(1.0)
+            for _ in range(size_burst):
+                socket._enqueue(packet)
+
+    def receive() -> None:
+        num_received = 0
+        while num_received < num_bursts * size_burst:
+            if batch:
+                num_received += len(socket.recv_many(size_burst))
+            else:
+                socket.recv()
+                num_received += 1
+
+    sim = Simulator()
+    sim.add(receive)
+    sim.add(send)
+    start = perf_counter()
+    sim.run()
+    elapsed = perf_counter() - start
+    socket.close()
+    return num_bursts * size_burst / elapsed
+
+
+def main(sizes_burst: List[int]) -> None:
+    print(f"{'Burst':>6}  {'recv (pkt/s)':>14}  {'recv_many (pkt/s)':>18}")
+    for size_burst in sizes_burst:
+        one = packets_per_second(size_burst, False)
+        many = packets_per_second(size_burst, True)
+        print(f"{size_burst:>6}  {one:>14.0f}  {'-' if many is None else str(round(many)):>18}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or SIZES_BURST)
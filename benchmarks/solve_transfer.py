@@ -0,0 +1,57 @@
+"""
+Measures the rate at which a :py:class:`~itsim.machine.node.Node` resolves the interface and next hop of packets, as a
+function of the number of routes it knows.
+
+Usage::
+
+    python benchmarks/solve_transfer.py [num_routes ...]
+"""
+
+from random import Random
+import sys
+from time import perf_counter
+from typing import List
+
+from greensim.random import constant
+
+from itsim.machine.node import Node
+from itsim.network.link import Link
+from itsim.network.route import Relay
+from itsim.types import as_address
+from itsim.units import MS, MbPS
+
+
+NUMS_ROUTES = [10, 100, 1000]
+NUM_LINKS = 4
+NUM_LOOKUPS = 20000
+
+
+def lookups_per_second(num_routes: int, num_lookups: int = NUM_LOOKUPS) -> float:
+    rng = Random(num_routes)
+    router = Node()
+    for n in range(NUM_LINKS):
+        link = Link(f"10.{n}.0.0/16", constant(1 * MS), constant(100 * MbPS))
+        routes = [
+            Relay(as_address(2, link.cidr), f"{rng.randrange(11, 224)}.{rng.randrange(256)}.0.0/16")
+            for _ in range(num_routes // NUM_LINKS)
+        ]
+        router.connected_to_static(link, 1, routes)
+
+    destinations = [as_address(rng.getrandbits(32) % (224 << 24)) for _ in range(num_lookups)]
+    start = perf_counter()
+    for address in destinations:
+        try:
+            router._solve_transfer(address)
+        except Exception:
+            pass
+    return num_lookups / (perf_counter() - start)
+
+
+def main(nums_routes: List[int]) -> None:
+    print(f"{'Routes':>8}  {'Lookups/s':>12}")
+    for num_routes in nums_routes:
+        print(f"{num_routes:>8}  {lookups_per_second(num_routes):>12.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_ROUTES)
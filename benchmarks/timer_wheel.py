@@ -0,0 +1,70 @@
+"""
+Measures the cost of waits with a timeout that seldom expires, as receive timeouts do: each of many processes waits over
+and over for a signal of its own, with a long timeout, while a peer turns the signal on after a short delay. Timeouts
+are either kept by greensim, which starts a process advancing through the whole timeout for every wait, or by the timer
+wheel of the simulator.
+
+Usage::
+
+    python benchmarks/timer_wheel.py [num_waiters ...]
+"""
+
+from random import Random
+import sys
+from time import perf_counter
+from typing import Callable, List, Optional, Tuple
+
+import greensim
+
+from itsim.simulator import _wait_signal, Simulator, advance
+
+
+NUMS_WAITERS = [10, 1000]
+NUM_WAITS = 10000
+TIMEOUT = 30.0
+
+Wait = Callable[[greensim.Signal, Optional[float]], None]
+
+
+def waiter(signal: greensim.Signal, wait: Wait, num: int) -> None:
+    for _ in range(num):
+        wait(signal, TIMEOUT)
+        signal.turn_off()
+
+
+def pinger(sim: Simulator, signal: greensim.Signal, rng: Random, num: int, peak: List[int]) -> None:
+    for _ in range(num):
+        advance(rng.expovariate(10.0))
+        signal.turn_on()
+        peak[0] = max(peak[0], len(sim._events))
+
+
+def measure(num_waiters: int, wait: Wait, num_waits: int = NUM_WAITS) -> Tuple[float, int]:
+    rng = Random(1)
+    peak = [0]
+    with Simulator() as sim:
+        for _ in range(num_waiters):
+            signal = greensim.Signal().turn_off()
+            sim.add(waiter, signal, wait, num_waits // num_waiters)
+            sim.add(pinger, sim, signal, rng, num_waits // num_waiters, peak)
+        start = perf_counter()
+        sim.run()
+        return num_waits / (perf_counter() - start), peak[0]
+
+
+def wait_greensim(signal: greensim.Signal, timeout: Optional[float]) -> None:
+    signal.wait(timeout)
+
+
+def main(nums_waiters: List[int]) -> None:
+    print(
+        f"{'Waiters':>7}  {'greensim (waits/s)':>18}  {'Peak events':>11}  {'Wheel (waits/s)':>15}  {'Peak events':>11}"
+    )
+    for num_waiters in nums_waiters:
+        rate_greensim, peak_greensim = measure(num_waiters, wait_greensim)
+        rate_wheel, peak_wheel = measure(num_waiters, _wait_signal)
+        print(f"{num_waiters:>7}  {rate_greensim:>18.0f}  {peak_greensim:>11}  {rate_wheel:>15.0f}  {peak_wheel:>11}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_WAITERS)
@@ -0,0 +1,72 @@
+"""
+Measures the rate at which a simulation of hosts exchanging packets runs with no trace recorder, and with a recorder
+keeping all spans or a sample of them. The best of a few repeats is reported.
+
+Usage::
+
+    python benchmarks/tracing_overhead.py [num_hosts ...]
+"""
+
+import sys
+from time import perf_counter
+from typing import List, Optional
+
+from greensim.random import constant
+
+from itsim.machine.endpoint import Endpoint
+from itsim.network.link import Link
+from itsim.simulator import Simulator, advance
+from itsim.tracing import recording, TraceRecorder
+from itsim.types import Protocol
+from itsim.units import MS, MbPS
+
+
+NUMS_HOSTS = [10, 100]
+NUM_PINGS = 200
+NUM_REPEATS = 3
+PORT = 7
+RATES = [None, 1.0, 0.01]
+
+
+def pinger(context, address: str) -> None:
+    with context.node.bind(Protocol.UDP) as socket:
+        for _ in range(NUM_PINGS):
+            advance(0.1)
+            socket.send((address, PORT), 100)
+            socket.recv()
+
+
+def echo(context) -> None:
+    with context.node.bind(Protocol.UDP, PORT) as socket:
+        while True:
+            packet = socket.recv()
+            socket.send(packet.source, packet.byte_size)
+
+
+def pings_per_second(num_hosts: int, rate: Optional[float]) -> float:
+    sim = Simulator()
+    link = Link("10.0.0.0/16", constant(1 * MS), constant(100 * MbPS))
+    hosts = [Endpoint().connected_to_static(link, f"10.0.{n // 200}.{n % 200 + 10}") for n in range(num_hosts)]
+    for n, host in enumerate(hosts):
+        host.run_proc(sim, echo)
+        host.run_proc(sim, pinger, f"10.0.{(n + 1) % num_hosts // 200}.{(n + 1) % num_hosts % 200 + 10}")
+    start = perf_counter()
+    if rate is None:
+        sim.run()
+    else:
+        with recording(TraceRecorder(capacity=100000, rate=rate)):
+            sim.run()
+    return num_hosts * NUM_PINGS / (perf_counter() - start)
+
+
+def main(nums_hosts: List[int]) -> None:
+    print(f"{'Hosts':>6}  {'Recording':>10}  {'Pings/s':>9}")
+    for num_hosts in nums_hosts:
+        for rate in RATES:
+            label = "off" if rate is None else f"rate {rate:g}"
+            rate_best = max(pings_per_second(num_hosts, rate) for _ in range(NUM_REPEATS))
+            print(f"{num_hosts:>6}  {label:>10}  {rate_best:>9.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or NUMS_HOSTS)
@@ -1,6 +1,8 @@
-from abc import ABC
-from typing import Callable
-from uuid import uuid4, UUID
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from itertools import count
+from typing import Callable, Hashable, Iterator, Optional
+from uuid import uuid4, uuid5, UUID
 
 from greensim import tagged
 from greensim.tags import Tags, TaggedObject
@@ -11,18 +13,128 @@ class Tag(Tags):
     VULNERABLE = 1
 
 
+class IdentityScheme(ABC):
+    """
+    Scheme by which IT objects are identified. Each object gets an identifier from the scheme when it is built; this
+    identifier is only turned into a UUID when the object's :py:attr:`ITObject.uuid` is read.
+    """
+
+    @abstractmethod
+    def new_id(self) -> Hashable:
+        """
+        Returns an identifier distinct from all those this scheme has returned before.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def as_uuid(self, id: Hashable) -> UUID:
+        """
+        Returns the UUID standing for an identifier returned by :py:meth:`new_id`.
+        """
+        raise NotImplementedError()
+
+
+class RandomIdentity(IdentityScheme):
+    """
+    Identifies each object with a random UUID, drawn from the operating system's entropy source.
+    """
+
+    def new_id(self) -> Hashable:
+        return uuid4()
+
+    def as_uuid(self, id: Hashable) -> UUID:
+        return id  # type: ignore
+
+
+# Namespace of the UUIDs derived from object counters, unless another is given.
+NAMESPACE_ITSIM = UUID("66a16018-b198-41cb-ab51-c50673f1e25d")
+
+
+class CounterIdentity(IdentityScheme):
+    """
+    Identifies objects by numbering them in the order they are built. The UUID of an object is derived from its number
+    and a namespace UUID, as per RFC 4122 (version 5). Simulations building their objects in the same order thus get
+    the same UUIDs from one run to the next.
+
+    :param namespace: UUID of the namespace objects are numbered in. Running each simulation in the namespace of its
+        own :py:attr:`~itsim.simulator.Simulator.uuid` keeps the UUIDs of their objects apart.
+    :param start: Number of the first object.
+    """
+
+    def __init__(self, namespace: UUID = NAMESPACE_ITSIM, start: int = 0) -> None:
+        self._namespace = namespace
+        self._counter = count(start)
+
+    @property
+    def namespace(self) -> UUID:
+        return self._namespace
+
+    def new_id(self) -> Hashable:
+        return next(self._counter)
+
+    def as_uuid(self, id: Hashable) -> UUID:
+        return uuid5(self._namespace, str(id))
+
+
+_identity: IdentityScheme = CounterIdentity()
+
+
+def get_identity_scheme() -> IdentityScheme:
+    """
+    Returns the scheme identifying the IT objects being built.
+    """
+    return _identity
+
+
+def set_identity_scheme(scheme: IdentityScheme) -> IdentityScheme:
+    """
+    Sets the scheme identifying the IT objects built from now on, and returns the scheme previously in use. Objects
+    built beforehand keep their identifiers.
+    """
+    global _identity
+    previous = _identity
+    _identity = scheme
+    return previous
+
+
+@contextmanager
+def identity_scheme(scheme: IdentityScheme) -> Iterator[IdentityScheme]:
+    """
+    Identifies the IT objects built within the context with the given scheme, restoring the previous scheme on exit.
+    """
+    previous = set_identity_scheme(scheme)
+    try:
+        yield scheme
+    finally:
+        set_identity_scheme(previous)
+
+
+def new_uuid() -> UUID:
+    """
+    Returns a new UUID from the current identity scheme, for things that need one without being IT objects.
+    """
+    return _identity.as_uuid(_identity.new_id())
+
+
 class ITObject(TaggedObject):
 
     def __init__(self, *tags: Tag) -> None:
         super().__init__(*tags)
-        self._uuid = uuid4()
+        self._identity = _identity
+        self._id = _identity.new_id()
+        self._uuid: Optional[UUID] = None
 
     @property
     def uuid(self) -> UUID:
+        """
+        Unique identifier of this object, derived from its identity scheme on first access.
+        """
+        if self._uuid is None:
+            self._uuid = self._identity.as_uuid(self._id)
         return self._uuid
 
     def uuid_str(self) -> str:
-        return str(self._uuid)
+        return str(self.uuid)
 
     def __str__(self) -> str:
         return f"{type(self).__name__}{{{str(self.uuid)}}}"
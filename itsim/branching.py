@@ -0,0 +1,150 @@
+"""
+What-if branching of a simulation from a checkpoint. A simulation is run up to a certain moment, typically through a
+long warm-up, then paused; each branch then carries on from this very state, with its own scenario injected, in a child
+process forked from the current one. Greenlets cannot be pickled, but forking copies the whole memory of the process,
+processes of the simulation included, copy-on-write: branching costs next to nothing, whatever the state of the
+simulation, and spares each branch the warm-up.
+
+Every branch resumes with the pseudo-random sources in the state they had at the checkpoint, so branches draw the same
+numbers unless their scenarios reseed them. The results of each branch are sent back to the parent process through a
+pipe of its own, so they must be picklable; the scenario and the extractors, on the other hand, are inherited by the
+child processes, and need not be.
+"""
+
+from math import inf
+from multiprocessing import Pipe
+from multiprocessing.connection import Connection, wait
+import os
+import signal
+import sys
+import traceback
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from itsim.simulator import Simulator  # noqa: F401
+
+
+# Injects the scenario of a branch into the simulation, from the parameters of the branch, and returns the parts of the
+# model its results are extracted from.
+Scenario = Callable[["Simulator", Any], Any]
+
+# Extracts a result from the model returned by the scenario of a branch, once the branch has run.
+Extractor = Callable[[Any], Any]
+
+
+class BranchResult(NamedTuple):
+    """
+    Outcome of a branch of a simulation.
+
+    :ivar index: Position of the branch's parameters in the sequence given to :py:func:`branch`.
+    :ivar params: Parameters of the branch.
+    :ivar results: Results of the extractors, keyed by the names they were given; empty if the branch failed.
+    :ivar error: Exception raised by the branch, or ``None`` if it succeeded.
+    """
+    index: int
+    params: Any
+    results: Dict[str, Any]
+    error: Optional[BaseException]
+
+    def is_success(self) -> bool:
+        return self.error is None
+
+
+def branch(
+    sim: "Simulator",
+    scenario: Scenario,
+    runs: Iterable[Any],
+    extractors: Mapping[str, Extractor],
+    duration: float = inf,
+    max_workers: Optional[int] = None
+) -> List[BranchResult]:
+    """
+    Branches the simulation from its current state, once for each of the given sets of parameters. Each branch runs in
+    a child process forked from the current one: the scenario is called with the simulator and the parameters of the
+    branch, then the simulation is run for the given duration, and the extractors are applied to the model returned by
+    the scenario. The simulation of the current process is left as it was, and may be run further or branched again.
+
+    This may only be called between runs of the simulation, and on platforms where :py:func:`os.fork` is available.
+
+    :param sim: Simulator to branch.
+    :param scenario: Injects the scenario of a branch into the simulation; see :py:data:`Scenario`.
+    :param runs: Parameters of each branch.
+    :param extractors: Functions computing the results of a branch from its model, once it has run, keyed by name.
+    :param duration: Simulated time each branch is run for, from the checkpoint.
+    :param max_workers: Number of branches run at once; by default, the number of cores of the machine.
+
+    :return: Outcome of each branch, in the order of their parameters.
+    """
+    if not hasattr(os, "fork"):
+        raise NotImplementedError("Branching simulations requires os.fork(), which this platform lacks.")
+    if sim.is_running:
+        raise RuntimeError("Simulations can only be branched between runs.")
+    params_all = list(runs)
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers < 1:
+        raise ValueError(f"Number of workers must be positive (got {max_workers}).")
+
+    outcomes: List[Optional[BranchResult]] = [None] * len(params_all)
+    pending: Dict[Connection, Tuple[int, int]] = {}
+    index_next = 0
+    try:
+        while index_next < len(params_all) or pending:
+            while index_next < len(params_all) and len(pending) < max_workers:
+                conn, pid = _fork(sim, scenario, params_all[index_next], extractors, duration)
+                pending[conn] = (index_next, pid)
+                index_next += 1
+            for conn in wait(list(pending.keys())):
+                index, pid = pending.pop(conn)  # type: ignore
+                outcomes[index] = _collect(conn, pid, index, params_all[index])
+    finally:
+        for conn, (_, pid) in pending.items():
+            conn.close()
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+    return outcomes  # type: ignore
+
+
+def _fork(
+    sim: "Simulator",
+    scenario: Scenario,
+    params: Any,
+    extractors: Mapping[str, Extractor],
+    duration: float
+) -> Tuple[Connection, int]:
+    conn, conn_child = Pipe(duplex=False)
+    # Output buffered so far would otherwise be written out by the child as well.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            conn.close()
+            try:
+                model = scenario(sim, params)
+                sim.run(duration)
+                conn_child.send(("results", {name: extract(model) for name, extract in extractors.items()}))
+            except BaseException as err:
+                try:
+                    conn_child.send(("error", err))
+                except BaseException:
+                    conn_child.send(("error", RuntimeError(traceback.format_exc())))
+        finally:
+            # The child must not carry on with the code of the parent past this call, nor clean up after it.
+            os._exit(0)
+    conn_child.close()
+    return conn, pid
+
+
+def _collect(conn: Connection, pid: int, index: int, params: Any) -> BranchResult:
+    try:
+        reply, content = conn.recv()
+    except EOFError:
+        reply, content = "died", None
+    finally:
+        conn.close()
+    _, status = os.waitpid(pid, 0)
+    if reply == "results":
+        return BranchResult(index, params, content, None)
+    if reply == "died":
+        content = RuntimeError(f"Branch {index} died without reporting results (wait status {status}).")
+    return BranchResult(index, params, {}, content)
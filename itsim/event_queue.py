@@ -0,0 +1,221 @@
+"""
+Queues holding the events scheduled on a :py:class:`~itsim.simulator.Simulator`.
+
+By default, a simulator keeps its pending events in a binary heap, as greensim does: scheduling an event and running the
+next one each take a time logarithmic in the number of pending events. Simulations keeping millions of events pending
+(timers, periodic activity of machines, packets in flight) may instead select a :py:class:`CalendarQueue`, on which
+both take constant time on average::
+
+    sim = Simulator(queue=CalendarQueue())
+
+Whatever the queue, events run in the same order: by moment, then in the order they were scheduled.
+"""
+
+from abc import ABC, abstractmethod
+from bisect import insort
+from heapq import heappop, heappush
+from math import inf, isfinite
+from typing import Iterator, List, Tuple
+
+from greensim import _Event
+
+
+class EventQueue(ABC):
+    """
+    Priority queue of simulation events, ordered by their moment, then by their identifier.
+    """
+
+    @abstractmethod
+    def push(self, event: _Event) -> None:
+        """
+        Adds an event to the queue.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def pop(self) -> _Event:
+        """
+        Removes the next event from the queue and returns it.
+
+        :raise IndexError: The queue is empty.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def peek(self) -> _Event:
+        """
+        Returns the next event, leaving it in the queue.
+
+        :raise IndexError: The queue is empty.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[_Event]:
+        """
+        Iterates over the events in the queue, in no particular order.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Drops all the events from the queue.
+        """
+        raise NotImplementedError()
+
+
+class HeapQueue(EventQueue):
+    """
+    Binary heap of events, as kept by greensim.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[_Event] = []
+
+    def push(self, event: _Event) -> None:
+        heappush(self._heap, event)
+
+    def pop(self) -> _Event:
+        return heappop(self._heap)
+
+    def peek(self) -> _Event:
+        return self._heap[0]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[_Event]:
+        return iter(self._heap)
+
+    def clear(self) -> None:
+        self._heap.clear()
+
+
+# Entry of a calendar bucket: the moment and identifier of the event, negated so that buckets sorted in ascending order
+# of their entries end with the next event; the day of the event; and the event itself.
+_Entry = Tuple[float, int, int, _Event]
+
+# Day of events at an infinite moment: later than the day of any finite moment.
+_DAY_INFINITE = 1 << 4096
+
+# Number of the earliest events whose spacing sets the width of the buckets.
+NUM_SAMPLE_WIDTH = 25
+
+
+def _day_of(moment: float, width: float) -> int:
+    return int(moment / width) if moment < inf else _DAY_INFINITE
+
+
+class CalendarQueue(EventQueue):
+    """
+    Calendar queue (R. Brown, 1988). Simulated time is cut into *days* of equal width, and the queue is a calendar of
+    ``n`` buckets, like a year of ``n`` days: bucket ``i`` holds the events of days ``i``, ``i + n``, ``i + 2n``, and so
+    on, sorted. Events are dequeued by walking the days in order, taking from the bucket of each day the events of that
+    day, then moving on to the next; when a whole year holds no event, the queue jumps to the day of the earliest one.
+
+    The queue doubles or halves its number of buckets as the number of events grows or shrinks past twice or half of
+    it, and sets the width of the days anew from the spacing of the earliest events, so that each day holds a few
+    events. Enqueuing and dequeuing then take constant amortized time, as long as the moments of the events are spread
+    evenly enough.
+
+    :param width: Initial width of the days, in simulated time.
+    :param num_buckets: Initial number of buckets; it never gets smaller.
+    """
+
+    def __init__(self, width: float = 1.0, num_buckets: int = 2) -> None:
+        if not (width > 0.0 and isfinite(width)):
+            raise ValueError(f"Width of days must be positive and finite (got {width}).")
+        if num_buckets < 1:
+            raise ValueError(f"Number of buckets must be positive (got {num_buckets}).")
+        self._width_initial = width
+        self._num_min = num_buckets
+        self.clear()
+
+    @property
+    def width(self) -> float:
+        return self._width
+
+    @property
+    def num_buckets(self) -> int:
+        return self._num
+
+    def clear(self) -> None:
+        self._size = 0
+        self._day = 0
+        self._set_calendar(self._num_min, self._width_initial, [])
+
+    def _set_calendar(self, num: int, width: float, entries: List[_Entry]) -> None:
+        # Entries are given sorted, from the last event to the next.
+        self._num = num
+        self._width = width
+        self._buckets: List[List[_Entry]] = [[] for _ in range(num)]
+        for neg_moment, neg_id, _, event in entries:
+            day = _day_of(-neg_moment, width)
+            self._buckets[day % num].append((neg_moment, neg_id, day, event))
+        if entries:
+            self._day = _day_of(-entries[-1][0], width)
+        self._grow_at = 2 * num
+        self._shrink_at = num // 2 if num > self._num_min else -1
+
+    def _resize(self, num: int) -> None:
+        entries = [entry for bucket in self._buckets for entry in bucket]
+        entries.sort()
+        self._set_calendar(num, self._estimate_width(entries), entries)
+
+    def _estimate_width(self, entries: List[_Entry]) -> float:
+        # Three times the mean spacing of the earliest events, ignoring the spacings much larger than average
+        # (Brown, 1988).
+        moments = [-neg_moment for neg_moment, *_ in entries[-NUM_SAMPLE_WIDTH:] if neg_moment > -inf]
+        gaps = [later - earlier for later, earlier in zip(moments, moments[1:])]
+        if gaps:
+            mean = sum(gaps) / len(gaps)
+            gaps_usual = [gap for gap in gaps if gap <= 2.0 * mean]
+            width = 3.0 * sum(gaps_usual) / len(gaps_usual)
+            if width > 0.0 and isfinite(width):
+                return width
+        return self._width
+
+    def push(self, event: _Event) -> None:
+        moment = event._timestamp
+        day = _day_of(moment, self._width)
+        insort(self._buckets[day % self._num], (-moment, -event._identifier, day, event))
+        if day < self._day:
+            self._day = day
+        self._size += 1
+        if self._size > self._grow_at:
+            self._resize(2 * self._num)
+
+    def _bucket_next(self) -> List[_Entry]:
+        # Walks the days from the current one, which no pending event precedes, up to the first day that has events.
+        if self._size == 0:
+            raise IndexError("The event queue is empty.")
+        buckets = self._buckets
+        num = self._num
+        for day in range(self._day, self._day + num):
+            bucket = buckets[day % num]
+            if bucket and bucket[-1][2] <= day:
+                self._day = day
+                return bucket
+        _, _, self._day, _ = max(bucket[-1] for bucket in buckets if bucket)
+        return buckets[self._day % num]
+
+    def pop(self) -> _Event:
+        event = self._bucket_next().pop()[3]
+        self._size -= 1
+        if self._size < self._shrink_at:
+            self._resize(self._num // 2)
+        return event
+
+    def peek(self) -> _Event:
+        return self._bucket_next()[-1][3]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[_Event]:
+        return (entry[3] for bucket in self._buckets for entry in bucket)
@@ -0,0 +1,234 @@
+from math import inf
+import sys
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+import greenlet
+import greensim
+
+
+# Number of buckets of the histogram of handler wall times. Bucket k counts handlers that took from 2^(k-1) to 2^k
+# microseconds (bucket 0, less than a microsecond); the last bucket also counts all longer handlers.
+NUM_BUCKETS = 32
+
+
+class HandlerStats:
+    """
+    Wall time spent running the events of a given handler.
+
+    :ivar count: Number of events run.
+    :ivar time_total: Total wall time spent running them, in seconds.
+    :ivar time_max: Longest wall time spent running one of them, in seconds.
+    """
+
+    __slots__ = ("count", "time_total", "time_max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.time_total = 0.0
+        self.time_max = 0.0
+
+    @property
+    def time_mean(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return self.time_total / self.count
+
+
+def name_handler(fn: Callable) -> str:
+    """
+    Names the handler of an event. The events that start or resume a process are named after the function the process
+    runs, prefixed with ``process:``.
+    """
+    owner = getattr(fn, "__self__", None)
+    if isinstance(owner, greensim.Process):
+        return "process:" + _name_function(owner._body)
+    return _name_function(fn)
+
+
+def _key_handler(fn: Callable) -> Any:
+    # Key under which the name of a handler is cached: events resuming the same process, or calling the same method,
+    # come with distinct bound methods, but share their process' function or their underlying function.
+    owner = getattr(fn, "__self__", None)
+    if isinstance(owner, greensim.Process):
+        fn = owner._body
+    return getattr(fn, "__func__", fn)
+
+
+def _name_function(fn: Callable) -> str:
+    name = getattr(fn, "__qualname__", None)
+    if name is None:
+        name = getattr(getattr(fn, "func", None), "__qualname__", None) or type(fn).__qualname__
+    return name
+
+
+class Instruments:
+    """
+    Records where the time goes in a simulation: the events run and the greenlet switches they incur, and the wall
+    time spent running each handler of events. Instruments are attached to a simulator through
+    :py:attr:`itsim.simulator.Simulator.instruments`; the simulator then runs its events through them. Measurements
+    accumulate across the runs of the simulator.
+
+    :param progress_every: Wall time between lines reporting the progress of the simulation, in seconds (no such line is
+        reported if ``None``).
+    :param summary: If True, a summary table of the measurements is reported at the end of each run.
+    :param file: Stream the progress lines and summary are written to; by default, the standard error stream.
+    :param num_top: Number of handlers listed in the summary, from those that took the most time.
+    :param trace_switches: If True, greenlet switches are counted as they happen, through a greenlet trace function.
+        Otherwise, they are inferred from the events that resume processes, each of which switches to the process and
+        back: this is exact as long as processes only switch to one another through the simulator, and much cheaper.
+    """
+
+    def __init__(
+        self,
+        progress_every: Optional[float] = None,
+        summary: bool = True,
+        file: Optional[TextIO] = None,
+        num_top: int = 20,
+        trace_switches: bool = False
+    ) -> None:
+        self._progress_every = progress_every
+        self._trace_switches = trace_switches
+        self._summary = summary
+        self._file = file
+        self._num_top = num_top
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forgets all measurements.
+        """
+        self.num_events = 0
+        self.num_switches = 0
+        self.time_wall = 0.0
+        self.time_sim = 0.0
+        self.handlers: Dict[str, HandlerStats] = {}
+        self.histogram: List[int] = [0] * NUM_BUCKETS
+        self._stats_handler: Dict[Any, Tuple[HandlerStats, bool]] = {}
+
+    def events_per_second(self) -> float:
+        """
+        Number of events run per second of wall time.
+        """
+        if self.time_wall == 0.0:
+            return 0.0
+        return self.num_events / self.time_wall
+
+    def _write(self, text: str) -> None:
+        print(text, file=self._file or sys.stderr)
+
+    def progress(self, sim: greensim.Simulator) -> str:
+        """
+        Line reporting the progress of the simulation: simulated time against wall time, and the rate of events.
+        """
+        ratio = self.time_sim / self.time_wall if self.time_wall > 0.0 else 0.0
+        return (
+            f"sim {sim.now():.6g} s | wall {self.time_wall:.3f} s | sim/wall {ratio:.3g} | "
+            f"{self.num_events} events ({self.events_per_second():.0f}/s) | {self.num_switches} switches"
+        )
+
+    def summary(self) -> str:
+        """
+        Table summarizing the measurements: totals, then the handlers that took the most wall time.
+        """
+        lines = [
+            f"Events: {self.num_events}   Switches: {self.num_switches}   Wall: {self.time_wall:.3f} s   "
+            f"Simulated: {self.time_sim:.6g} s   Events/s: {self.events_per_second():.0f}",
+            f"{'Handler':<60}  {'Events':>9}  {'Total (ms)':>11}  {'Mean (us)':>10}  {'Max (us)':>10}  {'Share':>6}"
+        ]
+        time_handlers = sum(stats.time_total for stats in self.handlers.values()) or 1.0
+        ranked = sorted(self.handlers.items(), key=lambda item: item[1].time_total, reverse=True)
+        for name, stats in ranked[:self._num_top]:
+            lines.append(
+                f"{name[-60:]:<60}  {stats.count:>9}  {stats.time_total * 1e3:>11.3f}  {stats.time_mean * 1e6:>10.1f}  "
+                f"{stats.time_max * 1e6:>10.1f}  {stats.time_total / time_handlers:>6.1%}"
+            )
+        return "\n".join(lines)
+
+    def _new_handler(self, fn: Callable) -> Tuple[HandlerStats, bool]:
+        name = name_handler(fn)
+        stats = self.handlers.get(name)
+        if stats is None:
+            stats = self.handlers[name] = HandlerStats()
+        return stats, isinstance(getattr(fn, "__self__", None), greensim.Process)
+
+    def _count_switch(self, event: str, args: Any) -> None:
+        if event in ("switch", "throw"):
+            self.num_switches += 1
+
+    def _run(self, sim: greensim.Simulator, duration: float) -> None:
+        """
+        Runs the simulation as :py:meth:`greensim.Simulator.run` does, measuring each event.
+        """
+        id_stop = None
+        if duration != inf:
+            id_stop = sim._counter
+            sim._schedule(duration, sim.stop)
+
+        stats_handler = self._stats_handler
+        histogram = self.histogram
+        count_switches = not self._trace_switches
+        time_sim_start = sim.now()
+        time_wall_start = perf_counter()
+        time_progress = time_wall_start + self._progress_every if self._progress_every is not None else inf
+        if self._trace_switches:
+            trace_previous = greenlet.settrace(self._count_switch)
+        sim._is_running = True
+        try:
+            events = sim._events
+            pop_event = sim._pop_event  # type: ignore
+            while sim.is_running and len(events) > 0:
+                event = pop_event()
+                sim._ts_now = event.timestamp or sim._ts_now
+                start = perf_counter()
+                event.execute(sim)
+                end = perf_counter()
+
+                elapsed = end - start
+                key = _key_handler(event.fn)
+                try:
+                    stats, is_process = stats_handler[key]
+                except KeyError:
+                    stats, is_process = stats_handler[key] = self._new_handler(event.fn)
+                if is_process and count_switches:
+                    self.num_switches += 2
+                stats.count += 1
+                stats.time_total += elapsed
+                if elapsed > stats.time_max:
+                    stats.time_max = elapsed
+                histogram[min(int(elapsed * 1e6).bit_length(), NUM_BUCKETS - 1)] += 1
+                self.num_events += 1
+
+                if end >= time_progress:
+                    self._write(self._progress_during(sim, time_sim_start, time_wall_start, end))
+                    time_progress = end + self._progress_every
+        finally:
+            if self._trace_switches:
+                greenlet.settrace(trace_previous)
+            self.time_wall += perf_counter() - time_wall_start
+            self.time_sim += sim.now() - time_sim_start
+            sim.stop()
+            if id_stop is not None:
+                for event in sim._events:
+                    if event.identifier == id_stop:
+                        event.cancel()
+                        break
+
+        if self._summary:
+            self._write(self.summary())
+
+    def _progress_during(
+        self,
+        sim: greensim.Simulator,
+        time_sim_start: float,
+        time_wall_start: float,
+        now: float
+    ) -> str:
+        # Progress while a run is under way: the time of the run so far is added to that of the previous runs.
+        time_wall, time_sim = self.time_wall, self.time_sim
+        self.time_wall += now - time_wall_start
+        self.time_sim += sim.now() - time_sim_start
+        try:
+            return self.progress(sim)
+        finally:
+            self.time_wall, self.time_sim = time_wall, time_sim
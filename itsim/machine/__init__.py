@@ -53,3 +53,7 @@ class _Node(AbstractITObject):
     @abstractmethod
     def bind(self, protocol: Protocol = Protocol.NONE, pr: PortRepr = None, as_pid: int = -1) -> _Socket:
         pass
+
+    @abstractmethod
+    def is_port_bound(self, port: PortRepr) -> bool:
+        pass
@@ -1,8 +1,9 @@
 from collections import OrderedDict
-from itertools import cycle
-from typing import Callable, cast, Iterator, List, MutableMapping, Optional, Set, Union, Tuple, Any
+from typing import Callable, cast, FrozenSet, Iterator, List, MutableMapping, Optional, Union, Tuple, Any
 import weakref
 
+from itsim.network.flow import Flow
+from itsim.network.forwarding import ForwardingTable
 from itsim.network.route import Route
 from itsim.network.interface import Interface
 from itsim.network.link import Link, Loopback
@@ -12,8 +13,9 @@ from itsim.network.service.dhcp.client import DHCPClient
 from itsim.machine import _Node
 from itsim.software.context import Context
 from itsim.machine.file_system import File
-from itsim.machine.process_management.daemon import Daemon
+from itsim.machine.process_management.daemon import Daemon, WorkerPool
 from itsim.machine.process_management.process import Process
+from itsim.machine.process_management.table import ProcessTable
 from itsim.machine.process_management.thread import Thread
 from itsim.machine.socket import Socket
 from itsim.machine.user_management import UserAccount
@@ -26,6 +28,7 @@ PORT_MAX = 2 ** 16 - 1
 PORT_EPHEMERAL_MIN = 32768
 PORT_EPHEMERAL_UPPER = 61000
 NUM_PORTS_EPHEMERAL = PORT_EPHEMERAL_UPPER - PORT_EPHEMERAL_MIN
+ROUTE_CACHE_CAPACITY = 64
 
 
 class NameNotFound(Exception):
@@ -74,12 +77,23 @@ class Node(_Node):
     def __init__(self):
         super().__init__()
         self._interfaces: MutableMapping[Cidr, Interface] = OrderedDict()
-        self._connect_to(Loopback(), "127.0.0.1")
-        self._sockets: MutableMapping[Port, weakref.ReferenceType] = OrderedDict()
-        self._cycle_ports_ephemeral = cycle(range(PORT_EPHEMERAL_MIN, PORT_EPHEMERAL_UPPER))
-        self._proc_set: Set[Process] = set()
+        self._forwarding_table: Optional[ForwardingTable[Tuple[Interface, Route]]] = None
+        self._route_cache: "OrderedDict[Address, Tuple[Interface, Address]]" = OrderedDict()
+        self._route_cache_capacity = ROUTE_CACHE_CAPACITY
+        self._route_cache_hits = 0
+        self._route_cache_misses = 0
+        self._addresses_local: Optional[FrozenSet[Address]] = None
+        # The loopback interface, the ephemeral port table and the default parent process are set up on first use, as
+        # most nodes of large topologies never need them.
+        self._loopback_pending = True
+        self._sockets: MutableMapping[Port, weakref.ReferenceType] = {}
+        # One byte per ephemeral port, nonzero when the port is bound. The search for a free port starts from the
+        # cursor, so that ephemeral ports are handed out in cycle.
+        self._ports_ephemeral_bound: Optional[bytearray] = None
+        self._cursor_port_ephemeral = 0
+        self._proc_table = ProcessTable()
         self._process_counter: int = 0
-        self._default_process_parent = Process(-1, self)
+        self._default_process_parent_: Optional[Process] = None
 
     def _connect_to(
             self,
@@ -103,12 +117,82 @@ class Node(_Node):
         :return: The new :py:class:`~itsim.network.interface.Interface`
         """
 
-        link._connect(self)
+        if link.cidr == Loopback.shared().cidr:
+            self._loopback_pending = False
+        interface_replaced = self._interfaces.get(link.cidr)
+        if interface_replaced is not None:
+            interface_replaced.link._disconnect(interface_replaced)
         interface = Interface(link, as_address(ar, link.cidr), routes or [])
+        link._connect(self, interface)
         self._interfaces[link.cidr] = interface
+        interface._observe(self._on_interface_change)
+        self._on_interface_change(interface)
 
         return interface
 
+    def _connect_loopback(self) -> None:
+        """
+        Connects this node to the shared loopback link, ahead of its other interfaces, unless it has been connected to
+        a loopback network already.
+        """
+        if self._loopback_pending:
+            loopback = Loopback.shared()
+            self._connect_to(loopback, "127.0.0.1")
+            cast(OrderedDict, self._interfaces).move_to_end(loopback.cidr, last=False)
+
+    def _on_interface_change(self, interface: Interface) -> None:
+        """
+        Invoked whenever an interface is added to this node, or one of its interfaces is reassigned an address or
+        routes. Drops the routing and addressing state derived from the interfaces, so that it is rebuilt on its next
+        use.
+        """
+        self._forwarding_table = None
+        self._route_cache.clear()
+        self._addresses_local = None
+
+    def _get_addresses_local(self) -> FrozenSet[Address]:
+        """
+        Returns the set of addresses for which packets are delivered to this node: those of its interfaces, and the
+        broadcast addresses of their networks.
+        """
+        if self._addresses_local is None:
+            self._addresses_local = frozenset(
+                address
+                for interface in self.interfaces()
+                for address in (interface.address, interface.cidr.broadcast_address)
+            )
+        return self._addresses_local
+
+    @property
+    def route_cache_capacity(self) -> int:
+        """
+        Maximum number of destinations for which the node remembers the interface and next hop of the last packet sent
+        there. Setting this to 0 disables the cache.
+        """
+        return self._route_cache_capacity
+
+    @route_cache_capacity.setter
+    def route_cache_capacity(self, capacity: int) -> None:
+        if capacity < 0:
+            raise ValueError(f"Route cache capacity must be non-negative (here {capacity}).")
+        self._route_cache_capacity = capacity
+        while len(self._route_cache) > capacity:
+            self._route_cache.popitem(last=False)
+
+    @property
+    def route_cache_hits(self) -> int:
+        """
+        Number of route resolutions answered by the route cache.
+        """
+        return self._route_cache_hits
+
+    @property
+    def route_cache_misses(self) -> int:
+        """
+        Number of route resolutions that had to be computed from the node's forwarding table.
+        """
+        return self._route_cache_misses
+
     def connected_to_static(
             self,
             link: Link,
@@ -163,17 +247,28 @@ class Node(_Node):
         """
         Iterator through the networking interfaces set up for this node.
         """
-        yield from self._interfaces.values()
+        if self._loopback_pending:
+            self._connect_loopback()
+        return iter(self._interfaces.values())
+
+    def _get_ports_ephemeral_bound(self) -> bytearray:
+        if self._ports_ephemeral_bound is None:
+            self._ports_ephemeral_bound = bytearray(NUM_PORTS_EPHEMERAL)
+        return self._ports_ephemeral_bound
 
     def _get_port_ephemeral(self) -> Port:
-        num_ports_visited = 0
-        for port in self._cycle_ports_ephemeral:
-            if self.is_port_free(port):
-                return port
-            num_ports_visited += 1
-            if num_ports_visited >= NUM_PORTS_EPHEMERAL:
-                break
-        raise EphemeralPortsAllInUse()
+        ports_bound = self._get_ports_ephemeral_bound()
+        offset = ports_bound.find(0, self._cursor_port_ephemeral)
+        if offset < 0:
+            offset = ports_bound.find(0, 0, self._cursor_port_ephemeral)
+            if offset < 0:
+                raise EphemeralPortsAllInUse()
+        self._cursor_port_ephemeral = (offset + 1) % NUM_PORTS_EPHEMERAL
+        return PORT_EPHEMERAL_MIN + offset
+
+    def _mark_port_ephemeral(self, port: Port, bound: bool) -> None:
+        if PORT_EPHEMERAL_MIN <= port < PORT_EPHEMERAL_UPPER:
+            self._get_ports_ephemeral_bound()[port - PORT_EPHEMERAL_MIN] = bound
 
     def bind(self, protocol: Protocol = Protocol.NONE, pr: PortRepr = 0, as_pid: int = -1) -> Socket:
         """
@@ -197,46 +292,80 @@ class Node(_Node):
             raise PortAlreadyInUse(port)
         socket = Socket(protocol, port, self, as_pid)
         self._sockets[port] = weakref.ref(socket)
+        self._mark_port_ephemeral(port, True)
         return socket
 
     def is_port_free(self, port: PortRepr) -> bool:
         """
         Tells whether the given port number is free, and thus can be used with :py:meth:`bind`.
         """
-        return port not in [PORT_NULL, PORT_MAX] and port not in self._sockets
+        return port != PORT_NULL and port != PORT_MAX and port not in self._sockets
+
+    def is_port_bound(self, port: PortRepr) -> bool:
+        """
+        Tells whether a socket is bound to the given port number on this node.
+        """
+        return port in self._sockets
 
     def _deallocate_socket(self, socket: Socket) -> None:
         if socket.port in self._sockets:
             del self._sockets[socket.port]
+            self._mark_port_ephemeral(socket.port, False)
+
+    def _get_forwarding_table(self) -> ForwardingTable[Tuple[Interface, Route]]:
+        if self._forwarding_table is None:
+            forwarding_table: ForwardingTable[Tuple[Interface, Route]] = ForwardingTable()
+            for interface in self.interfaces():
+                for route in interface.routes:
+                    forwarding_table.add(route.cidr, (interface, route))
+            self._forwarding_table = forwarding_table
+        return self._forwarding_table
 
     def _solve_transfer(self, address_dest: Address) -> Tuple[Interface, Address]:
-        interface_best = None
-        route_best = None
-        for interface in self.interfaces():
-            for route in interface.routes:
-                if address_dest in route.cidr:
-                    if route_best is None or route.cidr.prefixlen > route_best.cidr.prefixlen:
-                        route_best = route
-                        interface_best = interface
-
-        if route_best is None:
+        try:
+            transfer = self._route_cache[address_dest]
+        except KeyError:
+            self._route_cache_misses += 1
+        else:
+            self._route_cache_hits += 1
+            self._route_cache.move_to_end(address_dest)
+            return transfer
+
+        solution = self._get_forwarding_table().lookup(address_dest)
+        if solution is None:
             raise NoRouteToHost(address_dest)
 
-        return cast(Interface, interface_best), cast(Route, route_best).get_hop(address_dest)
+        interface, route = solution
+        transfer = (interface, route.get_hop(address_dest))
+        if self._route_cache_capacity > 0:
+            self._route_cache[address_dest] = transfer
+            if len(self._route_cache) > self._route_cache_capacity:
+                self._route_cache.popitem(last=False)
+        return transfer
 
     def _send_packet(self, port_source: int, dest: Location, num_bytes: int, payload: Payload) -> None:
         interface, address_hop = self._solve_transfer(dest.hostname_as_address())
         packet = Packet(Location(interface.address, port_source), dest, num_bytes, payload)
-        interface.link._transfer_packet(packet, address_hop)
+        interface.link._transfer_packet_from(self, packet, address_hop)
+
+    def _send_flow(
+        self,
+        port_source: int,
+        dest: Location,
+        num_bytes: int,
+        payload: Payload,
+        rate_max: Optional[float]
+    ) -> Flow:
+        interface, address_hop = self._solve_transfer(dest.hostname_as_address())
+        flow = Flow(Packet(Location(interface.address, port_source), dest, num_bytes, payload), address_hop, rate_max)
+        interface.link._transfer_flow_from(self, flow)
+        return flow
 
     def _receive_packet(self, packet: Packet) -> None:
-        address_dest = packet.dest.hostname_as_address()
-        if any(
-            interface.address == address_dest or interface.cidr.broadcast_address == address_dest
-            for interface in self.interfaces()
-        ):
-            if packet.dest.port in self._sockets:
-                cast(Socket, self._sockets[packet.dest.port]())._enqueue(packet)
+        if packet.dest.hostname_as_address() in self._get_addresses_local():
+            ref_socket = self._sockets.get(packet.dest.port)
+            if ref_socket is not None:
+                cast(Socket, ref_socket())._enqueue(packet)
             else:
                 self.drop_packet(packet)
         else:
@@ -273,12 +402,21 @@ class Node(_Node):
             # TODO -- Implement name resolution.
             raise NotImplementedError()
 
-    def procs(self) -> Set[Process]:
-        return self._proc_set
+    @property
+    def _default_process_parent(self) -> Process:
+        if self._default_process_parent_ is None:
+            self._default_process_parent_ = Process(-1, self)
+        return self._default_process_parent_
+
+    def procs(self) -> ProcessTable:
+        """
+        Table of the processes running on this node, indexed by process ID.
+        """
+        return self._proc_table
 
     def run_proc_in(self, sim: Simulator, time: float, f: Callable[..., None], *args, **kwargs) -> Process:
         proc = Process(self.next_proc_number(), self, self._default_process_parent)
-        self._proc_set |= set([proc])
+        self._proc_table.add(proc)
         proc.exc_in(sim, time, f, *args, **kwargs)
         return proc
 
@@ -293,7 +431,7 @@ class Node(_Node):
         return self._process_counter - 1
 
     def proc_exit(self, p: Process) -> None:
-        self._proc_set -= set([p])
+        self._proc_table.remove(p)
 
     def with_proc(self, sim: Simulator, f: Callable[..., None], *args: Any, **kwargs: Any) -> _Node:
         return self.with_proc_in(sim, 0, f, *args, **kwargs)
@@ -320,7 +458,9 @@ class Node(_Node):
                               sim: Simulator,
                               daemon: Daemon,
                               protocol: Protocol,
-                              *ports: PortRepr) -> None:
+                              *ports: PortRepr,
+                              num_workers: Optional[int] = None,
+                              queue_limit: Optional[int] = None) -> Optional[WorkerPool]:
         """
         This method contains the logic subscribing the daemon to network events
 
@@ -330,6 +470,9 @@ class Node(_Node):
             transmissions
         :param ports: Variable number of :py:class:`~itsim.types.PortRepr` objects indicating the ports on which
             to listen
+        :param num_workers: If set, the daemon runs as a
+            :py:class:`~itsim.machine.process_management.daemon.WorkerPool` of this many threads.
+        :param queue_limit: Maximum number of packets waiting for a worker of the pool (unbounded by default).
 
         This method does two things:
 
@@ -337,8 +480,20 @@ class Node(_Node):
         2. Schedules an event in `sim` that will wait for a packet on the socket, and once one is received call the
             `trigger` method on `daemon`. After the packet receipt and before `trigger` is executed a new
             :py:class:`~itsim.machine.process_management.thread.Thread` is opened to wait for another packet in parallel
+
+        If the daemon does not block, a single thread receives the packets instead, and triggers the daemon on each as a
+        callback computation, in a thread of its own.
+
+        When ``num_workers`` is set, a single process runs the daemon instead, with one thread waiting on all the
+        sockets and a fixed number of worker threads triggering the daemon. The worker pool is then returned, so that
+        its statistics may be queried.
         """
 
+        if num_workers is not None:
+            pool = WorkerPool(daemon, num_workers, queue_limit)
+            self.run_proc(sim, pool._dispatch, [self.bind(protocol, port) for port in ports])
+            return pool
+
         for port in ports:
             new_sock = self.bind(protocol, port)
 
@@ -347,9 +502,23 @@ class Node(_Node):
                 context.thread.clone(forward_recv, socket)
                 daemon.trigger(context, packet, socket)
 
-            self.run_proc(sim, forward_recv, new_sock)
-
-    def networking_daemon(self, sim: Simulator, protocol: Protocol, *ports: PortRepr) -> Callable:
+            def forward_callback(context: Context, socket: Socket):
+                while True:
+                    packet = socket.recv()
+                    context.process.exc_callback(sim, daemon.trigger, packet, socket)
+
+            self.run_proc(sim, forward_recv if daemon.is_blocking else forward_callback, new_sock)
+        return None
+
+    def networking_daemon(
+        self,
+        sim: Simulator,
+        protocol: Protocol,
+        *ports: PortRepr,
+        num_workers: Optional[int] = None,
+        queue_limit: Optional[int] = None,
+        blocking: bool = True
+    ) -> Callable:
         """
         Makes the node run a daemon with custom request handling behaviour.
 
@@ -358,6 +527,10 @@ class Node(_Node):
             transmissions
         :param ports: Variable number of :py:class:`~itsim.types.PortRepr` objects indicating the ports on which
             to listen
+        :param num_workers: If set, the daemon runs as a worker pool (see :py:meth:`run_networking_daemon`).
+        :param queue_limit: Maximum number of packets waiting for a worker of the pool (unbounded by default).
+        :param blocking: Whether a callable daemon may block; see
+            :py:class:`~itsim.machine.process_management.daemon.Daemon`.
 
         This routine is meant to be used as a decorator over either a class, or some other callable. In the case of a
         class, it must subclass the `Daemon` class, have a constructor which takes no arguemnts,
@@ -380,10 +553,10 @@ class Node(_Node):
                 else:
                     daemon = cast(Daemon, server_behaviour())
             elif hasattr(server_behaviour, "__call__"):
-                daemon = Daemon(cast(Callable, server_behaviour))
+                daemon = Daemon(cast(Callable, server_behaviour), blocking)
             else:
                 raise TypeError("Daemon must have trigger() or be of type Callable")
-            self.run_networking_daemon(sim, daemon, protocol, *ports)
+            self.run_networking_daemon(sim, daemon, protocol, *ports, num_workers=num_workers, queue_limit=queue_limit)
             return server_behaviour
 
         return _decorator
@@ -392,7 +565,7 @@ class Node(_Node):
         return "(%s)" % ", ".join([str(i) for i in [
             self._interfaces,
             self._sockets,
-            self._proc_set,
+            list(self._proc_table),
             self._process_counter,
             self._default_process_parent,
         ]])
@@ -1,9 +1,15 @@
-from typing import Callable
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+import greensim
 
 from itsim import ITObject
 from itsim.machine import _Node
 from itsim.machine.process_management import _Service, _Thread
-from itsim.simulator import Simulator
+from itsim.machine.socket import Poller, Socket
+from itsim.network.packet import Packet
+from itsim.simulator import Simulator, now
+from itsim.software.context import Context
 
 
 class Daemon(ITObject):
@@ -14,16 +20,140 @@ class Daemon(ITObject):
     :py:meth:`~trigger`, with no inspection. This makes Daemon a container for event-driven simulation logic
 
     :param trigger_event: The logic to be executed when this Daemon is triggered. This is not a simulation event
+    :param blocking: Whether the logic may block (advancing the simulated clock, receiving packets...). Daemons that
+        never block are triggered as callback computations, which cost no greenlet.
     """
 
-    def __init__(self, trigger_event: Callable[..., None]):
+    _blocking = True
+
+    def __init__(self, trigger_event: Callable[..., None], blocking: bool = True):
         super().__init__()
         self._trigger_event = trigger_event
+        self._blocking = blocking
+
+    @property
+    def is_blocking(self) -> bool:
+        """
+        Whether the logic of the daemon may block.
+        """
+        return self._blocking
 
     def trigger(self, *args, **kwargs) -> None:
         self._trigger_event(*args, **kwargs)
 
 
+class WorkerPool(ITObject):
+    """
+    Execution model for a networking daemon where a fixed number of worker threads handle the packets received by the
+    daemon. A dispatcher thread waits on all the daemon's sockets at once and queues the packets they receive; idle
+    workers pull packets from this queue, first come, first served, and trigger the daemon with each. The number of
+    workers thus models the concurrency limit of the server, and the queue its backlog. This class is not
+    instantiated directly, but rather obtained from :py:meth:`~itsim.machine.node.Node.run_networking_daemon`.
+
+    :param daemon: Daemon triggered by the workers.
+    :param num_workers: Number of worker threads.
+    :param queue_limit: Maximum number of packets waiting for a worker; packets received while the queue is full are
+        dropped and counted. By default, the queue is unbounded.
+    """
+
+    def __init__(self, daemon: Daemon, num_workers: int, queue_limit: Optional[int] = None) -> None:
+        super().__init__()
+        if num_workers < 1:
+            raise ValueError(f"A worker pool needs at least one worker (got {num_workers}).")
+        self._daemon = daemon
+        self._num_workers = num_workers
+        self._queue_limit = queue_limit
+        self._queue: Deque[Tuple[Packet, Socket, float]] = deque()
+        self._signal_work = greensim.Signal().turn_off()
+        self._num_busy = 0
+        self._num_handled = 0
+        self._num_dropped = 0
+        self._queue_depth_max = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def num_workers(self) -> int:
+        """Number of worker threads."""
+        return self._num_workers
+
+    @property
+    def num_workers_busy(self) -> int:
+        """Number of workers currently handling a packet."""
+        return self._num_busy
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of packets waiting for a worker."""
+        return len(self._queue)
+
+    @property
+    def queue_depth_max(self) -> int:
+        """Largest number of packets that waited for a worker at once."""
+        return self._queue_depth_max
+
+    @property
+    def num_handled(self) -> int:
+        """Number of packets pulled from the queue by a worker."""
+        return self._num_handled
+
+    @property
+    def num_dropped(self) -> int:
+        """Number of packets dropped because the queue was full."""
+        return self._num_dropped
+
+    @property
+    def wait_max(self) -> float:
+        """Longest time a packet waited in the queue for a worker."""
+        return self._wait_max
+
+    @property
+    def wait_mean(self) -> float:
+        """Mean time packets waited in the queue for a worker."""
+        if self._num_handled == 0:
+            return 0.0
+        return self._wait_total / self._num_handled
+
+    def _enqueue(self, packet: Packet, socket: Socket) -> None:
+        if self._queue_limit is not None and len(self._queue) >= self._queue_limit:
+            self._num_dropped += 1
+            return
+        self._queue.append((packet, socket, now()))
+        self._queue_depth_max = max(self._queue_depth_max, len(self._queue))
+        self._signal_work.turn_on()
+
+    def _dispatch(self, context: Context, sockets: List[Socket]) -> None:
+        for _ in range(self._num_workers):
+            context.thread.clone(self._work)
+        poller = Poller(sockets)
+        while len(poller) > 0:
+            for socket in poller.poll():
+                if socket.is_closed:
+                    poller.unregister(socket)
+                else:
+                    for packet in socket.recv_many(socket.num_buffered):
+                        self._enqueue(packet, socket)
+
+    def _work(self, context: Context) -> None:
+        while True:
+            while len(self._queue) == 0:
+                self._signal_work.wait()
+            packet, socket, moment_queued = self._queue.popleft()
+            if len(self._queue) == 0:
+                self._signal_work.turn_off()
+
+            wait = now() - moment_queued
+            self._num_handled += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
+            self._num_busy += 1
+            try:
+                self._daemon.trigger(context, packet, socket)
+            finally:
+                self._num_busy -= 1
+
+
 class Service(_Service):
     """
     Base class for services, which contain a simulation event in the form of a :py:class:`~typing.Callable` which will
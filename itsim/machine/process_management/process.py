@@ -6,7 +6,10 @@ from itsim.machine.process_management.thread import Thread
 from itsim.types import Interrupt
 from itsim.utils import assert_list
 
-from typing import Any, Callable, Optional, Set
+from typing import Any, Callable, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from itsim.machine.process_management.table import ProcessTable  # noqa: F401
 
 
 class Process(_Process):
@@ -26,6 +29,7 @@ class Process(_Process):
         self._threads: Set[Thread] = set()
         self._thread_counter: int = 0
         self._event_dead = Event()
+        self._table: Optional["ProcessTable"] = None
 
     @property
     def children(self) -> Set[_Process]:
@@ -46,20 +50,41 @@ class Process(_Process):
         t = Thread(sim, self, self._thread_counter)
         self._thread_counter += 1
         t.run_in(time, f, *args, **kwargs)
-        self._threads |= set([t])
+        self._add_thread(t)
         # Not generally useful. For unit tests
         return t
 
     def exc(self, sim: Simulator, f: Callable[[Thread], None], *args, **kwargs) -> Thread:
         return self.exc_in(sim, 0, f, *args, **kwargs)
 
+    def exc_callback_in(self, sim: Simulator, time: float, f: Callable[..., None], *args, **kwargs) -> Thread:
+        """
+        Starts a thread running a function that never blocks, as a callback computation (see
+        :py:meth:`~itsim.machine.process_management.thread.Thread.run_callback_in`).
+        """
+        t = Thread(sim, self, self._thread_counter)
+        self._thread_counter += 1
+        t.run_callback_in(time, f, *args, **kwargs)
+        self._add_thread(t)
+        return t
+
+    def exc_callback(self, sim: Simulator, f: Callable[..., None], *args, **kwargs) -> Thread:
+        return self.exc_callback_in(sim, 0, f, *args, **kwargs)
+
+    def _add_thread(self, t: Thread) -> None:
+        self._threads.add(t)
+        if self._table is not None:
+            self._table._invalidate()
+
     def thread_complete(self, t: Thread):
-        self._threads -= set([t])
-        if self._threads == set():
+        self._threads.discard(t)
+        if self._table is not None:
+            self._table._invalidate()
+        if len(self._threads) == 0:
             self._die()
 
     def child_complete(self, p: _Process):
-        self._children -= set([p])
+        self._children.discard(p)
 
     def signal(self, sig: Interrupt) -> None:
         raise NotImplementedError()
@@ -72,7 +97,7 @@ class Process(_Process):
             self._die()
         else:
             # Once all threads are dead, method _die() will be called to complete the closure of this process.
-            for thread in self._threads:
+            for thread in list(self._threads):
                 thread.kill()
 
     def _die(self) -> None:
@@ -91,8 +116,10 @@ class Process(_Process):
             raise RuntimeError("Can only fork-exec processes with at least one running thread.")
 
         child = self.node.run_proc_in(sim, delay, f, *args, **kwargs)
+        if child._parent is not None:
+            child._parent._children.discard(child)
         child._parent = self
-        self._children |= set([child])
+        self._children.add(child)
         return child
 
     def fork_exec(self, f: Callable[..., None], *args, **kwargs) -> _Process:
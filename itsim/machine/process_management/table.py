@@ -0,0 +1,92 @@
+from typing import Dict, Iterable, Iterator, Mapping, NamedTuple, Optional, Tuple
+
+from itsim.machine import _Node
+from itsim.machine.process_management import _Process
+
+
+class ProcessRecord(NamedTuple):
+    """
+    State of a process at the moment a :py:meth:`ProcessTable.snapshot` is taken.
+
+    :ivar pid: Process ID.
+    :ivar pid_parent: ID of the parent process, or ``None`` for a process without parent.
+    :ivar threads: Numbers of the threads of the process still running.
+    """
+    pid: int
+    pid_parent: Optional[int]
+    threads: Tuple[int, ...]
+
+
+class ProcessTable:
+    """
+    Table of the processes running on a node, indexed by process ID. Processes enter the table when they start, and
+    leave it as they exit; their parent and children are kept by the processes themselves.
+
+    The table caches its last :py:meth:`snapshot`, dropping it whenever a process enters or leaves the table, or starts
+    or completes a thread. Snapshots of the many nodes where nothing happened since the previous snapshot are thus
+    obtained at no cost.
+    """
+
+    def __init__(self) -> None:
+        self._procs: Dict[int, _Process] = {}
+        self._snapshot: Optional[Tuple[ProcessRecord, ...]] = None
+
+    def __len__(self) -> int:
+        return len(self._procs)
+
+    def __iter__(self) -> Iterator[_Process]:
+        return iter(self._procs.values())
+
+    def __contains__(self, proc: object) -> bool:
+        return self._procs.get(getattr(proc, "pid", None)) is proc  # type: ignore
+
+    def get(self, pid: int) -> Optional[_Process]:
+        """
+        Returns the process of the given ID, or ``None`` if no such process runs.
+        """
+        return self._procs.get(pid)
+
+    def add(self, proc: _Process) -> None:
+        """
+        Enters a process in the table. Its ID must not be in use already.
+        """
+        if proc.pid in self._procs:
+            raise ValueError(f"Process ID {proc.pid} is already in use.")
+        self._procs[proc.pid] = proc
+        proc._table = self
+        self._snapshot = None
+
+    def remove(self, proc: _Process) -> None:
+        """
+        Removes a process from the table, if it is there.
+        """
+        if self._procs.get(proc.pid) is proc:
+            del self._procs[proc.pid]
+            proc._table = None
+            self._snapshot = None
+
+    def _invalidate(self) -> None:
+        self._snapshot = None
+
+    def snapshot(self) -> Tuple[ProcessRecord, ...]:
+        """
+        Returns the records of the processes in the table, sorted by process ID.
+        """
+        if self._snapshot is None:
+            self._snapshot = tuple(
+                ProcessRecord(
+                    pid,
+                    proc._parent.pid if proc._parent is not None else None,
+                    tuple(sorted(thread._n for thread in proc._threads))
+                )
+                for pid, proc in sorted(self._procs.items())
+            )
+        return self._snapshot
+
+
+def process_tree(nodes: Iterable[_Node]) -> Mapping[_Node, Tuple[ProcessRecord, ...]]:
+    """
+    Takes a snapshot of the processes and threads running on each of the given nodes. The parent-child relationships
+    between processes are expressed through the ``pid_parent`` field of the records.
+    """
+    return {node: node.procs().snapshot() for node in nodes}  # type: ignore
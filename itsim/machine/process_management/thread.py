@@ -1,7 +1,9 @@
 from .__init__ import _Thread, _Process
 
+from itsim import tracing
 from itsim.software.context import Context
-from itsim.simulator import Simulator, Event, SimulatedComputation, Interrupt, advance
+from itsim.simulator import Simulator, Event, SimulatedComputation, CallbackComputation, Interrupt, advance, \
+    run_callback
 from itsim.utils import assert_list
 
 from typing import Any, Callable, Set, Tuple, Optional
@@ -27,6 +29,7 @@ class Thread(_Thread):
         self._n: int = n
         self._computations: Set[SimulatedComputation] = set()
         self._event_dead = Event()
+        self._time_start: Optional[float] = sim.now() if tracing._recorder is not None else None
 
     @property
     def process(self) -> _Process:
@@ -40,13 +43,18 @@ class Thread(_Thread):
 
     def run_in(self, time: float, f: Callable[..., None], *args, **kwargs) -> Tuple[SimulatedComputation, Callable]:
         def wrap_computation(sim_comp, delay) -> None:
+            start = None
             try:
                 # We use advance() here instead of using the simulator's add_in() method. This enables starting the
                 # computation right away. Thereby, killing it raises the exception during the execution of this
                 # function to trigger the finally block.
                 advance(delay)
+                if tracing._recorder is not None:
+                    start = self._sim.now()
                 f(Context(self), *args, **kwargs)  # type: ignore
             finally:
+                if start is not None:
+                    self._trace("computation", f, start)
                 self.exit_f(sim_comp)
 
         sim_comp = SimulatedComputation()
@@ -59,6 +67,32 @@ class Thread(_Thread):
     def run(self, f: Callable[..., None], *args, **kwargs) -> Tuple[SimulatedComputation, Callable]:
         return self.run_in(0, f, *args, **kwargs)
 
+    def run_callback_in(self, time: float, f: Callable[..., None], *args, **kwargs) -> CallbackComputation:
+        """
+        Runs a function that never blocks as part of this thread, after the given delay. Rather than becoming a
+        greensim process, this function is called straight from the simulator's event queue, saving the creation of
+        a greenlet and the switches to and from it. It is passed a :py:class:`~itsim.software.context.Context`, like
+        functions run through :py:meth:`run_in`, and accounted for in the lifetime of the thread the same way. It may
+        query the simulated clock and schedule further events, but calls that would block it (such as ``advance`` or
+        ``Socket.recv`` on an empty socket) raise :py:class:`~itsim.simulator.BlockingInCallback`.
+        """
+        def callback() -> None:
+            sim_comp.has_started = True
+            try:
+                run_callback(self._sim, f, Context(self), *args, **kwargs)
+            finally:
+                if tracing._recorder is not None:
+                    self._trace("computation", f, self._sim.now())
+                self.exit_f(sim_comp)
+
+        sim_comp = CallbackComputation()
+        self._computations.add(sim_comp)
+        sim_comp.id_event = self._sim._schedule(time, callback)
+        return sim_comp
+
+    def run_callback(self, f: Callable[..., None], *args, **kwargs) -> CallbackComputation:
+        return self.run_callback_in(0, f, *args, **kwargs)
+
     def exit_f(self, sim_comp: SimulatedComputation) -> None:
         """
         Callback for functions that have completed. This drops them from the tracking set and,
@@ -66,9 +100,27 @@ class Thread(_Thread):
         """
         self._computations.remove(sim_comp)
         if len(self._computations) == 0:
+            if self._time_start is not None:
+                self._trace("thread", None, self._time_start)
             self._process.thread_complete(self)
             self._event_dead.fire()
 
+    def _trace(self, category: str, f: Optional[Callable], start: float) -> None:
+        """
+        Records the span of a computation of this thread, or of the thread itself, from the given moment to now.
+        """
+        recorder = tracing._recorder
+        if recorder is not None and recorder.sample():
+            name = f"thread {self._n}" if f is None else getattr(f, "__qualname__", type(f).__name__)
+            recorder.record(
+                category,
+                name,
+                start,
+                self._sim.now() - start,
+                self._process.node,
+                f"pid {self._process.pid} thread {self._n}"
+            )
+
     def __eq__(self, other: Any) -> bool:
         # NB: MagicMock overrides the type definition and makes this check fail if _Thread is replaced with Thread
         if not isinstance(other, _Thread):
@@ -94,8 +146,14 @@ class Thread(_Thread):
         termination is blocked until such computations have completed. Only *then* is the thread considered dead, and
         any other thread waiting on its termination (through method :py:meth:`join`) is resumed.
         """
-        for sim_comp in self._computations:
-            sim_comp.gp.interrupt(ThreadKilled())
+        for sim_comp in list(self._computations):
+            if isinstance(sim_comp, CallbackComputation):
+                # Callbacks cannot be interrupted once started; those still pending are simply cancelled.
+                if not sim_comp.has_started:
+                    self._sim._cancel(sim_comp.id_event)
+                    self.exit_f(sim_comp)
+            else:
+                sim_comp.gp.interrupt(ThreadKilled())
 
     def join(self, timeout: Optional[float] = None) -> None:
         """
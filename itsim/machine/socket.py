@@ -1,10 +1,13 @@
-from queue import Queue
-from typing import Optional
+from collections import deque, OrderedDict
+from typing import Deque, Iterable, List, MutableMapping, Optional
 
 import greensim
+from itsim import tracing
 from itsim.machine.__init__ import _Socket, _Node
+from itsim.network.flow import Flow
 from itsim.network.location import LocationRepr, Location
 from itsim.network.packet import Packet
+from itsim.simulator import _assert_may_block, _wait_signal, now
 from itsim.types import Port, Address, as_address, Payload, Hostname, Protocol, is_ip_address, Timeout
 
 
@@ -23,15 +26,30 @@ class Socket(_Socket):
         Port reserved on the host for running network transactions.
     :param node:
         Node that instantiated this object.
+    :param buffer_limit:
+        Maximum number of received packets held by the socket until they are :py:meth:`recv` 'ed. Packets received while
+        the buffer is full are dropped and counted. By default, the buffer is unbounded.
     """
 
-    def __init__(self, protocol: Protocol, port: Port, node: _Node, pid: int = -1) -> None:
+    def __init__(
+        self,
+        protocol: Protocol,
+        port: Port,
+        node: _Node,
+        pid: int = -1,
+        buffer_limit: Optional[int] = None
+    ) -> None:
         super().__init__()
         self._port = port
         self._protocol = protocol
         self._node: _Node = node
         self._pid: int = pid
-        self._packet_queue: Queue[Packet] = Queue()
+        self._packet_queue: Deque[Packet] = deque()
+        self._buffer_limit: Optional[int] = None
+        self.buffer_limit = buffer_limit
+        self._num_dropped = 0
+        self._pollers: List["Poller"] = []
+        # On when packets are held, or once the socket is closed: either way, receivers stop waiting.
         self._packet_signal: greensim.Signal = greensim.Signal().turn_off()
         self._close_signal: greensim.Signal = greensim.Signal().turn_off()
 
@@ -56,6 +74,34 @@ class Socket(_Socket):
             raise ValueError("Socket is closed")
         return self._pid
 
+    @property
+    def buffer_limit(self) -> Optional[int]:
+        """
+        Maximum number of received packets held by the socket until they are received, or ``None`` if unbounded.
+        Lowering the limit below the number of packets already held does not drop any of them.
+        """
+        return self._buffer_limit
+
+    @buffer_limit.setter
+    def buffer_limit(self, limit: Optional[int]) -> None:
+        if limit is not None and limit < 0:
+            raise ValueError(f"Buffer limit cannot be negative (got {limit}).")
+        self._buffer_limit = limit
+
+    @property
+    def num_dropped(self) -> int:
+        """
+        Number of packets dropped because they were received while the socket's buffer was full.
+        """
+        return self._num_dropped
+
+    @property
+    def num_buffered(self) -> int:
+        """
+        Number of received packets held by the socket until they are received.
+        """
+        return len(self._packet_queue)
+
     def __del__(self):
         """
         This is a safeguard against failure to properly close a socket before its reference is dropped. As a
@@ -80,6 +126,12 @@ class Socket(_Socket):
         if not self.is_closed:
             self._node._deallocate_socket(self)
             self._close_signal.turn_on()
+            self._packet_signal.turn_on()
+            self._notify_pollers()
+
+    def _notify_pollers(self) -> None:
+        for poller in self._pollers:
+            poller._on_ready(self)
 
     @property
     def is_closed(self) -> bool:
@@ -106,7 +158,39 @@ class Socket(_Socket):
             raise ValueError("Socket is closed")
         dest = Location.from_repr(dr)
         address_dest = self._resolve_destination(dest.hostname)
-        self._node._send_packet(self.port, Location(address_dest, dest.port), size, payload or {})
+        if address_dest is not dest.hostname:
+            dest = Location(address_dest, dest.port)
+        self._node._send_packet(self.port, dest, size, payload or {})
+
+    def send_flow(
+        self,
+        dr: LocationRepr,
+        size: int,
+        rate_max: Optional[float] = None,
+        payload: Optional[Payload] = None
+    ) -> Flow:
+        """
+        Sends a bulk amount of information to a certain destination, as a :py:class:`~itsim.network.flow.Flow` rather
+        than as individual packets. The flow shares the bandwidth of the link with the other flows transmitted over it;
+        once it is complete, the destination receives a single :py:class:`Packet` standing for the whole flow. This
+        method does not block: the returned flow object may be :py:meth:`~itsim.network.flow.Flow.wait` ed on.
+
+        :param dr:
+            Destination of the flow, either provided as a :py:class:`Location` instance or as a (hostname, port) tuple.
+        :param size:
+            Number of bytes to send.
+        :param rate_max:
+            Maximum rate at which to send, in bits per second. By default, the flow is only limited by the link.
+        :param payload:
+            Optional information payload added to the packet delivered at the end of the flow.
+        """
+        if self.is_closed:
+            raise ValueError("Socket is closed")
+        dest = Location.from_repr(dr)
+        address_dest = self._resolve_destination(dest.hostname)
+        if address_dest is not dest.hostname:
+            dest = Location(address_dest, dest.port)
+        return self._node._send_flow(self.port, dest, size, payload or {}, rate_max)
 
     def _resolve_destination(self, hostname_dest: Hostname) -> Address:
         if is_ip_address(hostname_dest):
@@ -115,31 +199,162 @@ class Socket(_Socket):
             return self._node.resolve_name(hostname_dest)
 
     def _enqueue(self, packet: Packet) -> None:
-        self._packet_queue.put(packet)
+        if self._buffer_limit is not None and len(self._packet_queue) >= self._buffer_limit:
+            self._num_dropped += 1
+            return
+        self._packet_queue.append(packet)
         self._packet_signal.turn_on()
+        if self._pollers:
+            self._notify_pollers()
 
-    def recv(self, timeout: Optional[float] = None) -> Packet:
-        """
-        Blocks until a packet is received on the socket's :py:meth:`port`.
-
-        :param timeout:
-            If this parameter is set to a numerical value, the process invoking this method only blocks this much time.
-            If no packet is received when the timeout fires, the :py:class:`Timeout` exception is raised on the calling
-            process.
-        """
+    def _wait_for_packets(self, timeout: Optional[float]) -> None:
         if self.is_closed:
             raise ValueError("Socket is closed")
 
+        # Packets already held are received without yielding the process.
+        if len(self._packet_queue) > 0:
+            return
+
+        _assert_may_block("wait for packets")
+        start = now() if tracing._recorder is not None else None
+        timed_out = False
         try:
-            greensim.select(self._packet_signal, self._close_signal, timeout=timeout)
+            _wait_signal(self._packet_signal, timeout)
         except greensim.Timeout:
+            timed_out = True
             raise Timeout()
+        finally:
+            if start is not None:
+                self._trace_wait(start, timed_out)
 
         if self.is_closed:  # Only possible if the close signal has been turned on.
             raise ValueError("Socket is closed")
 
-        output = self._packet_queue.get()
-        if self._packet_queue.empty():
+    def _trace_wait(self, start: float, timed_out: bool) -> None:
+        recorder = tracing._recorder
+        if recorder is not None and recorder.sample():
+            recorder.record(
+                "recv",
+                f"recv :{self._port}",
+                start,
+                now() - start,
+                self._node,
+                f"pid {self._pid} sockets",
+                {"timeout": timed_out, "closed": self.is_closed}
+            )
+
+    def recv(self, timeout: Optional[float] = None) -> Packet:
+        """
+        Blocks until a packet is received on the socket's :py:meth:`port`.
+
+        :param timeout:
+            If this parameter is set to a numerical value, the process invoking this method only blocks this much time.
+            If no packet is received when the timeout fires, the :py:class:`Timeout` exception is raised on the calling
+            process.
+        """
+        self._wait_for_packets(timeout)
+        output = self._packet_queue.popleft()
+        if len(self._packet_queue) == 0:
             self._packet_signal.turn_off()
+        return output
 
+    def recv_many(self, max_packets: int, timeout: Optional[float] = None) -> List[Packet]:
+        """
+        Blocks until at least one packet is received on the socket's :py:meth:`port`, then returns all the packets held
+        by the socket, up to ``max_packets``.
+
+        :param max_packets:
+            Maximum number of packets to return.
+        :param timeout:
+            As for :py:meth:`recv`.
+        """
+        if max_packets < 1:
+            raise ValueError(f"Must receive at least one packet (asked for {max_packets}).")
+        self._wait_for_packets(timeout)
+        queue = self._packet_queue
+        if len(queue) <= max_packets:
+            output = list(queue)
+            queue.clear()
+        else:
+            output = [queue.popleft() for _ in range(max_packets)]
+        if len(queue) == 0:
+            self._packet_signal.turn_off()
         return output
+
+
+class Poller:
+    """
+    Multiplexed wait over a set of sockets, so that a single process may serve many of them. A socket is *ready* when it
+    holds received packets, or when it has been closed. The sockets signal the poller when they become ready, so
+    that waiting on any number of sockets is a wait on a single signal.
+
+    The poller keeps a reference to the sockets registered with it, so they are not finalized until unregistered.
+
+    :param sockets: Sockets to register with the poller right away.
+    """
+
+    def __init__(self, sockets: Iterable[Socket] = ()) -> None:
+        super().__init__()
+        self._sockets: MutableMapping[Socket, None] = OrderedDict()
+        self._ready: MutableMapping[Socket, None] = OrderedDict()
+        self._signal = greensim.Signal().turn_off()
+        for socket in sockets:
+            self.register(socket)
+
+    def __len__(self) -> int:
+        """
+        Number of sockets registered with the poller.
+        """
+        return len(self._sockets)
+
+    def register(self, socket: Socket) -> None:
+        """
+        Adds a socket to those polled. Registering a socket twice has no effect.
+        """
+        if socket not in self._sockets:
+            self._sockets[socket] = None
+            socket._pollers.append(self)
+            if socket.is_closed or socket.num_buffered > 0:
+                self._on_ready(socket)
+
+    def unregister(self, socket: Socket) -> None:
+        """
+        Removes a socket from those polled.
+        """
+        if socket in self._sockets:
+            del self._sockets[socket]
+            socket._pollers.remove(self)
+            self._ready.pop(socket, None)
+            if len(self._ready) == 0:
+                self._signal.turn_off()
+
+    def _on_ready(self, socket: Socket) -> None:
+        self._ready[socket] = None
+        self._signal.turn_on()
+
+    def poll(self, timeout: Optional[float] = None) -> List[Socket]:
+        """
+        Blocks until at least one of the registered sockets is ready, then returns all the sockets that are, in the
+        order they became ready. Each of these sockets can then be :py:meth:`~Socket.recv` 'ed from without blocking,
+        unless it has been closed.
+
+        :param timeout:
+            If this parameter is set to a numerical value, the process invoking this method only blocks this much time.
+            If no socket is ready when the timeout fires, the :py:class:`Timeout` exception is raised on the calling
+            process.
+        """
+        deadline = None if timeout is None else now() + timeout
+        while True:
+            if not self._signal.is_on:
+                _assert_may_block("poll sockets")
+            try:
+                _wait_signal(self._signal, None if deadline is None else max(0.0, deadline - now()))
+            except greensim.Timeout:
+                raise Timeout()
+
+            # Sockets may have been drained by other processes since they signalled their readiness.
+            ready = [socket for socket in self._ready if socket.is_closed or socket.num_buffered > 0]
+            self._ready.clear()
+            self._signal.turn_off()
+            if len(ready) > 0:
+                return ready
@@ -9,5 +9,9 @@ class _Link(ITObject):
     pass
 
 
-class _Packet(ITObject):
-    pass
+class _Packet:
+    """
+    Packets are not ITObjects: millions of them are built over the course of a simulation, so they carry neither tags
+    nor an eagerly generated UUID.
+    """
+    __slots__ = ()
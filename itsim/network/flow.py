@@ -0,0 +1,182 @@
+from typing import Callable, List, Optional
+
+from itsim.machine import _Node
+from itsim.network.packet import Packet
+from itsim.simulator import Event, add_in, now
+from itsim.types import Address
+
+
+class Flow:
+    """
+    Bulk transfer of data over a link, modeled as a fluid: rather than as a sequence of packets, the flow's data is
+    transmitted at a rate that changes only when other flows start or stop on the same link. Its recipient receives
+    a single packet, standing for the whole flow, once the flow is complete. This class is not instantiated directly,
+    but rather obtained as result of method :py:meth:`~itsim.machine.socket.Socket.send_flow`.
+
+    :param packet: Packet delivered to the recipient of the flow once it is complete.
+    :param hop: Address of the recipient of the flow on the link.
+    :param rate_max: Maximum rate at which the flow is transmitted, in bits per second (unlimited if ``None``).
+    """
+
+    def __init__(self, packet: Packet, hop: Address, rate_max: Optional[float] = None) -> None:
+        if rate_max is not None and rate_max <= 0.0:
+            raise ValueError(f"Flow maximum rate must be positive (got {rate_max}).")
+        self._packet = packet
+        self._hop = hop
+        self._recipient: Optional[_Node] = None
+        self._rate_max = rate_max
+        self._rate = 0.0
+        self._bits_remaining = 8.0 * packet.byte_size
+        self._time_start: Optional[float] = None
+        self._time_complete: Optional[float] = None
+        self._complete = Event()
+
+    @property
+    def packet(self) -> Packet:
+        """
+        Packet delivered to the recipient of the flow once it is complete.
+        """
+        return self._packet
+
+    @property
+    def hop(self) -> Address:
+        """
+        Address of the recipient of the flow on the link.
+        """
+        return self._hop
+
+    @property
+    def rate_max(self) -> Optional[float]:
+        """
+        Maximum rate at which the flow is transmitted, in bits per second.
+        """
+        return self._rate_max
+
+    @property
+    def rate(self) -> float:
+        """
+        Rate at which the flow is currently being transmitted, in bits per second.
+        """
+        return self._rate
+
+    @property
+    def time_start(self) -> Optional[float]:
+        """
+        Moment the transmission of the flow started.
+        """
+        return self._time_start
+
+    @property
+    def time_complete(self) -> Optional[float]:
+        """
+        Moment the transmission of the flow completed, or ``None`` if it is still under way. The recipient receives the
+        flow's packet once the latency of the link has elapsed after this moment.
+        """
+        return self._time_complete
+
+    def is_complete(self) -> bool:
+        """
+        Tells whether the transmission of the flow has completed.
+        """
+        return self._complete.has_fired()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        Blocks until the transmission of the flow has completed, or the given timeout has elapsed, in which case
+        :py:class:`~itsim.types.Timeout` is raised.
+        """
+        self._complete.wait(timeout)
+
+
+def share_max_min(capacity: float, flows: List[Flow]) -> None:
+    """
+    Sets the rate of each of the given flows so as to share the capacity of a link in a max-min fair manner: flows
+    whose maximum rate is lower than their fair share of the capacity get their maximum rate, and the capacity they
+    leave is split evenly between the other flows.
+    """
+    capacity_left = capacity
+    num_left = len(flows)
+    for flow in sorted(flows, key=lambda f: f.rate_max if f.rate_max is not None else float("inf")):
+        share = capacity_left / num_left
+        if flow.rate_max is not None and flow.rate_max < share:
+            flow._rate = flow.rate_max
+        else:
+            flow._rate = share
+        capacity_left -= flow._rate
+        num_left -= 1
+
+
+class FlowSharing:
+    """
+    Tracks the flows being transmitted over a link and shares its bandwidth between them. A single event is kept
+    scheduled, for the moment the next flow completes; when flows start or complete, the rates are shared anew and this
+    event is rescheduled. Events scheduled before a rescheduling are recognized by their generation number, and ignored.
+
+    :param sample_capacity: Returns the bandwidth of the link, in bits per second. This is sampled when a flow starts on
+        an idle link, and kept until the link is idle again.
+    :param deliver: Called with each flow that completes.
+    """
+
+    # Bits remaining below which a flow is deemed complete, absorbing the rounding error on rates and durations.
+    EPSILON_BITS = 1e-6
+
+    def __init__(self, sample_capacity: Callable[[], float], deliver: Callable[[Flow], None]) -> None:
+        self._sample_capacity = sample_capacity
+        self._deliver = deliver
+        self._flows: List[Flow] = []
+        self._capacity = 0.0
+        self._time_last = 0.0
+        self._generation = 0
+
+    def __len__(self) -> int:
+        """
+        Number of flows being transmitted.
+        """
+        return len(self._flows)
+
+    def start(self, flow: Flow) -> None:
+        """
+        Starts transmitting the given flow, alongside those already under way.
+        """
+        moment = now()
+        if len(self._flows) == 0:
+            self._capacity = self._sample_capacity()
+        else:
+            self._advance_to(moment)
+        self._time_last = moment
+        flow._time_start = moment
+        self._flows.append(flow)
+        self._reschedule()
+
+    def _advance_to(self, moment: float) -> None:
+        elapsed = moment - self._time_last
+        for flow in self._flows:
+            flow._bits_remaining -= flow.rate * elapsed
+        self._time_last = moment
+
+    def _reschedule(self) -> None:
+        self._generation += 1
+        if len(self._flows) == 0:
+            return
+        share_max_min(self._capacity, self._flows)
+        delay = min(max(flow._bits_remaining, 0.0) / flow.rate for flow in self._flows)
+        add_in(delay, self._on_completion, self._generation)
+
+    def _on_completion(self, generation: int) -> None:
+        if generation != self._generation:
+            return
+        moment = now()
+        self._advance_to(moment)
+        flows_complete = [flow for flow in self._flows if flow._bits_remaining <= self.EPSILON_BITS]
+        if len(flows_complete) == 0:
+            # The flow expected to complete has a sliver of data left, as a result of rounding error.
+            flows_complete = [min(self._flows, key=lambda f: f._bits_remaining)]
+        for flow in flows_complete:
+            self._flows.remove(flow)
+            flow._bits_remaining = 0.0
+            flow._rate = 0.0
+            flow._time_complete = moment
+        self._reschedule()
+        for flow in flows_complete:
+            flow._complete.fire()
+            self._deliver(flow)
@@ -0,0 +1,115 @@
+from typing import Generic, List, MutableMapping, Optional, TypeVar
+
+from itsim.types import Address, Cidr
+
+
+T = TypeVar("T")
+
+
+class _TrieNode(Generic[T]):
+    """
+    Node of a path-compressed binary trie, standing for the network prefix made of the ``length`` most significant bits
+    of the address space. This node's ``entry`` is set when a route to this exact prefix was inserted in the trie.
+    """
+
+    __slots__ = ("prefix", "length", "entry", "children")
+
+    def __init__(self, prefix: int, length: int, entry: Optional[T] = None) -> None:
+        self.prefix = prefix
+        self.length = length
+        self.entry = entry
+        self.children: List[Optional[_TrieNode[T]]] = [None, None]
+
+
+class ForwardingTable(Generic[T]):
+    """
+    Longest-prefix-match table keyed on the integer value of network prefixes. Entries are stored in a path-compressed
+    binary trie, so that a lookup visits only the prefixes that contain the looked-up address, and never more than the
+    number of bits of the address.
+
+    When entries are inserted for the same prefix more than once, the first entry is kept: this reproduces the
+    resolution of a sequential scan that retains a route only if its prefix is strictly longer than the best one so far.
+    Entries may not be ``None``, as this value stands for the absence of an entry.
+    """
+
+    def __init__(self) -> None:
+        self._roots: MutableMapping[int, _TrieNode[T]] = {}
+        self._len = 0
+
+    def __len__(self) -> int:
+        """
+        Number of distinct prefixes in the table.
+        """
+        return self._len
+
+    def _root(self, width: int) -> _TrieNode[T]:
+        if width not in self._roots:
+            self._roots[width] = _TrieNode(0, 0)
+        return self._roots[width]
+
+    def add(self, cidr: Cidr, entry: T) -> None:
+        """
+        Associates the given entry to a network prefix, unless an entry is already associated to it.
+        """
+        if entry is None:
+            raise ValueError("Forwarding table entries cannot be None.")
+        width = cidr.max_prefixlen
+        length = cidr.prefixlen
+        prefix = int(cidr.network_address) >> (width - length)
+        node = self._root(width)
+
+        while True:
+            if node.length == length:
+                if node.entry is None:
+                    node.entry = entry
+                    self._len += 1
+                return
+
+            bit = (prefix >> (length - node.length - 1)) & 1
+            child = node.children[bit]
+            if child is None:
+                node.children[bit] = _TrieNode(prefix, length, entry)
+                self._len += 1
+                return
+
+            # Number of leading bits shared by the child's prefix and the new one. Since both sit under the same bit
+            # of the current node, they have at least node.length + 1 bits in common.
+            num_bits = min(child.length, length)
+            diff = (child.prefix >> (child.length - num_bits)) ^ (prefix >> (length - num_bits))
+            common = num_bits - diff.bit_length()
+            if common == child.length:
+                node = child
+                continue
+
+            # The child and the new prefix diverge before the end of the child's prefix: split the path with an
+            # intermediate node standing for their common prefix.
+            middle: _TrieNode[T] = _TrieNode(prefix >> (length - common), common)
+            node.children[bit] = middle
+            middle.children[(child.prefix >> (child.length - common - 1)) & 1] = child
+            if common == length:
+                middle.entry = entry
+            else:
+                middle.children[(prefix >> (length - common - 1)) & 1] = _TrieNode(prefix, length, entry)
+            self._len += 1
+            return
+
+    def lookup(self, address: Address) -> Optional[T]:
+        """
+        Returns the entry associated to the longest prefix containing the given address, or ``None`` if no prefix of
+        the table contains it.
+        """
+        width = address.max_prefixlen
+        node = self._roots.get(width)
+        if node is None:
+            return None
+
+        key = int(address)
+        best = node.entry
+        while node.length < width:
+            child = node.children[(key >> (width - node.length - 1)) & 1]
+            if child is None or (key >> (width - child.length)) != child.prefix:
+                break
+            node = child
+            if node.entry is not None:
+                best = node.entry
+        return best
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Callable, List, Sequence, Tuple
 
 from itsim.network.route import Route, Local
 from itsim.network.link import Link
@@ -22,8 +22,10 @@ class Interface:
     def __init__(self, link: Link, address: Address, routes: List[Route]) -> None:
         super().__init__()
         self._link = link
+        self._observers: List[Callable[["Interface"], None]] = []
+        self._route_local = Local(self.cidr)
         self.routes = routes
-        self.address = address
+        self._address = as_address(address, self.cidr)
 
     @property
     def link(self) -> Link:
@@ -51,18 +53,33 @@ class Interface:
     def address(self, ar: AddressRepr) -> None:
         """
         The new address is re-rooted so that the final address for this interface lies within the CIDR of the associated
-        link.
+        link. The link is notified of the change, so it may keep resolving packets to this interface's node.
         """
+        address_old = self._address
         self._address = as_address(ar, self.cidr)
+        self._link._update_address(self, address_old, self._address)
+        self._notify()
 
     @property
-    def routes(self):
+    def routes(self) -> Tuple[Route, ...]:
         """
-        List of :py:class:`Route`s for this interface. A :py:class:`Local` route to the CIDR of the associated
-        :py:class:`Link` is always present, even though it has not been explicitly specified.
+        Sequence of :py:class:`Route`s for this interface. A :py:class:`Local` route to the CIDR of the associated
+        :py:class:`Link` is always present, even though it has not been explicitly specified. This sequence is
+        immutable: routes are changed by assigning a new list to this property.
         """
-        return [Local(self.cidr)] + self._routes
+        return self._routes
 
     @routes.setter
-    def routes(self, fs: List[Route]):
-        self._routes = fs
+    def routes(self, fs: Sequence[Route]):
+        self._routes = (self._route_local,) + tuple(fs)
+        self._notify()
+
+    def _observe(self, observer: Callable[["Interface"], None]) -> None:
+        """
+        Registers a callback invoked every time the address or the routes of this interface are reassigned.
+        """
+        self._observers.append(observer)
+
+    def _notify(self) -> None:
+        for observer in self._observers:
+            observer(self)
@@ -1,16 +1,24 @@
+from enum import Enum, unique
 import sys
-from typing import Iterator, Set
+from typing import cast, Hashable, Iterator, List, MutableMapping, Optional, Set, Tuple, TYPE_CHECKING
+from weakref import WeakKeyDictionary
 
-from greensim.random import constant, bounded
+from greensim.random import constant
 
+from itsim import tracing
 from itsim.machine import _Node
 from itsim.network import _Connection, _Link
+from itsim.network.flow import Flow, FlowSharing
 from itsim.network.packet import Packet
-from itsim.random import VarRandomTime, VarRandomBandwidth
-from itsim.simulator import add_in
+from itsim.random import VarRandomTime, VarRandomBandwidth, bounded_var
+from itsim.simulator import add_in, now
 from itsim.types import CidrRepr, Cidr, as_cidr, AddressRepr, Address
 from itsim.units import GbPS
 
+if TYPE_CHECKING:
+    from itsim.network.interface import Interface  # noqa: F401
+    from itsim.pdes import Outbox  # noqa: F401
+
 
 BANDWIDTH_MIN = 1.0 / 10.0  # 1 bit every 10 seconds
 
@@ -22,6 +30,66 @@ class NoSuchAddress(Exception):
         self.address = address
 
 
+@unique
+class Contention(Enum):
+    """
+    Models of contention between the packets transmitted over a link.
+
+    - ``NONE``: packets are transmitted independently of one another, as though the link had unlimited capacity.
+    - ``SHARED``: the link is a shared medium, over which a single packet is transmitted at a time.
+    - ``PER_PORT``: each node has its own transmit port onto the link, over which it transmits a single packet at a
+      time, as it would through a switch.
+
+    Packets waiting for the medium or port to be free are queued first come, first served.
+    """
+    NONE = "none"
+    SHARED = "shared"
+    PER_PORT = "per_port"
+
+
+class LinkStats:
+    """
+    Statistics on the transmissions over a link.
+
+    :ivar num_packets: Number of packets transmitted.
+    :ivar num_bytes: Total size of the packets transmitted.
+    :ivar time_busy: Total time spent transmitting packets (excluding latency).
+    :ivar delay_queue_total: Total time spent by packets waiting for their transmission to start.
+    :ivar delay_queue_max: Longest time a packet waited for its transmission to start.
+    """
+
+    def __init__(self) -> None:
+        self.num_packets = 0
+        self.num_bytes = 0
+        self.time_busy = 0.0
+        self.delay_queue_total = 0.0
+        self.delay_queue_max = 0.0
+
+    def _record(self, num_bytes: int, duration_transmission: float, delay_queue: float) -> None:
+        self.num_packets += 1
+        self.num_bytes += num_bytes
+        self.time_busy += duration_transmission
+        self.delay_queue_total += delay_queue
+        if delay_queue > self.delay_queue_max:
+            self.delay_queue_max = delay_queue
+
+    @property
+    def delay_queue_mean(self) -> float:
+        """
+        Mean time packets waited for their transmission to start.
+        """
+        if self.num_packets == 0:
+            return 0.0
+        return self.delay_queue_total / self.num_packets
+
+    def utilization(self, duration: float) -> float:
+        """
+        Fraction of the given duration (typically, the time elapsed in the simulation) spent transmitting packets. For
+        links with a transmit port per node, this is the sum of the utilization of each port.
+        """
+        return self.time_busy / duration
+
+
 class Link(_Link):
     """
     Physical medium network communications, intended to support a certain IP network.
@@ -31,21 +99,58 @@ class Link(_Link):
         Latency model (PRNG) for packets exchanged on this link (sampled every time a packet is transmitted on
         this link).
     :param bandwidth:
-        Bandwidth (PRNG) for packets exchanged on this link (idem).
+        Bandwidth (PRNG) for packets exchanged on this link (idem). Using :py:class:`~itsim.random.BlockSampler`
+        instances for the latency and bandwidth models makes the link sample them in blocks.
+    :param broadcast_to_bound_only:
+        If True, broadcast packets are only handed to the nodes that have a socket bound to the packet's destination
+        port; the other nodes are skipped without being asked to receive the packet, so their ``drop_packet`` hook is
+        not invoked for it.
+    :param contention:
+        Model of contention between the packets transmitted over the link. By default, packets do not contend. Under
+        the other models, the link keeps the time until which the medium (or each port) is busy, and packets wait for
+        that time before their transmission starts.
+    :param latency_min:
+        Lower bound on the latency of the link: latency samples below it are clipped back to it. When the link joins
+        partitions of a model simulated in parallel (see :py:mod:`itsim.pdes`), this bound is the lookahead the
+        partitions synchronize with.
     """
 
-    def __init__(self, c: CidrRepr, latency: VarRandomTime, bandwidth: VarRandomBandwidth) -> None:
+    def __init__(
+        self,
+        c: CidrRepr,
+        latency: VarRandomTime,
+        bandwidth: VarRandomBandwidth,
+        broadcast_to_bound_only: bool = False,
+        contention: Contention = Contention.NONE,
+        latency_min: float = 0.0
+    ) -> None:
         super().__init__()
+        if latency_min < 0.0:
+            raise ValueError(f"Minimum latency must be nonnegative (got {latency_min}).")
         self._cidr = as_cidr(c)
-        self._latency = bounded(latency, lower=0.0)
-        self._bandwidth = bounded(bandwidth, lower=sys.float_info.min)
+        self._latency_min = latency_min
+        self._latency = iter(bounded_var(latency, lower=latency_min))
+        self._bandwidth = iter(bounded_var(bandwidth, lower=sys.float_info.min))
         self._nodes: Set[_Node] = set()
+        self._owners: MutableMapping["Interface", _Node] = {}
+        self._address_table: MutableMapping[Address, List["Interface"]] = {}
+        self._broadcast_to_bound_only = broadcast_to_bound_only
+        self._contention = contention
+        self._busy_until: MutableMapping[Hashable, float] = {}
+        self._stats = LinkStats()
+        self._flows = FlowSharing(lambda: next(self._bandwidth), self._deliver_flow)
+        self._outbox: Optional["Outbox"] = None
 
     @property
     def cidr(self) -> Cidr:
         """Returns the CIDR descriptor of the network."""
         return self._cidr
 
+    @property
+    def latency_min(self) -> float:
+        """Returns the lower bound on the latency of the link."""
+        return self._latency_min
+
     def connected_as(self, ar: AddressRepr = None) -> _Connection:
         """
         Generates a Connection instance to tie a certain node to this network. This connection object requests
@@ -58,35 +163,203 @@ class Link(_Link):
         """
         raise NotImplementedError()
 
+    @property
+    def contention(self) -> Contention:
+        """Returns the model of contention between packets transmitted over the link."""
+        return self._contention
+
+    @property
+    def stats(self) -> LinkStats:
+        """Returns the statistics on the transmissions over the link."""
+        return self._stats
+
     def iter_nodes(self) -> Iterator[_Node]:
         """
         Iteration over the nodes connected to a link.
         """
         return iter(self._nodes)
 
-    def _connect(self, node: _Node) -> None:
+    def _connect(self, node: _Node, interface: "Interface") -> None:
         self._nodes.add(node)
+        self._owners[interface] = node
+        self._index_address(interface.address, interface)
+
+    def _disconnect(self, interface: "Interface") -> None:
+        """
+        Forgets an interface previously connected to this link, so that its address no longer resolves. The owning node
+        is dropped from the link once none of its interfaces remain connected to it.
+        """
+        node = self._owners.pop(interface, None)
+        if node is not None:
+            self._unindex_address(interface.address, interface)
+            if node not in self._owners.values():
+                self._nodes.discard(node)
+
+    def _update_address(self, interface: "Interface", address_old: Address, address_new: Address) -> None:
+        """
+        Keeps the address table of the link in sync when an interface connected to it changes address.
+        """
+        if interface in self._owners:
+            self._unindex_address(address_old, interface)
+            self._index_address(address_new, interface)
+
+    def _index_address(self, address: Address, interface: "Interface") -> None:
+        self._address_table.setdefault(address, []).append(interface)
+
+    def _unindex_address(self, address: Address, interface: "Interface") -> None:
+        holders = self._address_table.get(address, [])
+        if interface in holders:
+            holders.remove(interface)
+            if len(holders) == 0:
+                del self._address_table[address]
+
+    def resolve(self, address: Address) -> _Node:
+        """
+        Returns the node which holds the given address on this link. If multiple interfaces claim this address, the node
+        owning the interface that first did is returned.
+        """
+        holders = self._address_table.get(address)
+        if not holders:
+            raise NoSuchAddress(address)
+        return self._owners[holders[0]]
 
     def _transfer_packet(self, packet: Packet, hop: Address) -> None:
-        # TODO -- Replace this inefficient loop with a sort of ARP
         if hop == self.cidr.broadcast_address:
-            recipients = self.iter_nodes()
+            # All recipients of a broadcast share the same latency sample, so they are delivered to by a single event.
+            if len(self._nodes) == 0:
+                return
+            delay = self._sample_duration(packet)
+            recipients = tuple(self._nodes)
+            if self._outbox is not None:
+                recipients = tuple(
+                    node for node in recipients
+                    if not self._outbox.post(delay, node, packet, self._broadcast_to_bound_only)
+                )
+            add_in(delay, self._deliver_broadcast, packet, recipients)
         else:
-            for node, interface in [(node, interface) for node in self.iter_nodes() for interface in node.interfaces()]:
-                if interface.address == hop:
-                    recipients = iter([node])
-                    break
-            else:
-                raise NoSuchAddress(hop)
+            self._transfer_packet_to(packet, self.resolve(hop))
 
+    def _transfer_packet_from(self, node: _Node, packet: Packet, hop: Address) -> None:
+        """
+        Transfers a packet sent by the given node; the hop is resolved against the nodes connected to the link.
+        """
+        self._transfer_packet(packet, hop)
+
+    def _transfer_packet_to(self, packet: Packet, node: _Node) -> None:
+        self._deliver_in(self._sample_duration(packet), node, packet)
+
+    def _deliver_in(self, delay: float, node: _Node, packet: Packet) -> None:
+        """
+        Delivers a packet to a node once the given delay has elapsed. Should the node be simulated in another partition
+        of the model, the packet is rather posted to the outbox of the link, to be sent over to that partition.
+        """
+        if self._outbox is None or not self._outbox.post(delay, node, packet):
+            add_in(delay, node._receive_packet, packet)
+
+    def _sample_duration(self, packet: Packet) -> float:
+        """
+        Computes the delay until the given packet, transmitted now, is delivered: the time it waits for the medium or
+        port to be free, plus its transmission time, plus the link latency.
+        """
         packet_latency = next(self._latency)
         packet_bandwidth = next(self._bandwidth)
-        duration = packet_latency + 8 * packet.byte_size / packet_bandwidth
-        for node in recipients:
-            add_in(duration, node._receive_packet, packet)
+        duration_transmission = 8 * packet.byte_size / packet_bandwidth
+        delay_queue = 0.0
+        if self._contention is not Contention.NONE:
+            key = packet.source.hostname if self._contention is Contention.PER_PORT else None
+            moment = now()
+            busy_until = self._busy_until.get(key, moment)
+            if busy_until > moment:
+                delay_queue = busy_until - moment
+            self._busy_until[key] = moment + delay_queue + duration_transmission
+        self._stats._record(packet.byte_size, duration_transmission, delay_queue)
+        delay = delay_queue + duration_transmission + packet_latency
+        recorder = tracing._recorder
+        if recorder is not None and recorder.sample():
+            recorder.record(
+                "packet",
+                f"{packet.source} > {packet.dest}",
+                now(),
+                delay,
+                self,
+                str(packet.source.hostname),
+                {
+                    "bytes": packet.byte_size,
+                    "queue": delay_queue,
+                    "transmission": duration_transmission,
+                    "latency": packet_latency
+                }
+            )
+        return delay
+
+    def _transfer_flow(self, flow: Flow) -> None:
+        """
+        Starts transmitting a flow to the node holding the flow's hop address. The flows transmitted concurrently over
+        the link share its bandwidth, sampled when the first of them starts, in a max-min fair manner; they do not
+        contend with the packets transmitted over the link.
+        """
+        if flow.hop == self.cidr.broadcast_address:
+            raise ValueError("Flows cannot be broadcast.")
+        flow._recipient = self.resolve(flow.hop)
+        self._flows.start(flow)
+
+    def _transfer_flow_from(self, node: _Node, flow: Flow) -> None:
+        """
+        Starts transmitting a flow sent by the given node (see :py:meth:`_transfer_flow`).
+        """
+        self._transfer_flow(flow)
+
+    def _deliver_flow(self, flow: Flow) -> None:
+        self._deliver_in(next(self._latency), cast(_Node, flow._recipient), flow.packet)
+
+    def _deliver_broadcast(self, packet: Packet, recipients: Tuple[_Node, ...]) -> None:
+        if self._broadcast_to_bound_only:
+            port = packet.dest.port
+            for node in recipients:
+                if node.is_port_bound(port):
+                    node._receive_packet(packet)
+        else:
+            for node in recipients:
+                node._receive_packet(packet)
 
 
 class Loopback(Link):
+    """
+    Link internal to a node, over which the packets it sends are delivered back to it. As it keeps track of no node, a
+    single instance, obtained from :py:meth:`shared`, serves all nodes; its statistics thus cover the loopback traffic
+    of the whole simulation. Flows still only share bandwidth with the other flows of the same node.
+    """
+
+    _shared: Optional["Loopback"] = None
 
     def __init__(self):
         super().__init__("127.0.0.0/8", constant(0), constant(100 * GbPS))
+        self._flows_node: MutableMapping[_Node, FlowSharing] = WeakKeyDictionary()
+
+    @classmethod
+    def shared(cls) -> "Loopback":
+        """
+        Returns the loopback link shared by all nodes.
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _connect(self, node: _Node, interface: "Interface") -> None:
+        pass
+
+    def _disconnect(self, interface: "Interface") -> None:
+        pass
+
+    def _update_address(self, interface: "Interface", address_old: Address, address_new: Address) -> None:
+        pass
+
+    def _transfer_packet_from(self, node: _Node, packet: Packet, hop: Address) -> None:
+        self._transfer_packet_to(packet, node)
+
+    def _transfer_flow_from(self, node: _Node, flow: Flow) -> None:
+        flow._recipient = node
+        flows = self._flows_node.get(node)
+        if flows is None:
+            flows = self._flows_node[node] = FlowSharing(lambda: next(self._bandwidth), self._deliver_flow)
+        flows.start(flow)
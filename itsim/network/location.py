@@ -1,8 +1,8 @@
 from functools import total_ordering
 from ipaddress import _BaseAddress
-from typing import Any, cast, Union, Tuple
+from typing import Any, cast, Optional, Union, Tuple
+from weakref import WeakValueDictionary
 
-from itsim import ITObject
 from itsim.types import Address, HostnameRepr, PortRepr, as_hostname, as_port, Hostname, Port
 
 
@@ -36,18 +36,38 @@ class InvalidAddress(AddressError):
 
 
 @total_ordering
-class Location(ITObject):
+class Location:
     """
     Location of a service on a network, designated by a host name and a port number.
 
+    Locations are immutable and interned: constructing a location equal to one that is still alive elsewhere returns
+    that same object. Their hash is computed once, on first use.
+
     :param host: Hostname representation.
     :param port: Port representation.
     """
 
-    def __init__(self, host: HostnameRepr = None, port: PortRepr = None) -> None:
-        super().__init__()
-        self._hostname = as_hostname(host)
-        self._port = as_port(port)
+    __slots__ = ("_hostname", "_port", "_hash", "__weakref__")
+    _interned: "WeakValueDictionary[Tuple[type, Hostname, Port], Location]" = WeakValueDictionary()
+
+    def __new__(cls, host: HostnameRepr = None, port: PortRepr = None) -> "Location":
+        hostname = as_hostname(host)
+        port_ = as_port(port)
+        key = (cls, hostname, port_)
+        location = cls._interned.get(key)
+        if location is None:
+            location = super().__new__(cls)
+            object.__setattr__(location, "_hostname", hostname)
+            object.__setattr__(location, "_port", port_)
+            object.__setattr__(location, "_hash", None)
+            cls._interned[key] = location
+        return location
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Location objects are immutable (cannot set {name}).")
+
+    def __reduce__(self) -> Tuple[type, Tuple[Hostname, Port]]:
+        return (type(self), (self._hostname, self._port))
 
     @staticmethod
     def from_repr(lr: LocationRepr) -> "Location":
@@ -81,6 +101,8 @@ class Location(ITObject):
         return cast(Address, self._hostname)
 
     def __eq__(self, other: Any) -> bool:
+        if other is self:
+            return True
         if not isinstance(other, Location):
             raise ValueError(f"Cannot compare for equality {str(self)} to {str(other)} (type {type(other)}).")
         return self.hostname == other.hostname and self.port == other.port
@@ -88,8 +110,15 @@ class Location(ITObject):
     def __str__(self) -> str:
         return f"{str(self.hostname)}:{str(self.port)}"
 
+    def __repr__(self) -> str:
+        return str(self)
+
     def __hash__(self) -> int:
-        return hash(str(self))
+        h: Optional[int] = self._hash
+        if h is None:
+            h = hash(str(self))
+            object.__setattr__(self, "_hash", h)
+        return h
 
     def __lt__(self, other) -> bool:
         if not isinstance(other, Location):
@@ -1,7 +1,9 @@
 from .__init__ import _Packet
 
 from typing import Optional
+from uuid import UUID
 
+from itsim import new_uuid
 from itsim.network.location import Location
 from itsim.types import Payload
 
@@ -14,18 +16,34 @@ class Packet(_Packet):
     :param dest: Destination location where the packet is being relayed.
     :byte_size: Size of the packet's payload, in bytes.
     :payload: Optional free-form dictionary used as a helper for implementing certain models. Not used by ITsim.
+
+    Packets are kept compact: their attributes are slotted, and their UUID is only generated once it is asked for.
     """
 
+    __slots__ = ("_source", "_dest", "_byte_size", "_payload", "_uuid")
+
     def __init__(self,
                  source: Location,
                  dest: Location,
                  byte_size: int,
                  payload: Optional[Payload] = None) -> None:
-        super().__init__()
         self._source = source
         self._dest = dest
         self._byte_size = byte_size
         self._payload = payload or {}
+        self._uuid: Optional[UUID] = None
+
+    @property
+    def uuid(self) -> UUID:
+        """
+        Unique identifier of this packet, generated on first access.
+        """
+        if self._uuid is None:
+            self._uuid = new_uuid()
+        return self._uuid
+
+    def uuid_str(self) -> str:
+        return str(self.uuid)
 
     @property
     def source(self) -> Location:
@@ -79,3 +97,6 @@ class Packet(_Packet):
 
     def __str__(self):
         return "<Src: %s, Dest: %s, Size: %s, Payload: %s>" % (self.source, self.dest, self.byte_size, self.payload)
+
+    def __repr__(self):
+        return str(self)
@@ -1,4 +1,5 @@
-from itsim.machine.node import Node
+from itsim.machine.node import Node, NoRouteToHost
+from itsim.network.packet import Packet
 
 
 class Router(Node):
@@ -13,3 +14,15 @@ class Router(Node):
 
     def __init__(self) -> None:
         super().__init__()
+
+    def handle_packet_transit(self, packet: Packet) -> None:
+        """
+        Forwards a packet not addressed to the router over the interface its destination is reachable through. Packets
+        toward destinations the router has no route to are dropped.
+        """
+        try:
+            interface, address_hop = self._solve_transfer(packet.dest.hostname_as_address())
+        except NoRouteToHost:
+            self.drop_packet(packet)
+        else:
+            interface.link._transfer_packet_from(self, packet, address_hop)
@@ -11,7 +11,7 @@ from itsim.network.packet import Packet
 from itsim.machine.process_management.daemon import Daemon
 from itsim.machine.socket import Socket
 from itsim.random import num_bytes
-from itsim.simulator import advance
+from itsim.simulator import set_timer, Timer
 from itsim.software.context import Context
 from itsim.types import Address, as_address, Cidr, Payload
 
@@ -23,6 +23,7 @@ class _AddressAllocation:
         self._address = address
         self._unique = uuid4()
         self._is_confirmed = False
+        self._timer: Optional[Timer] = None
 
     @property
     def address(self) -> Address:
@@ -40,6 +41,14 @@ class _AddressAllocation:
     def is_confirmed(self, is_confirmed: bool) -> None:
         self._is_confirmed = is_confirmed
 
+    @property
+    def timer(self) -> Optional[Timer]:
+        return self._timer
+
+    @timer.setter
+    def timer(self, timer: Optional[Timer]) -> None:
+        self._timer = timer
+
     def __repr__(self) -> str:
         return f"AA[{self.address}, {str(self.unique)[0:3]}, {self.is_confirmed}]"
 
@@ -154,7 +163,11 @@ class DHCPServer(Daemon):
                 # Decline to allocate as per https://tools.ietf.org/html/rfc2131#section-4.3.1
                 return
 
-        self._address_allocation[node_id] = _AddressAllocation(suggestion)
+        allocation_previous = self._address_allocation.get(node_id)
+        if allocation_previous is not None and allocation_previous.timer is not None:
+            allocation_previous.timer.cancel()
+        allocation = _AddressAllocation(suggestion)
+        self._address_allocation[node_id] = allocation
         self._reserved[suggestion] = True
         socket.send(
             (self._cidr.broadcast_address, self._dhcp_client_port),
@@ -169,10 +182,20 @@ class DHCPServer(Daemon):
 
         # Reserve for 30 seconds -- a REQUEST for the address must have been received by then.
         # Otherwise, drop the reservation.
-        unique = self._address_allocation[node_id].unique
-        advance(self._reservation_time)
-        if not self._address_allocation[node_id].is_confirmed and self._address_allocation[node_id].unique == unique:
-            del self._reserved[self._address_allocation[node_id].address]
+        allocation.timer = set_timer(self._reservation_time, self._expire_reservation, node_id, allocation.unique)
+
+    def _expire_reservation(self, node_id: UUID, unique: UUID) -> None:
+        """
+        Drops the reservation of an address, unless it has been confirmed or superseded since it was made.
+
+        :param node_id:
+            UUID of the :py:class:`~itsim.machine.Node` the address was reserved for
+        :param unique:
+            Unique identifier of the reservation
+        """
+        allocation = self._address_allocation.get(node_id)
+        if allocation is not None and not allocation.is_confirmed and allocation.unique == unique:
+            del self._reserved[allocation.address]
             del self._address_allocation[node_id]
 
     def _handle_request(self, socket: Socket, node_id: UUID, address: Address) -> None:
@@ -190,7 +213,10 @@ class DHCPServer(Daemon):
 
         if node_id in self._address_allocation and address == self._address_allocation[node_id].address:
             # This REQUEST is proper, confirming the allocation of the address.
-            self._address_allocation[node_id].is_confirmed = True
+            allocation = self._address_allocation[node_id]
+            allocation.is_confirmed = True
+            if allocation.timer is not None:
+                allocation.timer.cancel()
             socket.send(
                 (address, self._dhcp_client_port),
                 next(self._size_packet_dhcp),
@@ -0,0 +1,340 @@
+"""
+Conservative parallel simulation of a single model, partitioned into logical processes run in their own OS processes.
+
+Greenlets cannot be moved between processes, so every logical process builds the whole topology by itself, by calling
+the same scenario function, but only runs the nodes of its own partition. Links joining nodes of different partitions
+are *cut*: packets they deliver to a remote node are posted to an :py:class:`Outbox` rather than scheduled locally, and
+handed over to the partition of that node.
+
+The logical processes advance in lockstep, by windows of simulated time as long as the *lookahead*: the least
+:py:attr:`~itsim.network.link.Link.latency_min` of the cut links. A packet sent over a cut link within a window cannot
+reach its recipient before the window ends, so each logical process may run the events of a window without hearing
+from the others; the packets exchanged during the window are delivered in batches between windows. Windows start at
+the earliest pending event across all partitions, so idle stretches of the simulation are skipped.
+
+Partitioned runs reproduce sequential runs of the same scenario, event for event, provided that:
+
+- the addresses of the nodes are static, as every logical process resolves the addresses of remote nodes against its
+  own copy of the topology;
+- the latency and bandwidth of cut links are constant, as each logical process samples them separately, and neither
+  flows nor shared-medium contention cross cut links, as their bandwidth would only be shared within a partition;
+- the random numbers drawn for a node come from sources of its own, rather than from a source shared with nodes of
+  other partitions;
+- no two events meant to happen at the same moment depend on each other's order.
+
+Otherwise, partitioned runs remain statistically equivalent to sequential runs.
+"""
+
+from math import inf
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from operator import itemgetter
+import traceback
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from itsim.machine import _Node
+from itsim.network.link import Link, Loopback
+from itsim.network.packet import Packet
+from itsim.simulator import Simulator
+
+
+# Message handed over between partitions: moment of delivery, partition and index of the recipient node, packet, and
+# whether the packet is a broadcast only meant for nodes bound to its destination port.
+Message = Tuple[float, int, int, Packet, bool]
+
+# Packet received from another partition, as handed to a logical process: moment of delivery, index of the recipient
+# node, packet, and broadcast flag.
+Delivery = Tuple[float, int, Packet, bool]
+
+
+class Partition:
+    """
+    Model built by a scenario function for a logical process.
+
+    :param sim: Simulator running the partition.
+    :param nodes: All the nodes of the topology, in the same order for every partition.
+    :param assignment: Index of the partition of each node.
+    :param index: Index of this partition, or ``None`` when the whole model is simulated sequentially.
+    :param model: Anything else the scenario built, for the result extractors to use.
+    """
+
+    def __init__(
+        self,
+        sim: Simulator,
+        nodes: Sequence[_Node],
+        assignment: Sequence[int],
+        index: Optional[int] = None,
+        model: Any = None
+    ) -> None:
+        if len(nodes) != len(assignment):
+            raise ValueError("Each node must be assigned a partition.")
+        self.sim = sim
+        self.nodes = nodes
+        self.assignment = assignment
+        self.index = index
+        self.model = model
+        self._local = {node for node, i in zip(nodes, assignment) if index is None or i == index}
+
+    def is_local(self, node: _Node) -> bool:
+        """
+        Tells whether the given node is simulated in this partition. Scenarios only start processes on local nodes.
+        """
+        return node in self._local
+
+
+# Builds the partition of the given index; with ``None``, builds the whole model, to be simulated sequentially.
+Scenario = Callable[[Optional[int]], Partition]
+
+# Extracts a result from a partition, once it has run.
+Extractor = Callable[[Partition], Any]
+
+
+class Outbox:
+    """
+    Collects the packets delivered over cut links to nodes simulated in other partitions.
+
+    :param remote: Partition and index of each remote node.
+    :param sim: Simulator running the local partition.
+    """
+
+    def __init__(self, remote: Mapping[_Node, Tuple[int, int]], sim: Simulator) -> None:
+        self._remote = remote
+        self._sim = sim
+        self._messages: List[Message] = []
+
+    def post(self, delay: float, node: _Node, packet: Packet, bound_only: bool = False) -> bool:
+        """
+        Posts a packet to be delivered to a node after the given delay, if that node is remote. Returns whether it was.
+        """
+        destination = self._remote.get(node)
+        if destination is None:
+            return False
+        partition, index = destination
+        self._messages.append((self._sim.now() + delay, partition, index, packet, bound_only))
+        return True
+
+    def take(self) -> List[Message]:
+        """
+        Returns the packets posted since the last call, and empties the outbox.
+        """
+        messages = self._messages
+        self._messages = []
+        return messages
+
+
+def links_of(nodes: Iterable[_Node]) -> List[Link]:
+    """
+    Lists the links the given nodes are connected to, loopback aside, in the order the nodes connect to them.
+    """
+    links: Dict[Link, None] = {}
+    for node in nodes:
+        for interface in node.interfaces():  # type: ignore
+            if not isinstance(interface.link, Loopback):
+                links.setdefault(interface.link, None)
+    return list(links.keys())
+
+
+def links_cut(nodes: Sequence[_Node], assignment: Sequence[int]) -> List[Link]:
+    """
+    Lists the links joining nodes assigned to different partitions.
+    """
+    partition_of = dict(zip(nodes, assignment))
+    return [
+        link
+        for link in links_of(nodes)
+        if len({partition_of[node] for node in link.iter_nodes() if node in partition_of}) > 1
+    ]
+
+
+def lookahead(links: Iterable[Link]) -> float:
+    """
+    Computes the lookahead partitions joined by the given links synchronize with: infinite if there are no links.
+    """
+    la = min((link.latency_min for link in links), default=inf)
+    if la <= 0.0:
+        raise ValueError("Links joining partitions must have a positive minimum latency.")
+    return la
+
+
+def partition_by_links(nodes: Sequence[_Node], cut: Iterable[Link], num_partitions: int) -> List[int]:
+    """
+    Assigns nodes to partitions, so that only the given links join nodes of different partitions. The groups of nodes
+    connected without going through these links are assigned whole, from the largest, to the partition with the fewest
+    nodes so far.
+
+    :return: Index of the partition of each node.
+    """
+    if num_partitions < 1:
+        raise ValueError(f"Number of partitions must be positive (got {num_partitions}).")
+    index_of = {node: i for i, node in enumerate(nodes)}
+    parent = list(range(len(nodes)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    cut = set(cut)
+    for link in links_of(nodes):
+        if link in cut:
+            continue
+        members = sorted(index_of[node] for node in link.iter_nodes() if node in index_of)
+        for i in members[1:]:
+            parent[find(i)] = find(members[0])
+
+    components: Dict[int, List[int]] = {}
+    for i in range(len(nodes)):
+        components.setdefault(find(i), []).append(i)
+    loads = [0] * num_partitions
+    assignment = [0] * len(nodes)
+    for component in sorted(components.values(), key=len, reverse=True):
+        target = loads.index(min(loads))
+        for i in component:
+            assignment[i] = target
+        loads[target] += len(component)
+    return assignment
+
+
+class LogicalProcess:
+    """
+    Runs a partition of a model, exchanging packets with the other partitions over its cut links.
+    """
+
+    def __init__(self, partition: Partition) -> None:
+        if partition.index is None:
+            raise ValueError("A logical process runs a partition of the model, not the whole of it.")
+        self._partition = partition
+        remote = {
+            node: (index_partition, i)
+            for i, (node, index_partition) in enumerate(zip(partition.nodes, partition.assignment))
+            if index_partition != partition.index
+        }
+        self._outbox = Outbox(remote, partition.sim)
+        cut = links_cut(partition.nodes, partition.assignment)
+        for link in cut:
+            link._outbox = self._outbox
+        self._lookahead = lookahead(cut)
+
+    @property
+    def lookahead(self) -> float:
+        return self._lookahead
+
+    @property
+    def sim(self) -> Simulator:
+        return self._partition.sim
+
+    def receive(self, deliveries: Iterable[Delivery]) -> None:
+        """
+        Schedules the delivery of packets sent from other partitions.
+        """
+        for moment, index, packet, bound_only in deliveries:
+            self.sim._add_at(moment, self._deliver, self._partition.nodes[index], packet, bound_only)
+
+    def _deliver(self, node: _Node, packet: Packet, bound_only: bool) -> None:
+        if not bound_only or node.is_port_bound(packet.dest.port):
+            node._receive_packet(packet)
+
+    def run_window(self, end: float) -> List[Message]:
+        """
+        Runs the partition up to the given moment, and returns the packets sent to other partitions meanwhile.
+        """
+        self.sim._run_before(end)
+        return self._outbox.take()
+
+
+def run_sequential(scenario: Scenario, duration: float, extractors: Mapping[str, Extractor]) -> Dict[str, Any]:
+    """
+    Runs the whole model of a scenario in the current process, as a reference for partitioned runs.
+    """
+    partition = scenario(None)
+    partition.sim.run(duration)
+    return {name: extract(partition) for name, extract in extractors.items()}
+
+
+def _serve(scenario: Scenario, index: int, extractors: Mapping[str, Extractor], conn: Connection) -> None:
+    try:
+        partition = scenario(index)
+        lp = LogicalProcess(partition)
+        conn.send(("ready", lp.lookahead, lp.sim._time_next()))
+        while True:
+            command, end, deliveries = conn.recv()
+            lp.receive(deliveries)
+            if command == "window":
+                messages = lp.run_window(end)
+                conn.send(("done", messages, lp.sim._time_next()))
+            else:
+                lp.sim._run_before(end)
+                conn.send(("results", {name: extract(partition) for name, extract in extractors.items()}, None))
+                return
+    except BaseException:
+        conn.send(("error", traceback.format_exc(), None))
+    finally:
+        conn.close()
+
+
+def _receive(conn: Connection, index: int) -> Tuple[Any, Any]:
+    reply, content, extra = conn.recv()
+    if reply == "error":
+        raise RuntimeError(f"Partition {index} failed:\n{content}")
+    return content, extra
+
+
+def run_partitioned(
+    scenario: Scenario,
+    num_partitions: int,
+    duration: float,
+    extractors: Mapping[str, Extractor]
+) -> List[Dict[str, Any]]:
+    """
+    Runs the model of a scenario split into the given number of partitions, each in its own process, for the given
+    simulated duration. The scenario function is called in each process with the index of the partition to build, and
+    must build the same topology every time. It is sent to the processes along with the extractors, so they must be
+    picklable.
+
+    :return: Results of the extractors for each partition, in the order of the partitions.
+    """
+    if num_partitions < 1:
+        raise ValueError(f"Number of partitions must be positive (got {num_partitions}).")
+    conns: List[Connection] = []
+    procs: List[Process] = []
+    try:
+        for index in range(num_partitions):
+            conn, conn_child = Pipe()
+            proc = Process(target=_serve, args=(scenario, index, extractors, conn_child), daemon=True)
+            proc.start()
+            conn_child.close()
+            conns.append(conn)
+            procs.append(proc)
+
+        ready = [_receive(conn, index) for index, conn in enumerate(conns)]
+        lookaheads = {la for la, _ in ready}
+        if len(lookaheads) > 1:
+            raise RuntimeError(f"Partitions disagree on the lookahead ({sorted(lookaheads)}); build them alike.")
+        la = lookaheads.pop()
+        times_next = [time_next for _, time_next in ready]
+        inboxes: List[List[Delivery]] = [[] for _ in range(num_partitions)]
+
+        while True:
+            start = min(times_next + [moment for inbox in inboxes for moment, *_ in inbox])
+            if start >= duration:
+                break
+            end = min(start + la, duration)
+            for conn, inbox in zip(conns, inboxes):
+                conn.send(("window", end, sorted(inbox, key=itemgetter(0))))
+            inboxes = [[] for _ in range(num_partitions)]
+            for index, conn in enumerate(conns):
+                messages, times_next[index] = _receive(conn, index)
+                for moment, index_partition, index_node, packet, bound_only in messages:
+                    inboxes[index_partition].append((moment, index_node, packet, bound_only))
+
+        for conn, inbox in zip(conns, inboxes):
+            conn.send(("finish", duration, sorted(inbox, key=itemgetter(0))))
+        return [_receive(conn, index)[0] for index, conn in enumerate(conns)]
+    finally:
+        for conn in conns:
+            conn.close()
+        for proc in procs:
+            proc.join(timeout=1.0)
+            if proc.is_alive():
+                proc.terminate()
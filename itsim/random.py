@@ -1,7 +1,12 @@
 from numbers import Real
-from typing import TypeVar, Optional
+from typing import Any, Callable, Iterator, List, TypeVar, Optional
 
-from greensim.random import VarRandom, RandomOpt, linear, bounded, project_int
+from greensim.random import VarRandom, RandomOpt, linear, bounded, project_int, _get_default_random
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 
 T = TypeVar("T")
@@ -10,6 +15,172 @@ VarRandomTime = VarRandom[float]
 VarRandomSize = VarRandom[int]
 VarRandomBandwidth = VarRandom[float]
 
+SIZE_BLOCK_DEFAULT = 4096
+
+
+class BlockSampler(Iterator[Any]):
+    """
+    Random generator that draws its samples in blocks, as NumPy arrays, and serves them one at a time. Bounds are
+    applied to each block in bulk. Consumers that can use many samples at once may get them through :py:meth:`take`.
+
+    The samples drawn depend only on the seed of the underlying NumPy generator, not on the size of the blocks, so
+    results are reproducible per seed. Samplers are rarely built directly: see :py:func:`block_constant`,
+    :py:func:`block_uniform`, :py:func:`block_normal`, :py:func:`block_expo` and :py:func:`block_lognormal`.
+
+    :param draw: Function that draws a given number of samples from a NumPy generator, as an array.
+    :param rng: NumPy generator the samples are drawn from.
+    :param size_block: Number of samples drawn at once.
+    :param lower: Samples below this bound are clipped back to it.
+    :param upper: Samples above this bound are clipped back to it.
+    :param transform: Vectorized function applied to each block, after clipping.
+    """
+
+    def __init__(
+        self,
+        draw: Callable[[Any, int], Any],
+        rng: Any,
+        size_block: int = SIZE_BLOCK_DEFAULT,
+        lower: Optional[Real] = None,
+        upper: Optional[Real] = None,
+        transform: Optional[Callable[[Any], Any]] = None
+    ) -> None:
+        if size_block <= 0:
+            raise ValueError(f"Block size must be positive (got {size_block}).")
+        self._draw = draw
+        self._rng = rng
+        self._size_block = size_block
+        self._lower = lower
+        self._upper = upper
+        self._transform = transform
+        self._buffer: List[Any] = []
+        self._samples = self._iter_samples()
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._samples
+
+    def __next__(self) -> Any:
+        return next(self._samples)
+
+    def _iter_samples(self) -> Iterator[Any]:
+        while True:
+            # Samples are popped from the end of the buffer, so it is reversed to serve them in the order drawn.
+            self._buffer = self._draw_block(self._size_block).tolist()
+            self._buffer.reverse()
+            while self._buffer:
+                yield self._buffer.pop()
+
+    def _draw_block(self, size: int) -> Any:
+        block = self._draw(self._rng, size)
+        if self._lower is not None or self._upper is not None:
+            block = np.clip(block, self._lower, self._upper)
+        if self._transform is not None:
+            block = self._transform(block)
+        return block
+
+    def take(self, size: int) -> Any:
+        """
+        Returns the next ``size`` samples as a NumPy array.
+        """
+        buffered = [self._buffer.pop() for _ in range(min(size, len(self._buffer)))]
+        block = self._draw_block(size - len(buffered))
+        return np.concatenate([np.array(buffered, dtype=block.dtype), block])
+
+    def bounded(self, lower: Optional[Real] = None, upper: Optional[Real] = None) -> "BlockSampler":
+        """
+        Returns a sampler drawing from the same NumPy generator as this one, but with its samples further clipped to
+        the given bounds.
+        """
+        return BlockSampler(
+            self._draw,
+            self._rng,
+            self._size_block,
+            _tightest(max, self._lower, lower),
+            _tightest(min, self._upper, upper),
+            self._transform
+        )
+
+
+def _tightest(pick: Callable[[Real, Real], Real], bound: Optional[Real], bound_new: Optional[Real]) -> Optional[Real]:
+    if bound is None:
+        return bound_new
+    if bound_new is None:
+        return bound
+    return pick(bound, bound_new)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("Block samplers require NumPy; install itsim with the numpy extra.")
+
+
+def _numpy_rng(rng: RandomOpt) -> Any:
+    _require_numpy()
+    return np.random.default_rng((rng or _get_default_random()).getrandbits(64))
+
+
+def block_constant(value: Real, size_block: int = SIZE_BLOCK_DEFAULT) -> BlockSampler:
+    """
+    Block sampler always yielding the same value.
+    """
+    _require_numpy()
+    return BlockSampler(lambda g, n: np.full(n, value), None, size_block)
+
+
+def block_uniform(
+    lower: Real,
+    upper: Real,
+    rng: RandomOpt = None,
+    size_block: int = SIZE_BLOCK_DEFAULT
+) -> BlockSampler:
+    """
+    Block sampler of the uniform distribution over [``lower``, ``upper``).
+
+    :param rng: Python pseudo-random source, from which the seed of the NumPy generator is drawn. By default, this is
+        greensim's default random source.
+    """
+    return BlockSampler(lambda g, n: g.uniform(lower, upper, n), _numpy_rng(rng), size_block)
+
+
+def block_normal(
+    mean: Real,
+    std_dev: Real,
+    rng: RandomOpt = None,
+    size_block: int = SIZE_BLOCK_DEFAULT
+) -> BlockSampler:
+    """
+    Block sampler of the normal distribution (``rng`` as for :py:func:`block_uniform`).
+    """
+    return BlockSampler(lambda g, n: g.normal(mean, std_dev, n), _numpy_rng(rng), size_block)
+
+
+def block_expo(mean: Real, rng: RandomOpt = None, size_block: int = SIZE_BLOCK_DEFAULT) -> BlockSampler:
+    """
+    Block sampler of the exponential distribution of the given mean (``rng`` as for :py:func:`block_uniform`).
+    """
+    return BlockSampler(lambda g, n: g.exponential(mean, n), _numpy_rng(rng), size_block)
+
+
+def block_lognormal(
+    mean: Real,
+    sigma: Real,
+    rng: RandomOpt = None,
+    size_block: int = SIZE_BLOCK_DEFAULT
+) -> BlockSampler:
+    """
+    Block sampler of the log-normal distribution, whose underlying normal distribution has the given mean and standard
+    deviation (``rng`` as for :py:func:`block_uniform`).
+    """
+    return BlockSampler(lambda g, n: g.lognormal(mean, sigma, n), _numpy_rng(rng), size_block)
+
+
+def bounded_var(gen: VarRandom[Real], lower: Optional[Real] = None, upper: Optional[Real] = None) -> VarRandom[Real]:
+    """
+    Bounds the numbers of a random generator, like ``greensim.random.bounded``. Block samplers are bounded in bulk.
+    """
+    if isinstance(gen, BlockSampler):
+        return gen.bounded(lower, upper)
+    return bounded(gen, lower, upper)
+
 
 def num_bytes(
     gen: VarRandom[Real],
@@ -20,10 +191,28 @@ def num_bytes(
     """
     Random generator for buffers described only as a number of bytes to store or transfer.
 
-    :param gen: Main model for the number of bytes in the buffer, as a number generator this one wraps around.
+    :param gen: Main model for the number of bytes in the buffer, as a number generator this one wraps around. If this
+        is a :py:class:`BlockSampler`, the numbers of bytes are computed in blocks as well.
     :param header: Fixed number of bytes systematically added to the randomly generated number, acting as a fixed header
         to the buffer.
     :param upper: Maximum number of bytes to the buffer -- any number generated above this limited is clipped back.
     :param rng: Pseudo-random source (rarely set here).
     """
+    if isinstance(gen, BlockSampler):
+        return _num_bytes_block(gen, header, upper)
+    return _num_bytes(gen, header, upper)
+
+
+def _num_bytes(gen: VarRandom[Real], header: int, upper: Optional[Real]) -> VarRandom[int]:
     yield from project_int(bounded(linear(gen, 1.0, header), 0.0, upper))
+
+
+def _num_bytes_block(gen: BlockSampler, header: int, upper: Optional[Real]) -> BlockSampler:
+    return BlockSampler(
+        lambda _, n: gen._draw_block(n) + header,
+        gen._rng,
+        gen._size_block,
+        0.0,
+        upper,
+        lambda block: block.astype(np.int64)
+    )
@@ -0,0 +1,156 @@
+"""
+Runs many replications of a simulation scenario, each in its own process, so as to use all the cores of a machine
+without writing any multiprocessing code.
+"""
+
+from concurrent.futures import Future, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from math import inf
+import random
+from random import Random
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+from uuid import uuid5
+import zlib
+
+from greensim.random import set_default_random
+
+from itsim import CounterIdentity, identity_scheme, NAMESPACE_ITSIM
+
+
+# Builds the model of a replication from its parameters. The model must have a ``run(duration)`` method: it is
+# typically a Simulator, or an object holding one along with the parts of the model results are extracted from.
+Scenario = Callable[[Any], Any]
+
+# Extracts a result from the model of a replication, once it has run.
+Extractor = Callable[[Any], Any]
+
+
+class RunResult(NamedTuple):
+    """
+    Outcome of a replication.
+
+    :ivar index: Position of the replication's parameters in the sequence given to :py:func:`replicate`.
+    :ivar params: Parameters of the replication.
+    :ivar seed: Seed of the pseudo-random sources the replication drew from.
+    :ivar results: Results of the extractors, keyed by the names they were given; empty if the replication failed.
+    :ivar error: Exception raised by the last attempt at the replication, or ``None`` if it succeeded.
+    :ivar attempts: Number of times the replication was run.
+    """
+    index: int
+    params: Any
+    seed: int
+    results: Dict[str, Any]
+    error: Optional[BaseException]
+    attempts: int
+
+    def is_success(self) -> bool:
+        return self.error is None
+
+
+def seed_of_params(params: Any) -> int:
+    """
+    Default seed of a replication: integer parameters are seeds themselves, mappings of parameters provide their
+    ``"seed"`` entry; other parameters are seeded with a checksum of their representation.
+    """
+    if isinstance(params, int):
+        return params
+    if isinstance(params, Mapping) and "seed" in params:
+        return int(params["seed"])
+    return zlib.crc32(repr(params).encode("utf-8"))
+
+
+def run_replication(
+    scenario: Scenario,
+    params: Any,
+    seed: int,
+    extractors: Mapping[str, Extractor],
+    duration: float = inf
+) -> Dict[str, Any]:
+    """
+    Runs a single replication in the current process, returning the results of the extractors.
+
+    The replication is made reproducible by seeding both greensim's default random source and that of module
+    :py:mod:`random` with the given seed, and by numbering the IT objects it builds anew, in a namespace derived from
+    the seed. A replication thus yields the same results, and its objects the same UUIDs, whatever process runs it.
+    """
+    set_default_random(Random(seed))
+    random.seed(seed)
+    with identity_scheme(CounterIdentity(uuid5(NAMESPACE_ITSIM, str(seed)))):
+        model = scenario(params)
+        model.run(duration)
+        return {name: extract(model) for name, extract in extractors.items()}
+
+
+def replicate(
+    scenario: Scenario,
+    runs: Iterable[Any],
+    extractors: Mapping[str, Extractor],
+    duration: float = inf,
+    retries: int = 0,
+    max_workers: Optional[int] = None,
+    seed_of: Callable[[Any], int] = seed_of_params
+) -> Iterator[RunResult]:
+    """
+    Runs a replication of a scenario for each of the given sets of parameters, in a pool of processes. The results of
+    the replications are yielded as they complete, and so not necessarily in the order of their parameters: each
+    :py:class:`RunResult` records the index of the parameters it stems from, and the seed the replication used.
+
+    The scenario and the extractors are sent to the worker processes by pickling them, so they must be defined at the
+    top level of a module. A replication that raises an exception, or whose worker process dies, is run again with the
+    same seed, up to ``retries`` times; if it still fails, its result carries the last exception raised.
+
+    :param scenario: Builds the model of a replication from its parameters; see :py:func:`run_replication`.
+    :param runs: Parameters of each replication; integers are taken as seeds.
+    :param extractors: Functions computing the results of a replication from its model, once it has run, keyed by name.
+    :param duration: Simulated time each replication is run for.
+    :param retries: Number of times a failed replication is run again.
+    :param max_workers: Number of worker processes; by default, the number of cores of the machine.
+    :param seed_of: Computes the seed of a replication from its parameters.
+    """
+    if retries < 0:
+        raise ValueError(f"Number of retries must be nonnegative (got {retries}).")
+    params_all = list(runs)
+    seeds = [seed_of(params) for params in params_all]
+    attempts = [0] * len(params_all)
+    executor = ProcessPoolExecutor(max_workers)
+    pending: Dict[Future, Tuple[int, ProcessPoolExecutor]] = {}
+
+    def submit(index: int) -> None:
+        attempts[index] += 1
+        future = executor.submit(run_replication, scenario, params_all[index], seeds[index], extractors, duration)
+        pending[future] = (index, executor)
+
+    def outcome(index: int, results: Dict[str, Any], error: Optional[BaseException]) -> RunResult:
+        return RunResult(index, params_all[index], seeds[index], results, error, attempts[index])
+
+    try:
+        for index in range(len(params_all)):
+            submit(index)
+        while pending:
+            done, _ = wait(list(pending.keys()), return_when=FIRST_COMPLETED)
+            for future in done:
+                index, executor_run = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    yield outcome(index, future.result(), None)
+                elif attempts[index] <= retries:
+                    if isinstance(error, BrokenProcessPool) and executor_run is executor:
+                        # A worker died, taking the whole pool down with it: the runs still pending on it fail in
+                        # turn, and are resubmitted to a new pool.
+                        executor.shutdown(wait=False)
+                        executor = ProcessPoolExecutor(max_workers)
+                    submit(index)
+                else:
+                    yield outcome(index, {}, error)
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def replicate_all(*args: Any, **kwargs: Any) -> List[RunResult]:
+    """
+    Runs the replications as :py:func:`replicate` does, and returns all their results, sorted in the order of their
+    parameters.
+    """
+    return sorted(replicate(*args, **kwargs), key=lambda result: result.index)
@@ -1,12 +1,37 @@
-from typing import Optional, Any
+from heapq import heapify, heappop, heappush
+from math import inf
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
 from uuid import UUID
 
+import greenlet
 import greensim
-from itsim import ITObject, Tag
+from greensim import _Event
+from itsim import branching, ITObject, Tag
+from itsim.event_queue import EventQueue
+from itsim.instrumentation import Instruments
 from itsim.types import Timeout
 
 
 class Simulator(greensim.Simulator):
+    """
+    Simulator of IT systems.
+
+    :param ts_now: Initial moment of the simulated clock.
+    :param name: Name of the simulator.
+    :param queue: Queue the events scheduled are held in (see :py:mod:`itsim.event_queue`); by default, greensim's own
+        binary heap.
+    """
+
+    _instruments: Optional[Instruments] = None
+    _timers: Optional["TimerWheel"] = None
+
+    def __init__(self, ts_now: float = 0.0, name: Optional[str] = None, queue: Optional[EventQueue] = None) -> None:
+        super().__init__(ts_now, name)
+        self._queue = queue
+        if queue is not None:
+            # The methods greensim implements by iterating over, measuring or clearing its heap carry on working on the
+            # queue; those pushing and popping events go through it below.
+            self._events = queue  # type: ignore
 
     # Todo: validate this in unit tests.
     @property
@@ -16,6 +41,165 @@ class Simulator(greensim.Simulator):
     def uuid_str(self) -> str:
         return str(self.uuid)
 
+    @property
+    def instruments(self) -> Optional[Instruments]:
+        """
+        Instruments measuring the runs of the simulation, or ``None`` (the default) if they are not measured.
+        """
+        return self._instruments
+
+    @instruments.setter
+    def instruments(self, instruments: Optional[Instruments]) -> None:
+        self._instruments = instruments
+
+    def instrument(self, **kwargs: Any) -> Instruments:
+        """
+        Measures the runs of the simulation with new :py:class:`~itsim.instrumentation.Instruments`, built with the
+        given keyword parameters, and returns them.
+        """
+        self._instruments = Instruments(**kwargs)
+        return self._instruments
+
+    @property
+    def timers(self) -> "TimerWheel":
+        """
+        Wheel of the timers set on this simulator; see :py:func:`set_timer`.
+        """
+        if self._timers is None:
+            self._timers = TimerWheel(self)
+        return self._timers
+
+    def branch(
+        self,
+        scenario: branching.Scenario,
+        runs: Iterable[Any],
+        extractors: Mapping[str, branching.Extractor],
+        duration: float = inf,
+        max_workers: Optional[int] = None
+    ) -> List[branching.BranchResult]:
+        """
+        Checkpoints the simulation as it stands, and runs a branch of it from there for each of the given sets of
+        parameters, each in a child process forked from this one. The scenario of each branch is injected by calling
+        ``scenario(sim, params)``; the branch is then run for the given duration, and its results extracted from the
+        model the scenario returned. This simulation is left untouched. See :py:func:`itsim.branching.branch`.
+
+        :return: Outcome of each branch, in the order of their parameters.
+        """
+        return branching.branch(self, scenario, runs, extractors, duration, max_workers)
+
+    @property
+    def queue(self) -> Optional[EventQueue]:
+        """
+        Queue the events scheduled are held in, or ``None`` if they are held in greensim's heap.
+        """
+        return self._queue
+
+    def run(self, duration: float = inf) -> None:
+        if self._instruments is not None:
+            self._instruments._run(self, duration)
+        elif self._queue is None:
+            super().run(duration)
+        else:
+            self._run_queue(duration)
+
+    def _run_queue(self, duration: float) -> None:
+        # Runs the simulation as greensim.Simulator.run() does, popping the events from the queue.
+        id_stop = None
+        if duration != inf:
+            id_stop = self._counter
+            self._schedule(duration, self.stop)
+
+        queue = self._queue
+        self._is_running = True
+        while self.is_running and len(queue) > 0:  # type: ignore
+            event = queue.pop()  # type: ignore
+            self._ts_now = event.timestamp or self._ts_now
+            event.execute(self)
+        self.stop()
+
+        if id_stop is not None:
+            self._cancel(id_stop)
+
+    def step(self) -> None:
+        event = self._pop_event()
+        self._ts_now = event.timestamp or self._ts_now
+        event.execute(self)
+
+    def _schedule(self, delay: float, event: Callable, *args: Any, **kwargs: Any) -> int:
+        if self._queue is None:
+            return super()._schedule(delay, event, *args, **kwargs)
+        delay = float(delay)
+        if delay < 0.0:
+            raise ValueError("Delay must be positive.")
+        return self._push_event(self._ts_now + delay, event, *args, **kwargs)
+
+    def _push_event(self, moment: float, event: Callable, *args: Any, **kwargs: Any) -> int:
+        id_event = self._counter
+        event_ = _Event(moment, id_event, event, *args, **kwargs)
+        if self._queue is None:
+            heappush(self._events, event_)
+        else:
+            self._queue.push(event_)
+        self._counter += 1
+        return id_event
+
+    def _pop_event(self) -> _Event:
+        if self._queue is None:
+            return heappop(self._events)
+        return self._queue.pop()
+
+    def _time_next(self) -> float:
+        """
+        Returns the moment of the next event scheduled, or infinity if there is none.
+        """
+        if len(self._events) == 0:
+            return inf
+        if self._queue is None:
+            return self._events[0]._timestamp
+        return self._queue.peek()._timestamp
+
+    def _schedule_at(self, moment: float, event: Callable, *args: Any, **kwargs: Any) -> int:
+        """
+        Schedules an event at the given moment, exactly as given, rather than at a delay from now.
+        """
+        if moment < self._ts_now:
+            raise ValueError(f"Cannot schedule an event in the past ({moment} < {self._ts_now}).")
+        return self._push_event(moment, event, *args, **kwargs)
+
+    def _add_at(self, moment: float, fn_process: Callable, *args: Any, **kwargs: Any) -> greensim.Process:
+        """
+        Adds a process to the simulation, made to start at the given moment exactly as given.
+        """
+        process = greensim.Process(self, fn_process, self._gr)
+        self._schedule_at(moment, process.switch, *args, **kwargs)
+        return process
+
+    def _run_before(self, moment: float) -> None:
+        """
+        Runs the events scheduled strictly before the given moment, then sets the clock to that moment. Unlike
+        :py:meth:`run`, this leaves the events scheduled at that very moment pending.
+        """
+        self._is_running = True
+        while self.is_running and self._time_next() < moment:
+            event = self._pop_event()
+            self._ts_now = event.timestamp or self._ts_now
+            event.execute(self)
+        self._is_running = False
+        self._ts_now = max(self._ts_now, moment)
+
+    def _clear(self) -> None:
+        # Processes left hanging are torn down by throwing into them, after which they switch to their parent, the
+        # greenlet that ran the simulation. This simulator may however be destroyed by the garbage collector while a
+        # process of another simulation is running; that process would then never be switched back to. The torn-down
+        # processes are thus made to return to the current greenlet instead.
+        current = greenlet.getcurrent()
+        for _, event, _, _ in self.events():
+            proc = getattr(event, "__self__", None)
+            if isinstance(proc, greensim.Process) and not proc.dead and proc is not current:
+                proc.parent = current
+        super()._clear()
+        self._timers = None
+
 
 class SimulatedComputation(ITObject):
 
@@ -35,17 +219,292 @@ class SimulatedComputation(ITObject):
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, SimulatedComputation):
-            return self.uuid == other.uuid
+            return self._id == other._id and self._identity is other._identity
         return False
 
     def __hash__(self) -> int:
-        return hash(self.uuid)
+        return hash(self._id)
+
+
+class CallbackComputation(SimulatedComputation):
+    """
+    Computation run directly from the simulator's event queue, rather than as a greensim process. Such a computation
+    costs no greenlet, but may not block: it runs to completion in the event that starts it. See
+    :py:func:`run_callback`.
+    """
+
+    def __init__(self, *tags: Tag) -> None:
+        super().__init__(*tags)
+        self.id_event: Optional[int] = None
+        self.has_started = False
+
+
+class BlockingInCallback(RuntimeError):
+    """
+    Raised when a callback computation attempts a call that would block, such as :py:func:`advance` or waiting on an
+    :py:class:`Event`.
+    """
+
+    def __init__(self, what: str) -> None:
+        super().__init__(f"Callback computations cannot {what}; run blocking functions as greensim processes instead.")
 
 
 class Interrupt(greensim.Interrupt):
     pass
 
 
+# Simulator running the callback computation under way, if any. Callbacks run in the simulator's own greenlet, so the
+# functions below cannot rely on the current greensim process to find the simulator in this case.
+_sim_callback: Optional[greensim.Simulator] = None
+
+
+def run_callback(sim: greensim.Simulator, f: Callable[..., None], *args: Any, **kwargs: Any) -> None:
+    """
+    Runs the given function as a callback computation of the given simulator: this function may query and schedule
+    events on the simulator, but calls that would block it raise :py:class:`BlockingInCallback`.
+    """
+    global _sim_callback
+    sim_previous = _sim_callback
+    _sim_callback = sim
+    try:
+        f(*args, **kwargs)
+    finally:
+        _sim_callback = sim_previous
+
+
+def _rsim() -> greensim.Simulator:
+    if _sim_callback is not None:
+        return _sim_callback
+    return greensim.Process.current().rsim()
+
+
+def _assert_may_block(what: str) -> None:
+    if _sim_callback is not None:
+        raise BlockingInCallback(what)
+
+
+# Width of the slots of the first level of timer wheels, in simulated time, and number of bits of the number of slots
+# of each level.
+RESOLUTION_TIMERS = 0.1
+BITS_SLOTS_TIMERS = 6
+
+
+class Timer:
+    """
+    Callback set to run at a given moment of the simulation, unless cancelled beforehand. Timers are obtained from
+    :py:func:`set_timer`.
+    """
+
+    __slots__ = ("_moment", "_seq", "_fn", "_args", "_kwargs", "_slot", "_is_cancelled", "_has_fired")
+
+    def __init__(self, moment: float, seq: int, fn: Callable, args: Sequence[Any], kwargs: Mapping[str, Any]) -> None:
+        self._moment = moment
+        self._seq = seq
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._slot: Optional[Dict["Timer", None]] = None
+        self._is_cancelled = False
+        self._has_fired = False
+
+    @property
+    def moment(self) -> float:
+        return self._moment
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._is_cancelled
+
+    @property
+    def has_fired(self) -> bool:
+        return self._has_fired
+
+    def cancel(self) -> None:
+        """
+        Cancels the timer, unless it has fired already.
+        """
+        if not self._has_fired:
+            self._is_cancelled = True
+            if self._slot is not None:
+                del self._slot[self]
+                self._slot = None
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel (Varghese and Lauck, 1987), holding the timers set on a simulator until they are about to
+    fire. Simulated time is cut into ticks of the wheel's resolution. The first level of the wheel has a slot for each
+    of the next ``2 ** bits`` ticks; each level beyond has as many slots, each as wide as the whole level below. Timers
+    are held in the slot of the lowest level that spans their moment, and cascade down the levels as the wheel turns.
+    When the tick of a timer comes, it is scheduled on the simulator, as an event at its exact moment.
+
+    Until then, a timer costs neither a greenlet nor a slot of the simulator's event queue, and cancelling it is a mere
+    removal from its slot: timers that are usually cancelled, such as timeouts, are thus cheap. The wheel itself keeps a
+    single event scheduled on the simulator at a time, at the start of the next slot holding timers.
+
+    :param sim: Simulator the timers are set on.
+    :param resolution: Width of the ticks of the wheel, in simulated time.
+    :param bits: Number of bits of the number of slots of each level.
+    """
+
+    def __init__(self, sim: Simulator, resolution: float = RESOLUTION_TIMERS, bits: int = BITS_SLOTS_TIMERS) -> None:
+        if resolution <= 0.0:
+            raise ValueError(f"Resolution of the timer wheel must be positive (got {resolution}).")
+        self._sim = sim
+        self._resolution = resolution
+        self._bits = bits
+        self._mask = (1 << bits) - 1
+        self._levels: List[List[Dict[Timer, None]]] = []
+        self._occupied: List[int] = []
+        self._tick = int(sim.now() / resolution)
+        self._tick_driver: Optional[int] = None
+        self._seq = 0
+
+    @property
+    def resolution(self) -> float:
+        return self._resolution
+
+    def __len__(self) -> int:
+        """
+        Number of timers held in the wheel, not yet scheduled on the simulator.
+        """
+        return sum(len(slot) for level in self._levels for slot in level)
+
+    def set(self, delay: float, fn: Callable, *args: Any, **kwargs: Any) -> Timer:
+        """
+        Sets a timer that calls the given function with the given parameters after the given delay, as a callback
+        computation (see :py:func:`run_callback`).
+        """
+        if delay < 0.0:
+            raise ValueError(f"Delay of timers must be nonnegative (got {delay}).")
+        timer = Timer(self._sim.now() + delay, self._seq, fn, args, kwargs)
+        self._seq += 1
+        if timer._moment < inf:
+            start = self._place(timer)
+            if start is None:
+                self._release(timer)
+            elif self._tick_driver is None or start < self._tick_driver:
+                self._drive(start)
+        return timer
+
+    def _place(self, timer: Timer) -> Optional[int]:
+        # Puts the timer in the slot spanning its moment, at the lowest level possible, and returns the tick at which
+        # this slot starts. Timers due at the current tick are left out, and None is returned.
+        tick = int(timer._moment / self._resolution)
+        if tick <= self._tick:
+            return None
+        bits = self._bits
+        level = ((tick ^ self._tick).bit_length() - 1) // bits
+        while len(self._levels) <= level:
+            self._levels.append([{} for _ in range(1 << bits)])
+            self._occupied.append(0)
+        shift = level * bits
+        index = (tick >> shift) & self._mask
+        slot = self._levels[level][index]
+        slot[timer] = None
+        timer._slot = slot
+        self._occupied[level] |= 1 << index
+        return (tick >> shift) << shift
+
+    def _drive(self, start: int) -> None:
+        self._tick_driver = start
+        self._sim._schedule_at(max(start * self._resolution, self._sim.now()), self._turn, start)
+
+    def _turn(self, tick: int) -> None:
+        if tick != self._tick_driver:
+            return  # Superseded by an earlier turn of the wheel.
+        self._tick_driver = None
+        self._tick = tick
+
+        # The slots starting at this tick empty themselves onto the levels below, or onto the simulator.
+        due: List[Timer] = []
+        bits = self._bits
+        for level in reversed(range(len(self._levels))):
+            shift = level * bits
+            if tick & ((1 << shift) - 1) != 0:
+                continue
+            index = (tick >> shift) & self._mask
+            slot = self._levels[level][index]
+            if slot:
+                self._levels[level][index] = {}
+                for timer in slot:
+                    if self._place(timer) is None:
+                        timer._slot = None
+                        due.append(timer)
+            self._occupied[level] &= ~(1 << index)
+        due.sort(key=lambda timer: (timer._moment, timer._seq))
+        for timer in due:
+            self._release(timer)
+
+        start = self._find_next()
+        if start is not None:
+            self._drive(start)
+
+    def _find_next(self) -> Optional[int]:
+        # Start of the next slot holding timers. The slots of a level all start after those of the levels below, within
+        # the slot of the level above where the wheel is.
+        bits = self._bits
+        for level, slots in enumerate(self._levels):
+            shift = level * bits
+            digit = (self._tick >> shift) & self._mask
+            occupied = self._occupied[level] >> (digit + 1)
+            while occupied:
+                index = digit + (occupied & -occupied).bit_length()
+                if slots[index]:
+                    return (self._tick >> (shift + bits) << (shift + bits)) | (index << shift)
+                # Every timer of the slot was cancelled.
+                self._occupied[level] &= ~(1 << index)
+                occupied &= occupied - 1
+        return None
+
+    def _release(self, timer: Timer) -> None:
+        self._sim._schedule_at(max(timer._moment, self._sim.now()), self._fire, timer)
+
+    def _fire(self, timer: Timer) -> None:
+        if not timer._is_cancelled:
+            timer._has_fired = True
+            run_callback(self._sim, timer._fn, *timer._args, **timer._kwargs)
+
+
+def set_timer(delay: float, fn: Callable, *args: Any, **kwargs: Any) -> Timer:
+    """
+    Sets a timer on the current simulation: after the given delay, the given function is called with the given
+    parameters, as a callback computation, unless the timer has been cancelled meanwhile. Unlike a process advancing
+    through the delay, a timer holds no greenlet, and cancelling it is cheap.
+    """
+    return _rsim().timers.set(delay, fn, *args, **kwargs)  # type: ignore
+
+
+def _wait_signal(signal: greensim.Signal, timeout: Optional[float]) -> None:
+    # Waits for a greensim signal as its wait() method does, but times out through a timer, rather than through a
+    # process advancing through the whole timeout. Raises greensim.Timeout when the timeout elapses.
+    if signal.is_on:
+        return
+    if timeout is None:
+        signal.wait()
+        return
+    timer = set_timer(timeout, _time_out, greensim.Process.current(), signal)
+    try:
+        while not signal.is_on:
+            if timer.has_fired:
+                raise greensim.Timeout()
+            signal._queue.join()
+    finally:
+        timer.cancel()
+
+
+def _time_out(proc: greensim.Process, signal: greensim.Signal) -> None:
+    # The process may have been resumed by the signal at this very moment already; it then notices the timeout only
+    # if the signal has turned back off by the time it runs.
+    waiting = signal._queue._waiting
+    for index, (_, waiter) in enumerate(waiting):
+        if waiter is proc:
+            del waiting[index]
+            heapify(waiting)
+            proc.interrupt(greensim.Timeout())
+            return
+
+
 class Event:
     """
     Models an unrealized event in the simulation, which can then be fired to enact its realization.
@@ -71,13 +530,26 @@ class Event:
         """
         Waits for the event to be :py:meth:`fire` d, until the given timeout has elapsed (in simulated time).
         """
+        if not self.has_fired():
+            _assert_may_block("wait on events")
         try:
-            self._signal.wait(timeout)
+            _wait_signal(self._signal, timeout)
         except greensim.Timeout:
             raise Timeout()
 
 
-add = greensim.add
-add_in = greensim.add_in
-advance = greensim.advance
-now = greensim.now
+def add(fn: Callable, *args: Any, **kwargs: Any) -> greensim.Process:
+    return _rsim().add(fn, *args, **kwargs)
+
+
+def add_in(delay: float, fn: Callable, *args: Any, **kwargs: Any) -> greensim.Process:
+    return _rsim().add_in(delay, fn, *args, **kwargs)
+
+
+def advance(delay: float) -> None:
+    _assert_may_block("advance the simulated clock")
+    greensim.advance(delay)
+
+
+def now() -> float:
+    return _rsim().now()
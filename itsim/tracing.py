@@ -0,0 +1,207 @@
+"""
+Recording of the activity of a simulation, for viewing on a timeline. Once a :py:class:`TraceRecorder` is set as the
+current recorder, the model records spans of simulated time as they complete:
+
+- the lifetime of threads, and of each computation run as part of them (``thread`` and ``computation`` spans);
+- the transmission of packets over links, from the moment they are sent to the moment they are delivered (``packet``
+  spans);
+- the time processes spend blocked on their sockets, waiting for packets (``recv`` spans).
+
+Spans are held in a bounded ring buffer, so the latest ones are kept. The recording is exported in the Chrome trace
+event format, which the Chrome trace viewer and Perfetto load: simulated time runs along the timeline, and nodes and
+links each get a group of tracks. When no recorder is set, recording points cost a single test; a recorder sampling a
+fraction of the spans makes recording cheap enough to leave on in long runs.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+import json
+from typing import Any, Deque, Dict, Hashable, Iterator, List, Mapping, NamedTuple, Optional, TextIO
+
+
+class Span(NamedTuple):
+    """
+    Span of simulated time recorded in a trace.
+
+    :ivar category: Kind of activity.
+    :ivar name: Name of the activity.
+    :ivar start: Moment the activity started.
+    :ivar duration: Simulated time the activity lasted.
+    :ivar group: Object whose tracks the span is shown on: a node or a link.
+    :ivar track: Name of the track of the group the span is shown on.
+    :ivar args: Details on the activity, or ``None``.
+    """
+    category: str
+    name: str
+    start: float
+    duration: float
+    group: Hashable
+    track: str
+    args: Optional[Mapping[str, Any]]
+
+
+class TraceRecorder:
+    """
+    Ring buffer of the spans recorded in a simulation.
+
+    :param capacity: Maximum number of spans held; once the buffer is full, recording a span drops the oldest one.
+    :param rate: Fraction of the spans recorded, between 0 and 1. Spans are sampled evenly and deterministically: with a
+        rate of 0.25, every fourth span is recorded.
+    """
+
+    def __init__(self, capacity: int = 1000000, rate: float = 1.0) -> None:
+        if capacity < 1:
+            raise ValueError(f"Capacity must be positive (got {capacity}).")
+        if not 0.0 < rate <= 1.0:
+            raise ValueError(f"Sampling rate must be in (0, 1] (got {rate}).")
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._rate = rate
+        self._credit = 0.0
+        self.num_sampled_out = 0
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __iter__(self) -> Iterator[Span]:
+        return iter(self._spans)
+
+    @property
+    def capacity(self) -> int:
+        return self._spans.maxlen  # type: ignore
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def clear(self) -> None:
+        """
+        Drops all the spans recorded.
+        """
+        self._spans.clear()
+
+    def sample(self) -> bool:
+        """
+        Tells whether the next span is to be recorded, as per the sampling rate. Recording points ask this before
+        putting together the details of the span, so spans sampled out cost next to nothing.
+        """
+        if self._rate >= 1.0:
+            return True
+        self._credit += self._rate
+        if self._credit >= 1.0:
+            self._credit -= 1.0
+            return True
+        self.num_sampled_out += 1
+        return False
+
+    def record(
+        self,
+        category: str,
+        name: str,
+        start: float,
+        duration: float,
+        group: Hashable,
+        track: str,
+        args: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        """
+        Records a span, regardless of the sampling rate.
+        """
+        self._spans.append(Span(category, name, start, duration, group, track, args))
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        Returns the spans recorded as a Chrome trace: a JSON-serializable dictionary of trace events, where each node
+        and link is a process, with the tracks of its spans as threads. Times are in microseconds of simulated time.
+        """
+        ids_group: Dict[Hashable, int] = {}
+        ids_track: Dict[Any, int] = {}
+        events: List[Dict[str, Any]] = []
+        for span in self._spans:
+            pid = ids_group.get(span.group)
+            if pid is None:
+                pid = ids_group[span.group] = len(ids_group) + 1
+                events.append(_metadata("process_name", pid, 0, label_group(span.group)))
+            tid = ids_track.get((pid, span.track))
+            if tid is None:
+                tid = ids_track[(pid, span.track)] = len(ids_track) + 1
+                events.append(_metadata("thread_name", pid, tid, span.track))
+            event = {
+                "ph": "X",
+                "cat": span.category,
+                "name": span.name,
+                "ts": span.start * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": pid,
+                "tid": tid
+            }
+            if span.args is not None:
+                event["args"] = {key: _jsonable(value) for key, value in span.args.items()}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, file: TextIO) -> None:
+        """
+        Writes the spans recorded to the given stream, as a Chrome trace JSON document.
+        """
+        json.dump(self.chrome_trace(), file)
+
+
+def _metadata(name: str, pid: int, tid: int, label: str) -> Dict[str, Any]:
+    return {"ph": "M", "name": name, "pid": pid, "tid": tid, "args": {"name": label}}
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def label_group(group: Hashable) -> str:
+    """
+    Labels the group of tracks of a node or a link, by its address or network.
+    """
+    cidr = getattr(group, "cidr", None)
+    if cidr is not None:
+        return f"Link {cidr}"
+    addresses = getattr(group, "addresses", None)
+    if addresses is not None:
+        labels = [str(address) for address in addresses() if not address.is_loopback]
+        if labels:
+            return f"{type(group).__name__} {', '.join(labels)}"
+    return str(group)
+
+
+_recorder: Optional[TraceRecorder] = None
+
+
+def get_recorder() -> Optional[TraceRecorder]:
+    """
+    Returns the recorder spans are currently recorded to, if any.
+    """
+    return _recorder
+
+
+def set_recorder(recorder: Optional[TraceRecorder]) -> Optional[TraceRecorder]:
+    """
+    Sets the recorder spans are recorded to from now on (or stops recording with ``None``), and returns the recorder
+    previously set.
+    """
+    global _recorder
+    previous = _recorder
+    _recorder = recorder
+    return previous
+
+
+@contextmanager
+def recording(recorder: Optional[TraceRecorder] = None) -> Iterator[TraceRecorder]:
+    """
+    Records spans to the given recorder (a new one, by default) within the context, restoring the previous recorder on
+    exit.
+    """
+    if recorder is None:
+        recorder = TraceRecorder()
+    previous = set_recorder(recorder)
+    try:
+        yield recorder
+    finally:
+        set_recorder(previous)
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
+from array import array
 from enum import Enum, IntFlag, unique
-from ipaddress import ip_address, _BaseAddress, ip_network, _BaseNetwork
-from typing import Optional, Union, Iterable, Tuple, cast, Mapping
+from functools import lru_cache
+from ipaddress import ip_address, _BaseAddress, ip_network, _BaseNetwork, IPv4Address
+from typing import Optional, Union, Iterable, Tuple, cast, Mapping, List
 
 
 Address = _BaseAddress
@@ -14,6 +16,9 @@ Cidr = _BaseNetwork
 CidrRepr = Union[str, Cidr]
 Payload = Mapping[str, object]
 
+_ADDRESS_NULL = IPv4Address(0)
+_TYPECODE_UINT32 = next(code for code in "IL" if array(code).itemsize == 4)
+
 
 class AddressError(Exception):
 
@@ -29,7 +34,7 @@ class HostnameError(Exception):
         self.attmept = attempt
 
 
-def as_address(ar: AddressRepr, rr: CidrRepr = "0.0.0.0/0") -> Address:
+def as_address(ar: AddressRepr, rr: Optional[CidrRepr] = None) -> Address:
     """
     Returns a strict ``Address`` object from one of its representations:
 
@@ -43,24 +48,25 @@ def as_address(ar: AddressRepr, rr: CidrRepr = "0.0.0.0/0") -> Address:
         This is a network (CIDR) representation, and the given address representation is relative to this network.
         In other words, the address returned has its network number determined from ``rr``, and its machine number
         determined from ``ar``. If the given address ``ar`` is too long given the size of ``rr``, its most significant
-        bits are overriden by the corresponding bits of ``rr``. By default, this network is 0.0.0.0/0, hence the given
-        address is effectively absolute.
+        bits are overriden by the corresponding bits of ``rr``. By default (or when ``None`` is given), this network is
+        0.0.0.0/0, hence the given address is effectively absolute.
     """
-    network = as_cidr(rr)
-    if ar is None:
-        machine = ip_address(0)
+    if isinstance(ar, _BaseAddress):
+        machine = cast(Address, ar)
+    elif ar is None:
+        machine = _ADDRESS_NULL
     elif isinstance(ar, int):
         if ar < 0 or ar >= 2 ** 32:
             raise ValueError(ar)
-        machine = ip_address(ar)
+        machine = IPv4Address(ar)
     elif isinstance(ar, str):
-        try:
-            machine = ip_address(ar)
-        except ValueError:
-            raise AddressError(ar)
+        machine = _parse_address(ar)
     else:
         machine = cast(Address, ar)
 
+    if rr is None:
+        return machine
+
     # IP address = <Network|Host>
     #
     # Here, the network address of the given ar is replaced by that provided as rr. Thus, the bitwise AND with rr's
@@ -69,17 +75,77 @@ def as_address(ar: AddressRepr, rr: CidrRepr = "0.0.0.0/0") -> Address:
     #
     # Therefore, if rr is 0, its hostmask is 2**(32 for IPv4, or 128 for IPv6)-1. This effectively makes the AND and
     # addition a no-op, and the given machine address is returned unaltered.
+    network = as_cidr(rr)
+    if network.prefixlen == 0 and network.version == machine.version:
+        return machine
     return network.network_address + (int(machine) & int(network.hostmask))
 
 
+@lru_cache(maxsize=4096)
+def _parse_address(ar: str) -> Address:
+    try:
+        return ip_address(ar)
+    except ValueError:
+        raise AddressError(ar)
+
+
+@lru_cache(maxsize=1024)
+def _parse_cidr(cr: str) -> Cidr:
+    return ip_network(cr)
+
+
 def as_cidr(cr: CidrRepr) -> Cidr:
     """
     Returns a strict network address expressed as in CIDR form: either a string, expressing the network address as
-    ``"<network number><zeros>/<mask bits>"``, or as a ``Cidr`` object, which is returned unaltered.
+    ``"<network number><zeros>/<mask bits>"``, or as a ``Cidr`` object, which is returned unaltered. Networks expressed
+    as strings are parsed only once.
     """
     if isinstance(cr, _BaseNetwork):
         return cr
-    return ip_network(cr)
+    return _parse_cidr(cr)
+
+
+def as_address_int(ar: AddressRepr, rr: Optional[CidrRepr] = None) -> int:
+    """
+    Returns the integer value of an address, given from any of the representations accepted by :py:func:`as_address`.
+    Integers in the IPv4 range are returned unaltered when no network is given.
+    """
+    if isinstance(ar, int) and rr is None:
+        if ar < 0 or ar >= 2 ** 32:
+            raise ValueError(ar)
+        return ar
+    return int(as_address(ar, rr))
+
+
+def int_as_address(n: int) -> Address:
+    """
+    Returns the IPv4 address object corresponding to the given 32-bit integer.
+    """
+    return IPv4Address(n)
+
+
+def cidr_as_ints(cr: CidrRepr) -> Tuple[int, int]:
+    """
+    Returns the integer values of the network address and netmask of a network. An integer address ``a`` belongs to
+    this network if and only if ``a & netmask == network``.
+    """
+    network = as_cidr(cr)
+    return int(network.network_address), int(network.netmask)
+
+
+def addresses_as_ints(ars: Iterable[AddressRepr]) -> "array[int]":
+    """
+    Converts a sequence of address representations into a compact array of 32-bit unsigned integers, suitable for
+    bulk processing (for instance, through ``numpy.frombuffer(..., dtype=numpy.uint32)``).
+    """
+    return array(_TYPECODE_UINT32, (as_address_int(ar) for ar in ars))
+
+
+def ints_as_addresses(ns: Iterable[int]) -> List[Address]:
+    """
+    Converts a sequence of 32-bit integers into IPv4 address objects.
+    """
+    return [IPv4Address(n) for n in ns]
 
 
 def as_port(pr: PortRepr) -> Port:
@@ -108,6 +174,8 @@ def as_hostname(hr: HostnameRepr) -> Hostname:
 
 
 def is_ip_address(ar: HostnameRepr) -> bool:
+    if ar is None or isinstance(ar, _BaseAddress):
+        return True
     try:
         as_address(ar)
         return True
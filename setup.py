@@ -22,6 +22,7 @@ setup(
     data_files=[('.', ['LICENSE'])],
     scripts=["bin/itsim_serve_datastore.py"],
     install_requires=['greensim'],
+    extras_require={'numpy': ['numpy']},
     description='IT infrastructure and cyberattack simulation toolkit',
     long_description=long_description,
     long_description_content_type="text/markdown",
@@ -1,4 +1,10 @@
-from itsim import ITObject, Tag
+from uuid import UUID, uuid5
+
+import pytest
+
+from itsim import CounterIdentity, get_identity_scheme, identity_scheme, ITObject, RandomIdentity, Tag
+from itsim.network.location import Location
+from itsim.network.packet import Packet
 
 
 def test_empty_constructor():
@@ -10,3 +16,57 @@ def test_populated_constructor():
     tags = set([Tag.MALWARE])
     it = ITObject(*tags)
     assert it._tag_set == tags
+
+
+def test_uuid_lazy():
+    it = ITObject()
+    assert it._uuid is None
+    assert it.uuid == it.uuid
+    assert it._uuid is not None
+
+
+def test_counter_identity_reproducible():
+    namespace = UUID("0a1b2c3d-0000-4000-8000-000000000000")
+    uuids = []
+    for _ in range(2):
+        with identity_scheme(CounterIdentity(namespace)):
+            uuids.append([ITObject().uuid for _ in range(5)])
+    assert uuids[0] == uuids[1]
+    assert len(set(uuids[0])) == 5
+
+
+def test_counter_identity_namespace():
+    with identity_scheme(CounterIdentity(UUID(int=1))):
+        it1 = ITObject()
+    with identity_scheme(CounterIdentity(UUID(int=2))):
+        it2 = ITObject()
+    assert it1._id == it2._id
+    assert it1.uuid != it2.uuid
+
+
+def test_random_identity():
+    with identity_scheme(RandomIdentity()):
+        it = ITObject()
+    assert isinstance(it._id, UUID)
+    assert it.uuid == it._id
+
+
+def test_identity_scheme_restored():
+    scheme = get_identity_scheme()
+    with pytest.raises(RuntimeError):
+        with identity_scheme(RandomIdentity()):
+            raise RuntimeError()
+    assert get_identity_scheme() is scheme
+
+
+def test_uuid_keeps_scheme_of_construction():
+    scheme = CounterIdentity(UUID(int=3))
+    with identity_scheme(scheme):
+        it = ITObject()
+    assert it.uuid == scheme.as_uuid(it._id)
+
+
+def test_packet_uuid_from_scheme():
+    with identity_scheme(CounterIdentity(UUID(int=4), start=10)):
+        packet = Packet(Location(None, 0), Location(None, 0), 0)
+        assert packet.uuid == uuid5(UUID(int=4), "10")
@@ -28,3 +28,16 @@ def test_byte_size():
 def test_payload():
     assert Packet(src, dest, bigliness, payload).payload == payload
     assert Packet(src, dest, bigliness).payload == {}
+
+
+def test_uuid_lazy():
+    packet = Packet(src, dest, bigliness, payload)
+    assert packet._uuid is None
+    uuid = packet.uuid
+    assert packet.uuid == uuid
+    assert packet.uuid_str() == str(uuid)
+    assert Packet(src, dest, bigliness, payload).uuid != uuid
+
+
+def test_slotted():
+    assert not hasattr(Packet(src, dest, bigliness, payload), "__dict__")
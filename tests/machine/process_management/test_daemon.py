@@ -1,7 +1,11 @@
-from itsim.machine.process_management.daemon import Daemon, Service
-from itsim.simulator import Simulator
-
-from pytest import raises
+from itsim.machine.endpoint import Endpoint
+from itsim.machine.process_management.daemon import Daemon, Service, WorkerPool
+from itsim.network.location import Location
+from itsim.network.packet import Packet
+from itsim.simulator import BlockingInCallback, Simulator, advance, now
+from itsim.types import Protocol
+
+from pytest import approx, fixture, raises
 from unittest.mock import patch
 
 ##########
@@ -36,6 +40,118 @@ def test_trigger():
     with raises(AdHocError):
         daemon.trigger(0, kwarg=1)
 
+
+def test_daemon_blocking():
+    assert Daemon(lambda: None).is_blocking
+    assert not Daemon(lambda: None, blocking=False).is_blocking
+
+
+def test_daemon_non_blocking_callbacks():
+    endpoint = Endpoint()
+    sim = Simulator()
+    log = []
+
+    @endpoint.networking_daemon(sim, Protocol.UDP, 53, blocking=False)
+    def resolve(context, packet, socket):
+        log.append((now(), socket.port))
+        with raises(BlockingInCallback):
+            advance(1.0)
+
+    def send():
+        for _ in range(3):
+            endpoint._sockets[53]()._enqueue(Packet(Location(), Location(None, 53), 0, {}))
+        advance(1.0)
+        endpoint._sockets[53]()._enqueue(Packet(Location(), Location(None, 53), 0, {}))
+
+    sim.add_in(1.0, send)
+    sim.run()
+    assert log == [(1.0, 53)] * 3 + [(2.0, 53)]
+    # Only the receiving thread remains once the callbacks have completed.
+    assert [len(proc._threads) for proc in endpoint.procs()] == [1]
+
+
+##############
+# WorkerPool #
+##############
+
+
+@fixture
+def served():
+    return []
+
+
+def run_pool(served, num_packets, num_workers, queue_limit=None, ports=(80,)):
+    endpoint = Endpoint()
+    sim = Simulator()
+
+    def handle(context, packet, socket):
+        served.append((now(), socket.port, len(context.process._threads)))
+        advance(1.0)
+
+    pool = endpoint.run_networking_daemon(
+        sim,
+        Daemon(handle),
+        Protocol.TCP,
+        *ports,
+        num_workers=num_workers,
+        queue_limit=queue_limit
+    )
+
+    def send():
+        for n in range(num_packets):
+            port = ports[n % len(ports)]
+            endpoint._sockets[port]()._enqueue(Packet(Location(), Location(None, port), 0, {}))
+
+    sim.add_in(1.0, send)
+    sim.run()
+    return pool
+
+
+def test_worker_pool_invalid():
+    with raises(ValueError):
+        WorkerPool(Daemon(lambda: None), 0)
+
+
+def test_worker_pool_concurrency_limit(served):
+    pool = run_pool(served, 5, 2)
+    assert isinstance(pool, WorkerPool)
+    assert [moment for moment, _, _ in served] == approx([1.0, 1.0, 2.0, 2.0, 3.0])
+    # Dispatcher and workers all run as threads of a single process, whose number does not grow with the load.
+    assert all(num_threads == 3 for _, _, num_threads in served)
+    assert pool.num_workers == 2
+    assert pool.num_handled == 5
+    assert pool.num_workers_busy == 0
+
+
+def test_worker_pool_stats(served):
+    pool = run_pool(served, 5, 2)
+    assert pool.queue_depth == 0
+    assert pool.queue_depth_max == 5
+    assert pool.wait_max == approx(2.0)
+    assert pool.wait_mean == approx(0.8)
+    assert pool.num_dropped == 0
+
+
+def test_worker_pool_queue_limit(served):
+    pool = run_pool(served, 5, 1, queue_limit=3)
+    assert len(served) == 3
+    assert pool.num_handled == 3
+    assert pool.num_dropped == 2
+    assert pool.queue_depth_max == 3
+
+
+def test_worker_pool_many_ports(served):
+    run_pool(served, 4, 4, ports=(80, 443))
+    assert sorted(port for _, port, _ in served) == [80, 80, 443, 443]
+    assert [moment for moment, _, _ in served] == approx([1.0] * 4)
+
+
+def test_worker_pool_idle():
+    pool = WorkerPool(Daemon(lambda: None), 3)
+    assert pool.wait_mean == 0.0
+    assert pool.queue_depth == 0
+
+
 ###########
 # Service #
 ###########
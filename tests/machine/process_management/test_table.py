@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+from pytest import fixture, raises
+
+from itsim.machine.endpoint import Endpoint
+from itsim.machine.process_management.process import Process
+from itsim.machine.process_management.table import ProcessRecord, ProcessTable, process_tree
+from itsim.simulator import Simulator, advance
+
+
+def sleep(_, delay):
+    advance(delay)
+
+
+@fixture
+@patch("itsim.machine.node.Node")
+def procs(mock_node):
+    return [Process(n, mock_node) for n in range(3)]
+
+
+def test_add_get_remove(procs):
+    table = ProcessTable()
+    for proc in procs:
+        table.add(proc)
+    assert len(table) == 3
+    assert table.get(1) is procs[1]
+    assert procs[1] in table
+    table.remove(procs[1])
+    assert table.get(1) is None
+    assert procs[1] not in table
+    assert list(table) == [procs[0], procs[2]]
+    table.remove(procs[1])
+    assert len(table) == 2
+
+
+def test_add_pid_in_use(procs):
+    table = ProcessTable()
+    table.add(procs[0])
+    with raises(ValueError):
+        table.add(procs[0])
+
+
+def test_snapshot_cached(procs):
+    table = ProcessTable()
+    table.add(procs[0])
+    snapshot = table.snapshot()
+    assert snapshot == (ProcessRecord(0, None, ()),)
+    assert table.snapshot() is snapshot
+    table.add(procs[1])
+    assert table.snapshot() == (ProcessRecord(0, None, ()), ProcessRecord(1, None, ()))
+
+
+def test_snapshot_follows_threads():
+    node = Endpoint()
+    sim = Simulator()
+    proc = node.run_proc(sim, sleep, 10)
+    proc.exc_in(sim, 5, sleep, 10)
+    snapshots = []
+    sim.add_in(7, lambda: snapshots.append(node.procs().snapshot()))
+    sim.add_in(12, lambda: snapshots.append(node.procs().snapshot()))
+    sim.run()
+    assert snapshots == [
+        (ProcessRecord(0, -1, (0, 1)),),
+        (ProcessRecord(0, -1, (1,)),)
+    ]
+    assert node.procs().snapshot() == ()
+
+
+def test_process_tree_across_nodes():
+    nodes = [Endpoint(), Endpoint()]
+    sim = Simulator()
+    children = []
+
+    def parent(context):
+        children.append(context.process.fork_exec(sleep, 10))
+        advance(10)
+
+    proc = nodes[0].run_proc(sim, parent)
+    nodes[1].run_proc(sim, sleep, 10)
+    sim.run(5)
+    assert process_tree(nodes) == {
+        nodes[0]: (ProcessRecord(0, -1, (0,)), ProcessRecord(1, 0, (0,))),
+        nodes[1]: (ProcessRecord(0, -1, (0,)),)
+    }
+    assert proc.children == {children[0]}
+    assert children[0] not in nodes[0]._default_process_parent.children
+    sim.run()
+    assert process_tree(nodes) == {nodes[0]: (), nodes[1]: ()}
@@ -1,7 +1,7 @@
 from itsim.software.context import Context
 from itsim.machine.process_management.process import Process
 from itsim.machine.process_management.thread import Thread, ThreadKilled
-from itsim.simulator import Simulator, advance
+from itsim.simulator import BlockingInCallback, CallbackComputation, Event, Simulator, add_in, advance, now
 from itsim.types import Timeout
 from itsim.utils import assert_list
 
@@ -228,3 +228,71 @@ def test_kill_live_join_after():
 
 def test_kill_dead():
     run_test_kill(10, 20, 30, False)
+
+
+@patch("itsim.machine.process_management.process.Process")
+def test_run_callback(mock_proc):
+    log = []
+
+    def f(context, arg, kwarg):
+        log.append((context.thread, now(), arg, kwarg))
+
+    sim = Simulator()
+    thread = Thread(sim, mock_proc, 0)
+    sim_comp = thread.run_callback_in(10, f, 0, kwarg=1)
+    assert isinstance(sim_comp, CallbackComputation)
+    assert thread.is_alive()
+    sim.run()
+    assert log == [(thread, 10, 0, 1)]
+    assert thread._computations == set()
+    assert not thread.is_alive()
+    mock_proc.thread_complete.assert_called_with(thread)
+
+
+@patch("itsim.machine.process_management.process.Process")
+def test_run_callback_schedules(mock_proc):
+    log = []
+
+    def f(_):
+        add_in(5, lambda: log.append(now()))
+
+    sim = Simulator()
+    Thread(sim, mock_proc, 0).run_callback_in(10, f)
+    sim.run()
+    assert log == [15]
+
+
+@patch("itsim.machine.process_management.process.Process")
+def test_run_callback_blocking(mock_proc):
+    log = []
+    event = Event()
+
+    def f(_, block):
+        with raises(BlockingInCallback):
+            block()
+        log.append("raised")
+
+    sim = Simulator()
+    thread = Thread(sim, mock_proc, 0)
+    thread.run_callback(f, lambda: advance(1))
+    thread.run_callback(f, event.wait)
+    sim.run()
+    assert log == ["raised", "raised"]
+    assert not thread.is_alive()
+
+    # Code running as a greensim process is unaffected.
+    sim.add(lambda: advance(1))
+    sim.run()
+    assert sim.now() == 1
+
+
+@patch("itsim.machine.process_management.process.Process")
+def test_kill_pending_callback(mock_proc):
+    log = []
+    sim = Simulator()
+    thread = Thread(sim, mock_proc, 0)
+    thread.run_callback_in(10, lambda _: log.append("callback"))
+    sim.add_in(5, thread.kill)
+    sim.run()
+    assert log == []
+    assert not thread.is_alive()
@@ -13,7 +13,7 @@ from itsim.machine.node import PortAlreadyInUse, PORT_EPHEMERAL_MIN, PORT_EPHEME
     EphemeralPortsAllInUse, NoRouteToHost
 from itsim.machine.socket import Timeout, Socket
 from itsim.network.route import Relay
-from itsim.network.link import Link
+from itsim.network.link import Link, Loopback
 from itsim.network.location import Location
 from itsim.network.packet import Packet
 from itsim.network.service.dhcp.client import DHCPClient
@@ -48,6 +48,45 @@ def test_node_unconnected(endpoint):
     assert list(endpoint.addresses()) == addr("127.0.0.1")
 
 
+def test_node_state_lazy(endpoint):
+    assert endpoint._loopback_pending
+    assert endpoint._ports_ephemeral_bound is None
+    assert endpoint._default_process_parent_ is None
+    endpoint.bind()
+    assert endpoint._ports_ephemeral_bound is not None
+    endpoint.run_proc(Simulator(), lambda _: None)
+    assert endpoint._default_process_parent_ is not None
+
+
+def test_loopback_shared(endpoint):
+    other = Endpoint()
+    assert [i.link for i in endpoint.interfaces()] == [Loopback.shared()]
+    assert [i.link for i in other.interfaces()] == [Loopback.shared()]
+    assert list(Loopback.shared().iter_nodes()) == []
+
+
+def test_loopback_delivers_to_sender(endpoint):
+    other = Endpoint()
+    log = []
+
+    def exchange(node, name):
+        with node.bind(Protocol.UDP, 9887) as socket:
+            socket.send(("127.0.0.1", 9887), 10, name)
+            log.append((name, socket.recv().payload))
+
+    sim = Simulator()
+    sim.add(exchange, endpoint, "endpoint")
+    sim.add(exchange, other, "other")
+    sim.run()
+    assert sorted(log) == [("endpoint", "endpoint"), ("other", "other")]
+
+
+def test_loopback_replaced_before_use(endpoint):
+    link = Link("127.0.0.0/8", constant(0), constant(0))
+    endpoint.connected_to_static(link, "127.0.0.1")
+    assert [i.link for i in endpoint.interfaces()] == [link]
+
+
 ADDRESS_SMALL = CIDR_SMALL.network_address + 4
 ADDRESS_LARGE = as_address("10.10.192.54")
 
@@ -90,6 +129,34 @@ def test_raise_once_no_more_port_ephemeral(endpoint):
             sock.close()
 
 
+def test_get_port_ephemeral_skips_bound(endpoint):
+    with endpoint.bind(Protocol.NONE, PORT_EPHEMERAL_MIN + 1), endpoint.bind(Protocol.NONE, PORT_EPHEMERAL_MIN + 2):
+        assert endpoint._get_port_ephemeral() == PORT_EPHEMERAL_MIN
+        assert endpoint._get_port_ephemeral() == PORT_EPHEMERAL_MIN + 3
+
+
+def test_port_ephemeral_released_on_close(endpoint):
+    sockets = [endpoint.bind() for _ in range(PORT_EPHEMERAL_MIN, PORT_EPHEMERAL_UPPER)]
+    try:
+        port = sockets[5].port
+        sockets[5].close()
+        assert endpoint._get_port_ephemeral() == port
+        with endpoint.bind() as socket:
+            assert socket.port == port
+            with pytest.raises(EphemeralPortsAllInUse):
+                endpoint.bind()
+    finally:
+        for socket in sockets:
+            socket.close()
+
+
+def test_port_ephemeral_released_on_socket_lost(endpoint):
+    port = endpoint.bind().port  # Socket dropped right away, and finalized.
+    gc.collect()
+    assert endpoint.is_port_free(port)
+    assert endpoint._ports_ephemeral_bound[port - PORT_EPHEMERAL_MIN] == 0
+
+
 @pytest.fixture
 def socket80(endpoint):
     assert endpoint.is_port_free(80)
@@ -326,6 +393,35 @@ def test_receive_packet_in_transit(endpoint_2links, socket9887):
         mock.assert_called_with(packet)
 
 
+def test_addresses_local(endpoint_2links):
+    assert endpoint_2links._get_addresses_local() == set(addr(
+        "127.0.0.1",
+        "127.255.255.255",
+        ADDRESS_SMALL,
+        CIDR_SMALL.broadcast_address,
+        ADDRESS_LARGE,
+        CIDR_LARGE.broadcast_address
+    ))
+
+
+def test_addresses_local_follow_address_change(endpoint_2links, link_small, socket9887):
+    interface = next(interface for interface in endpoint_2links.interfaces() if interface.link is link_small)
+    address_old = interface.address
+    interface.address = "192.168.1.200"
+    assert as_address("192.168.1.200") in endpoint_2links._get_addresses_local()
+    assert address_old not in endpoint_2links._get_addresses_local()
+    with patch.object(socket9887, "_enqueue") as mock:
+        packet = do_test_receive_packet(endpoint_2links, socket9887, ("192.168.1.200", 9887))
+        mock.assert_called_with(packet)
+
+
+def test_addresses_local_follow_connect(endpoint):
+    link = Link("172.16.0.0/16", constant(1), constant(1))
+    endpoint.connected_to_static(link, 5)
+    assert as_address("172.16.0.5") in endpoint._get_addresses_local()
+    assert as_address("172.16.255.255") in endpoint._get_addresses_local()
+
+
 def test_packet_broadcast_alone_on_link(endpoint, link_small):
     endpoint.connected_to_static(link_small, "192.168.1.100")
     with patch.object(link_small, "_transfer_packet") as mock:
@@ -375,3 +471,73 @@ def test_connected_to_with_dhcp(endpoint, link_small):
     # an __eq__ to the class
     assert isinstance(args[2], DHCPClient)
     assert link_small.cidr == args[2]._interface._link.cidr
+
+
+def test_solve_transfer_routes_reassigned(endpoint, link_small):
+    endpoint.connected_to_static(link_small, 88, [Relay("192.168.1.2", "10.0.0.0/8")])
+    with pytest.raises(NoRouteToHost):
+        endpoint._solve_transfer(as_address("172.99.0.2"))
+
+    interface = next(interface for interface in endpoint.interfaces() if interface.link is link_small)
+    interface.routes = [Relay("192.168.1.3")]
+    interface_solved, hop = endpoint._solve_transfer(as_address("172.99.0.2"))
+    assert interface_solved is interface
+    assert hop == as_address("192.168.1.3")
+
+
+def test_solve_transfer_routes_list_copied(endpoint, link_small):
+    routes = [Relay("192.168.1.2", "10.0.0.0/8")]
+    endpoint.connected_to_static(link_small, 88, routes)
+    with pytest.raises(NoRouteToHost):
+        endpoint._solve_transfer(as_address("172.99.0.2"))
+    routes.append(Relay("192.168.1.3"))
+    with pytest.raises(NoRouteToHost):
+        endpoint._solve_transfer(as_address("172.99.0.2"))
+
+
+def test_route_cache_hits_misses(endpoint_2links):
+    for address in ["172.99.0.2", "192.168.1.23", "172.99.0.2", "172.99.0.2"]:
+        endpoint_2links._solve_transfer(as_address(address))
+    assert endpoint_2links.route_cache_misses == 2
+    assert endpoint_2links.route_cache_hits == 2
+
+
+def test_route_cache_bounded(endpoint_2links):
+    endpoint_2links.route_cache_capacity = 2
+    for address in ["172.99.0.2", "172.99.0.3", "172.99.0.4", "172.99.0.2"]:
+        endpoint_2links._solve_transfer(as_address(address))
+    assert endpoint_2links.route_cache_misses == 4
+    endpoint_2links._solve_transfer(as_address("172.99.0.4"))
+    assert endpoint_2links.route_cache_hits == 1
+
+
+def test_route_cache_disabled(endpoint_2links):
+    endpoint_2links.route_cache_capacity = 0
+    for _ in range(3):
+        endpoint_2links._solve_transfer(as_address("172.99.0.2"))
+    assert endpoint_2links.route_cache_hits == 0
+    assert endpoint_2links.route_cache_misses == 3
+
+
+def test_route_cache_invalidated_on_routes(endpoint_2links, link_large):
+    assert endpoint_2links._solve_transfer(as_address("172.99.0.2"))[1] == as_address("10.10.128.1")
+    interface = next(interface for interface in endpoint_2links.interfaces() if interface.link is link_large)
+    interface.routes = [Relay("10.10.128.2")]
+    assert endpoint_2links._solve_transfer(as_address("172.99.0.2"))[1] == as_address("10.10.128.2")
+
+
+def test_route_cache_invalidated_on_connect(endpoint_2links):
+    assert endpoint_2links._solve_transfer(as_address("172.16.0.9"))[1] == as_address("10.10.128.1")
+    link = Link("172.16.0.0/16", constant(0), constant(0))
+    endpoint_2links.connected_to_static(link, 3)
+    interface, hop = endpoint_2links._solve_transfer(as_address("172.16.0.9"))
+    assert interface.link is link
+    assert hop == as_address("172.16.0.9")
+
+
+def test_route_cache_invalidated_on_address(endpoint_2links, link_small):
+    interface = next(interface for interface in endpoint_2links.interfaces() if interface.link is link_small)
+    endpoint_2links._solve_transfer(as_address("192.168.1.23"))
+    interface.address = "192.168.1.99"
+    endpoint_2links._solve_transfer(as_address("192.168.1.23"))
+    assert endpoint_2links.route_cache_misses == 2
@@ -0,0 +1,208 @@
+from unittest.mock import Mock
+
+import pytest
+
+from itsim.machine.endpoint import Endpoint
+from itsim.machine.socket import Poller, Timeout
+from itsim.simulator import Simulator, advance, now
+from itsim.types import Protocol
+
+
+@pytest.fixture
+def socket():
+    with Endpoint().bind(Protocol.UDP, 9887) as socket:
+        yield socket
+
+
+def packets(num):
+    return [Mock(name=f"packet{n}") for n in range(num)]
+
+
+def run(f, *args):
+    result = []
+    sim = Simulator()
+    sim.add(lambda: result.append(f(*args)))
+    sim.run()
+    return result[0] if result else None
+
+
+def test_recv_queued_order(socket):
+    sent = packets(3)
+    for packet in sent:
+        socket._enqueue(packet)
+    assert [run(socket.recv) for _ in sent] == sent
+    assert not socket._packet_signal.is_on
+
+
+def test_recv_timeout(socket):
+    def recv():
+        with pytest.raises(Timeout):
+            socket.recv(2.0)
+        return now()
+    assert run(recv) == pytest.approx(2.0)
+
+
+def test_recv_closed(socket):
+    socket.close()
+    with pytest.raises(ValueError):
+        socket.recv()
+    with pytest.raises(ValueError):
+        socket.recv_many(4)
+
+
+def test_recv_many_drains_up_to_max(socket):
+    sent = packets(5)
+    for packet in sent:
+        socket._enqueue(packet)
+    assert run(socket.recv_many, 3) == sent[:3]
+    assert socket._packet_signal.is_on
+    assert run(socket.recv_many, 3) == sent[3:]
+    assert not socket._packet_signal.is_on
+    assert socket.num_buffered == 0
+
+
+def test_recv_many_wakes_once_per_burst(socket):
+    sent = packets(4)
+    received = []
+
+    def burst():
+        advance(1.0)
+        for packet in sent:
+            socket._enqueue(packet)
+
+    def receiver():
+        received.append(socket.recv_many(10))
+
+    sim = Simulator()
+    sim.add(receiver)
+    sim.add(burst)
+    sim.run()
+    assert received == [sent]
+
+
+def test_recv_many_at_least_one(socket):
+    with pytest.raises(ValueError):
+        socket.recv_many(0)
+
+
+def test_buffer_limit_drops(socket):
+    socket.buffer_limit = 2
+    sent = packets(5)
+    for packet in sent:
+        socket._enqueue(packet)
+    assert socket.num_buffered == 2
+    assert socket.num_dropped == 3
+    assert run(socket.recv_many, 10) == sent[:2]
+    socket._enqueue(sent[4])
+    assert socket.num_dropped == 3
+    assert run(socket.recv) is sent[4]
+
+
+def test_buffer_limit_unbounded_by_default(socket):
+    assert socket.buffer_limit is None
+    for packet in packets(1000):
+        socket._enqueue(packet)
+    assert socket.num_dropped == 0
+
+
+def test_buffer_limit_negative(socket):
+    with pytest.raises(ValueError):
+        socket.buffer_limit = -1
+
+
+@pytest.fixture
+def endpoint():
+    return Endpoint()
+
+
+def test_poll_ready_in_bulk(endpoint):
+    sockets = [endpoint.bind(Protocol.UDP, port) for port in range(1000, 1010)]
+    poller = Poller(sockets)
+    assert len(poller) == 10
+    log = []
+
+    def serve():
+        ready = poller.poll()
+        log.append((now(), ready))
+        for socket in ready:
+            socket.recv()
+
+    def burst():
+        advance(3.0)
+        for socket in [sockets[7], sockets[2], sockets[7]]:
+            socket._enqueue(Mock())
+
+    sim = Simulator()
+    sim.add(serve)
+    sim.add(burst)
+    sim.run()
+    assert log == [(pytest.approx(3.0), [sockets[7], sockets[2]])]
+    assert sockets[7].num_buffered == 1
+
+
+def test_poll_already_ready(socket):
+    socket._enqueue(Mock())
+    assert run(Poller([socket]).poll) == [socket]
+
+
+def test_poll_closed_is_ready(endpoint):
+    socket = endpoint.bind(Protocol.UDP, 1000)
+    poller = Poller([socket])
+
+    def close_later():
+        advance(1.0)
+        socket.close()
+
+    sim = Simulator()
+    result = []
+    sim.add(lambda: result.append(poller.poll()))
+    sim.add(close_later)
+    sim.run()
+    assert result == [[socket]]
+
+
+def test_poll_timeout(socket):
+    poller = Poller([socket])
+
+    def poll():
+        with pytest.raises(Timeout):
+            poller.poll(5.0)
+        return now()
+
+    assert run(poll) == pytest.approx(5.0)
+
+
+def test_poll_skips_drained(endpoint):
+    first = endpoint.bind(Protocol.UDP, 1000)
+    second = endpoint.bind(Protocol.UDP, 1001)
+    poller = Poller([first, second])
+    first._enqueue(Mock())
+    log = []
+
+    def steal_then_feed():
+        first.recv()
+        advance(2.0)
+        second._enqueue(Mock())
+
+    def poll():
+        log.append((poller.poll(), now()))
+
+    sim = Simulator()
+    sim.add(steal_then_feed)
+    sim.add(poll)
+    sim.run()
+    assert log == [([second], pytest.approx(2.0))]
+
+
+def test_poll_unregister(socket):
+    poller = Poller([socket])
+    socket._enqueue(Mock())
+    poller.unregister(socket)
+    assert len(poller) == 0
+    assert socket._pollers == []
+
+    def poll():
+        with pytest.raises(Timeout):
+            poller.poll(1.0)
+
+    run(poll)
@@ -48,9 +48,9 @@ def test_init():
 
 def feed_on_packet(payload,
                    server=default_server(),
-                   mock_thread=patch("itsim.machine.process_management.thread.Thread").start(),
-                   mock_pack=patch("itsim.network.packet.Packet").start(),
-                   mock_sock=patch("itsim.machine.socket.Socket").start(),
+                   mock_thread=Mock(),
+                   mock_pack=Mock(),
+                   mock_sock=Mock(),
                    sim_time=1):
     mock_pack.payload = payload
     flag = 0
@@ -230,3 +230,24 @@ def test_request(server):
     assert server._address_allocation[node_id].is_confirmed
     assert address == server._address_allocation[node_id].address
     assert server._reserved[address]
+
+
+@patch("itsim.machine.socket.Socket")
+def test_request_cancels_expiry(mock_sock, server):
+    node_id = uuid4()
+    address = as_address("192.168.1.4")
+    feed_on_packet({Field.MESSAGE: DHCP.DISCOVER,
+                    Field.NODE_ID: node_id,
+                    Field.ADDRESS: address},
+                   server=server,
+                   mock_sock=mock_sock)
+    timer = server._address_allocation[node_id].timer
+    assert not timer.is_cancelled
+
+    feed_on_packet({Field.MESSAGE: DHCP.REQUEST,
+                    Field.NODE_ID: node_id,
+                    Field.ADDRESS: address},
+                   server=server,
+                   mock_sock=mock_sock)
+    assert timer.is_cancelled
+    assert server._address_allocation[node_id].is_confirmed
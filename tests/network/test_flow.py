@@ -0,0 +1,146 @@
+from unittest.mock import Mock
+
+import pytest
+
+from greensim.random import constant
+
+from itsim.machine.endpoint import Endpoint
+from itsim.network.flow import Flow, share_max_min
+from itsim.network.link import Link
+from itsim.simulator import Simulator, advance, now
+from itsim.types import Protocol
+from itsim.units import S, MB, GbPS
+
+
+LATENCY = 1 * S
+MB_PER_S = 8 * MB  # Rates are expressed in bits per second.
+BANDWIDTH = 1 * MB_PER_S
+
+
+def flow_capped(rate_max):
+    return Flow(Mock(byte_size=1), Mock(), rate_max)
+
+
+def test_share_max_min_even():
+    flows = [flow_capped(None) for _ in range(4)]
+    share_max_min(100.0, flows)
+    assert [flow.rate for flow in flows] == pytest.approx([25.0] * 4)
+
+
+def test_share_max_min_capped():
+    flows = [flow_capped(None), flow_capped(10.0), flow_capped(None), flow_capped(20.0), flow_capped(40.0)]
+    share_max_min(100.0, flows)
+    assert [flow.rate for flow in flows] == pytest.approx([70 / 3, 10.0, 70 / 3, 20.0, 70 / 3])
+
+
+def test_share_max_min_all_capped_below():
+    flows = [flow_capped(10.0), flow_capped(20.0)]
+    share_max_min(100.0, flows)
+    assert [flow.rate for flow in flows] == pytest.approx([10.0, 20.0])
+
+
+def test_flow_rate_max_positive():
+    with pytest.raises(ValueError):
+        flow_capped(0.0)
+
+
+@pytest.fixture
+def link():
+    return Link("10.0.0.0/24", constant(LATENCY), constant(BANDWIDTH))
+
+
+def run_flows(link, flows_sent):
+    """
+    Runs a simulation where a sender transmits flows to receivers over the given link. Each flow is given as a tuple
+    (delay before start, number of bytes, maximum rate). Returns the moment each flow's packet is received, and the
+    flows.
+    """
+    sender = Endpoint().connected_to_static(link, 1)
+    receiver = Endpoint().connected_to_static(link, 2)
+    received = {}
+    flows = []
+
+    def receive(_):
+        with receiver.bind(Protocol.TCP, 80) as socket:
+            while len(received) < len(flows_sent):
+                packet = socket.recv()
+                received[packet.payload["index"]] = now()
+
+    def send(_, index, delay, size, rate_max):
+        advance(delay)
+        with sender.bind(Protocol.TCP) as socket:
+            flow = socket.send_flow(("10.0.0.2", 80), size, rate_max, {"index": index})
+            flows.append(flow)
+            flow.wait()
+            assert flow.is_complete()
+
+    sim = Simulator()
+    receiver.run_proc(sim, receive)
+    for index, (delay, size, rate_max) in enumerate(flows_sent):
+        sender.run_proc(sim, send, index, delay, size, rate_max)
+    sim.run()
+    return [received[index] for index in range(len(flows_sent))], flows
+
+
+def test_flow_alone(link):
+    received, flows = run_flows(link, [(0, 10 * MB, None)])
+    assert received == pytest.approx([10.0 + LATENCY])
+    assert flows[0].time_complete == pytest.approx(10.0)
+
+
+def test_flow_capped(link):
+    received, _ = run_flows(link, [(0, 10 * MB, 0.5 * MB_PER_S)])
+    assert received == pytest.approx([20.0 + LATENCY])
+
+
+def test_flows_share_link(link):
+    # Both share 1 MB/s until the first completes at 4 s; the second carries on alone with its remaining 1 MB.
+    received, _ = run_flows(link, [(0, 2 * MB, None), (0, 3 * MB, None)])
+    assert received == pytest.approx([4.0 + LATENCY, 5.0 + LATENCY])
+
+
+def test_flow_joins_later(link):
+    # Alone for 2 s (2 MB sent), then shared: 2 MB left at 0.5 MB/s for each flow.
+    received, _ = run_flows(link, [(0, 4 * MB, None), (2, 2 * MB, None)])
+    assert received == pytest.approx([6.0 + LATENCY, 6.0 + LATENCY])
+
+
+def test_flow_capped_leaves_bandwidth(link):
+    # The capped flow takes a quarter of the bandwidth; the other flow gets the rest.
+    received, _ = run_flows(link, [(0, 1 * MB, 0.25 * MB_PER_S), (0, 3 * MB, None)])
+    assert received == pytest.approx([4.0 + LATENCY, 4.0 + LATENCY])
+
+
+def test_flow_broadcast_refused(link):
+    sender = Endpoint().connected_to_static(link, 1)
+    sim = Simulator()
+    log = []
+
+    def send(_):
+        with sender.bind(Protocol.TCP) as socket:
+            with pytest.raises(ValueError):
+                socket.send_flow(("10.0.0.255", 80), 1000)
+            log.append("refused")
+
+    sender.run_proc(sim, send)
+    sim.run()
+    assert log == ["refused"]
+
+
+def test_flows_loopback_per_node():
+    # Loopback flows of distinct nodes do not share bandwidth, though the loopback link is shared.
+    nodes = [Endpoint(), Endpoint()]
+    times_complete = []
+
+    def send(_, node):
+        with node.bind(Protocol.TCP, 80), node.bind(Protocol.TCP) as socket:
+            flow = socket.send_flow(("127.0.0.1", 80), 100 * MB)
+            flow.wait()
+            times_complete.append(flow.time_complete)
+
+    sim = Simulator()
+    for node in nodes:
+        node.run_proc(sim, send, node)
+    sim.run()
+    # Each flow has the whole bandwidth of the loopback (100 GbPS) to itself.
+    assert times_complete == pytest.approx([8 * 100 * MB / (100 * GbPS)] * 2)
@@ -0,0 +1,125 @@
+from ipaddress import ip_address, ip_network
+from random import Random
+
+import pytest
+
+from itsim.network.forwarding import ForwardingTable
+from itsim.types import as_address, as_cidr
+
+
+def table_of(*cidrs):
+    table = ForwardingTable()
+    for cidr in cidrs:
+        table.add(as_cidr(cidr), cidr)
+    return table
+
+
+def test_empty():
+    table = ForwardingTable()
+    assert len(table) == 0
+    assert table.lookup(as_address("10.1.2.3")) is None
+
+
+def test_miss():
+    table = table_of("10.0.0.0/8", "192.168.1.0/24")
+    for address in ["11.0.0.1", "192.168.2.1", "0.0.0.0"]:
+        assert table.lookup(as_address(address)) is None
+
+
+def test_default_route():
+    table = table_of("0.0.0.0/0")
+    for address in ["0.0.0.0", "8.8.8.8", "255.255.255.255"]:
+        assert table.lookup(as_address(address)) == "0.0.0.0/0"
+
+
+def test_host_route():
+    table = table_of("10.0.0.0/8", "10.1.2.3/32")
+    assert table.lookup(as_address("10.1.2.3")) == "10.1.2.3/32"
+    assert table.lookup(as_address("10.1.2.4")) == "10.0.0.0/8"
+
+
+def test_longest_prefix_nested():
+    table = table_of("0.0.0.0/0", "10.0.0.0/8", "10.10.0.0/16", "10.10.128.0/17")
+    for address, expected in [
+        ("10.10.200.1", "10.10.128.0/17"),
+        ("10.10.1.1", "10.10.0.0/16"),
+        ("10.20.1.1", "10.0.0.0/8"),
+        ("172.16.0.1", "0.0.0.0/0")
+    ]:
+        assert table.lookup(as_address(address)) == expected
+
+
+def test_longest_prefix_inserted_shortest_last():
+    table = table_of("10.10.128.0/17", "10.10.0.0/16", "10.0.0.0/8", "0.0.0.0/0")
+    assert table.lookup(as_address("10.10.200.1")) == "10.10.128.0/17"
+    assert table.lookup(as_address("10.10.1.1")) == "10.10.0.0/16"
+    assert table.lookup(as_address("10.20.1.1")) == "10.0.0.0/8"
+
+
+def test_split_siblings():
+    # 10.0.0.0/16 and 10.0.128.0/17 diverge from 10.0.64.0/18 in the middle of their compressed paths.
+    table = table_of("10.0.128.0/17", "10.0.64.0/18", "10.0.0.0/16")
+    assert len(table) == 3
+    assert table.lookup(as_address("10.0.200.1")) == "10.0.128.0/17"
+    assert table.lookup(as_address("10.0.70.1")) == "10.0.64.0/18"
+    assert table.lookup(as_address("10.0.1.1")) == "10.0.0.0/16"
+    assert table.lookup(as_address("10.1.0.1")) is None
+
+
+def test_split_without_entry_at_fork():
+    table = table_of("192.168.1.0/24", "192.168.2.0/24")
+    assert table.lookup(as_address("192.168.1.9")) == "192.168.1.0/24"
+    assert table.lookup(as_address("192.168.2.9")) == "192.168.2.0/24"
+    assert table.lookup(as_address("192.168.0.9")) is None
+    assert table.lookup(as_address("192.168.3.9")) is None
+
+
+def test_duplicate_prefix_keeps_first():
+    table = ForwardingTable()
+    table.add(as_cidr("10.0.0.0/8"), "first")
+    table.add(as_cidr("10.0.0.0/8"), "second")
+    assert len(table) == 1
+    assert table.lookup(as_address("10.1.1.1")) == "first"
+
+
+def test_none_entry_rejected():
+    with pytest.raises(ValueError):
+        ForwardingTable().add(as_cidr("10.0.0.0/8"), None)
+
+
+def test_ipv4_ipv6_apart():
+    table = ForwardingTable()
+    table.add(ip_network("0.0.0.0/0"), "v4")
+    assert table.lookup(ip_address("::1")) is None
+    table.add(ip_network("::/0"), "v6")
+    table.add(ip_network("2001:db8::/32"), "doc")
+    assert table.lookup(ip_address("10.0.0.1")) == "v4"
+    assert table.lookup(ip_address("::a00:1")) == "v6"
+    assert table.lookup(ip_address("2001:db8::1")) == "doc"
+
+
+def lookup_linear(cidrs, address):
+    best = None
+    for cidr in cidrs:
+        if address in cidr and (best is None or cidr.prefixlen > best.prefixlen):
+            best = cidr
+    return best
+
+
+def test_matches_linear_scan():
+    rng = Random(1234)
+    for _ in range(200):
+        cidrs = []
+        for _ in range(rng.randint(1, 30)):
+            prefixlen = rng.randint(0, 32)
+            cidrs.append(ip_network((rng.getrandbits(32) >> (32 - prefixlen) << (32 - prefixlen), prefixlen)))
+        table = ForwardingTable()
+        for cidr in cidrs:
+            table.add(cidr, cidr)
+        for _ in range(30):
+            if rng.random() < 0.5:
+                address = ip_address(rng.getrandbits(32))
+            else:
+                cidr = rng.choice(cidrs)
+                address = cidr.network_address + rng.randrange(cidr.num_addresses)
+            assert table.lookup(address) == lookup_linear(cidrs, address)
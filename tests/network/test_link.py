@@ -1,15 +1,16 @@
 from contextlib import ExitStack
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
 from greensim.random import constant
 
 from itsim.machine.endpoint import Endpoint
-from itsim.network.link import Link, NoSuchAddress
+from itsim.network.interface import Interface
+from itsim.network.link import Contention, Link, NoSuchAddress
 from itsim.network.location import Location
 from itsim.network.packet import Packet
-from itsim.simulator import Simulator
+from itsim.simulator import Simulator, advance, now
 from itsim.types import as_address
 from itsim.units import S, B
 
@@ -90,3 +91,163 @@ def test_link_transfer_broadcast(link, laurel, hardy):
 
         for mock in mocks:
             mock.assert_called_with(packet)
+
+
+def packet_broadcast():
+    return Mock(source=Location("192.168.1.34", 56788), dest=Location("192.168.1.255", 9887), byte_size=SIZE_PACKET)
+
+
+def test_link_transfer_broadcast_single_event(link, laurel, hardy):
+    packet = packet_broadcast()
+    with patch("itsim.network.link.add_in") as mock:
+        link._transfer_packet(packet, as_address("192.168.1.255"))
+        mock.assert_called_once()
+        duration, deliver, packet_delivered, recipients = mock.call_args[0]
+        assert duration == pytest.approx(DURATION_TRANSFER_TOTAL)
+        assert packet_delivered is packet
+        assert set(recipients) == {laurel, hardy}
+
+
+def test_link_transfer_broadcast_empty_link_no_event(link):
+    with patch("itsim.network.link.add_in") as mock:
+        link._transfer_packet(
+            Packet(Location("192.168.1.34", 56788), Location("192.168.1.255", 10987), 1234),
+            as_address("192.168.1.255")
+        )
+        mock.assert_not_called()
+
+
+def run_broadcast_bound_only(broadcast_to_bound_only):
+    link = Link("192.168.1.0/24", constant(LATENCY), constant(BANDWIDTH), broadcast_to_bound_only)
+    laurel = Endpoint().connected_to_static(link, "192.168.1.4")
+    hardy = Endpoint().connected_to_static(link, "192.168.1.78")
+    packet = packet_broadcast()
+    with laurel.bind(pr=9887), patch.object(laurel, "_receive_packet") as mock_laurel, \
+            patch.object(hardy, "_receive_packet") as mock_hardy:
+        run_simulation(link, packet, as_address("192.168.1.255"))
+        mock_laurel.assert_called_once_with(packet)
+        return mock_hardy.call_count
+
+
+def test_link_transfer_broadcast_bound_only():
+    assert run_broadcast_bound_only(True) == 0
+    assert run_broadcast_bound_only(False) == 1
+
+
+def test_link_resolve(link, laurel, hardy):
+    assert link.resolve(as_address("192.168.1.4")) is laurel
+    assert link.resolve(as_address("192.168.1.78")) is hardy
+    with pytest.raises(NoSuchAddress):
+        link.resolve(as_address("192.168.1.99"))
+
+
+def test_link_resolve_after_address_change(link, laurel):
+    interface = next(interface for interface in laurel.interfaces() if interface.link is link)
+    interface.address = "192.168.1.99"
+    assert link.resolve(as_address("192.168.1.99")) is laurel
+    with pytest.raises(NoSuchAddress):
+        link.resolve(as_address("192.168.1.4"))
+
+
+def test_link_resolve_shared_address(link):
+    first = Endpoint().connected_to_static(link, None)
+    second = Endpoint().connected_to_static(link, None)
+    assert link.resolve(as_address("192.168.1.0")) is first
+    interface = next(interface for interface in first.interfaces() if interface.link is link)
+    interface.address = "192.168.1.12"
+    assert link.resolve(as_address("192.168.1.0")) is second
+    assert link.resolve(as_address("192.168.1.12")) is first
+
+
+def test_link_resolve_two_interfaces_same_node(link, laurel):
+    interface_first = next(interface for interface in laurel.interfaces() if interface.link is link)
+    interface_second = Interface(link, as_address("192.168.1.5"), [])
+    link._connect(laurel, interface_second)
+    interface_second.address = "192.168.1.4"
+    interface_first.address = "192.168.1.40"
+    assert link.resolve(as_address("192.168.1.4")) is laurel
+    assert link.resolve(as_address("192.168.1.40")) is laurel
+    with pytest.raises(NoSuchAddress):
+        link.resolve(as_address("192.168.1.5"))
+
+
+def test_link_reconnect_forgets_replaced_interface(link):
+    endpoint = Endpoint().connected_to_static(link, 5).connected_to_static(link, 6)
+    assert as_address("192.168.1.5") not in set(endpoint.addresses())
+    assert link.resolve(as_address("192.168.1.6")) is endpoint
+    with pytest.raises(NoSuchAddress):
+        link.resolve(as_address("192.168.1.5"))
+    assert list(link.iter_nodes()) == [endpoint]
+
+
+def test_link_transfer_packet_after_address_change(link, laurel, hardy):
+    interface = next(interface for interface in hardy.interfaces() if interface.link is link)
+    interface.address = "192.168.1.120"  # As would happen upon a DHCP ACK.
+    packet = Packet(Location("192.168.1.4", 9887), Location("192.168.1.120", 25001), SIZE_PACKET)
+    with patch.object(hardy, "_receive_packet") as mock_hardy, patch.object(laurel, "_receive_packet") as mock_laurel:
+        run_simulation(link, packet, as_address("192.168.1.120"))
+        mock_hardy.assert_called_once_with(packet)
+        mock_laurel.assert_not_called()
+    with pytest.raises(NoSuchAddress):
+        run_simulation(link, packet, as_address("192.168.1.78"))
+
+
+def run_contention(contention, sources):
+    link = Link("192.168.1.0/24", constant(LATENCY), constant(BANDWIDTH), contention=contention)
+    receiver = Endpoint().connected_to_static(link, "192.168.1.4")
+    deliveries = []
+    packets = [
+        Mock(source=Location(source, 9887), dest=Location("192.168.1.4", 9887), byte_size=SIZE_PACKET)
+        for source in sources
+    ]
+
+    def transmit():
+        for packet in packets:
+            link._transfer_packet(packet, as_address("192.168.1.4"))
+
+    with patch.object(receiver, "_receive_packet", side_effect=lambda _: deliveries.append(now())):
+        sim = Simulator()
+        sim.add(transmit)
+        sim.run()
+    return link, deliveries
+
+
+def test_link_contention_none():
+    link, deliveries = run_contention(Contention.NONE, ["192.168.1.10"] * 3)
+    assert deliveries == pytest.approx([DURATION_TRANSFER_TOTAL] * 3)
+    assert link.stats.num_packets == 3
+    assert link.stats.delay_queue_max == 0.0
+
+
+def test_link_contention_shared():
+    link, deliveries = run_contention(Contention.SHARED, ["192.168.1.10", "192.168.1.11", "192.168.1.12"])
+    assert deliveries == pytest.approx([2.0, 3.0, 4.0])
+    assert link.stats.num_packets == 3
+    assert link.stats.num_bytes == 3 * SIZE_PACKET
+    assert link.stats.delay_queue_total == pytest.approx(3.0)
+    assert link.stats.delay_queue_max == pytest.approx(2.0)
+    assert link.stats.delay_queue_mean == pytest.approx(1.0)
+    assert link.stats.utilization(4.0) == pytest.approx(0.75)
+
+
+def test_link_contention_per_port():
+    link, deliveries = run_contention(Contention.PER_PORT, ["192.168.1.10", "192.168.1.11", "192.168.1.10"])
+    assert sorted(deliveries) == pytest.approx([2.0, 2.0, 3.0])
+    assert link.stats.delay_queue_total == pytest.approx(1.0)
+    assert link.stats.utilization(3.0) == pytest.approx(1.0)
+
+
+def test_link_contention_medium_freed():
+    link = Link("192.168.1.0/24", constant(LATENCY), constant(BANDWIDTH), contention=Contention.SHARED)
+    Endpoint().connected_to_static(link, "192.168.1.4")
+    packet = Mock(source=Location("192.168.1.10", 9887), dest=Location("192.168.1.4", 9887), byte_size=SIZE_PACKET)
+
+    def transmit_apart():
+        link._transfer_packet(packet, as_address("192.168.1.4"))
+        advance(5 * S)
+        link._transfer_packet(packet, as_address("192.168.1.4"))
+
+    sim = Simulator()
+    sim.add(transmit_apart)
+    sim.run()
+    assert link.stats.delay_queue_total == 0.0
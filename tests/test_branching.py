@@ -0,0 +1,110 @@
+from functools import partial
+import os
+
+import pytest
+
+from itsim.simulator import Simulator, advance, now
+
+
+WARM_UP = 100.0
+
+
+def workstation(log, period):
+    while True:
+        advance(period)
+        log.append(now())
+
+
+def warmed_up():
+    sim = Simulator()
+    log = []
+    for period in [3.0, 7.0, 11.0]:
+        sim.add(workstation, log, period)
+    sim.run(WARM_UP)
+    return sim, log
+
+
+def attack(log, sim, params):
+    hits = []
+    sim.add(workstation, hits, params["period"])
+    return {"hits": hits, "log": log}
+
+
+def num_hits(model):
+    return len(model["hits"])
+
+
+def log_after(model):
+    return [t for t in model["log"] if t > WARM_UP]
+
+
+def failing(sim, params):
+    if params == "crash":
+        os._exit(3)
+    if params == "fail":
+        raise ValueError("Scenario cannot be injected.")
+    return {"hits": [], "log": []}
+
+
+@pytest.fixture
+def branched():
+    return warmed_up()
+
+
+def test_branch_from_checkpoint(branched):
+    sim, log = branched
+    runs = [{"period": 1.0}, {"period": 5.0}, {"period": 50.0}]
+    extractors = {"hits": num_hits, "after": log_after}
+    outcomes = sim.branch(partial(attack, log), runs, extractors, duration=20.0, max_workers=2)
+    assert [outcome.index for outcome in outcomes] == [0, 1, 2]
+    assert all(outcome.is_success() for outcome in outcomes)
+    assert [outcome.results["hits"] for outcome in outcomes] == [19, 3, 0]
+
+    # Branches carry on from the checkpoint, as the simulation does once resumed.
+    assert sim.now() == WARM_UP
+    num_warm_up = len(log)
+    sim.run(20.0)
+    assert all(outcome.results["after"] == log[num_warm_up:] for outcome in outcomes)
+
+
+def test_branch_leaves_simulation_untouched(branched):
+    sim, log = branched
+    num_events = len(list(sim.events()))
+    num_log = len(log)
+    sim.branch(partial(attack, log), [{"period": 1.0}], {"hits": num_hits}, duration=20.0)
+    assert sim.now() == WARM_UP
+    assert len(list(sim.events())) == num_events
+    assert len(log) == num_log
+
+
+def test_branch_failures(branched):
+    sim, _ = branched
+    outcomes = sim.branch(failing, ["fail", "crash", "ok"], {"hits": num_hits}, duration=10.0)
+    assert isinstance(outcomes[0].error, ValueError)
+    assert outcomes[0].results == {}
+    assert isinstance(outcomes[1].error, RuntimeError)
+    assert "died" in str(outcomes[1].error)
+    assert outcomes[2].is_success()
+    assert outcomes[2].results == {"hits": 0}
+
+
+def test_branch_unpicklable_results(branched):
+    sim, log = branched
+    extractors = {"gen": lambda model: (t for t in model["hits"])}
+    outcome, = sim.branch(partial(attack, log), [{"period": 1.0}], extractors, duration=5.0)
+    assert isinstance(outcome.error, TypeError)
+
+
+def test_branch_while_running():
+    sim = Simulator()
+    errors = []
+
+    def brancher():
+        try:
+            sim.branch(partial(attack, []), [{"period": 1.0}], {})
+        except RuntimeError as err:
+            errors.append(err)
+
+    sim.add(brancher)
+    sim.run()
+    assert len(errors) == 1
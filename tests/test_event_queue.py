@@ -0,0 +1,167 @@
+from io import StringIO
+from math import inf
+from random import Random
+
+import pytest
+
+from greensim import _Event
+
+from itsim.event_queue import CalendarQueue, HeapQueue
+from itsim.simulator import Simulator, advance, now
+
+
+def noop():
+    pass
+
+
+def events_random(rng, num, counter=0, start=0.0):
+    return [_Event(start + rng.expovariate(1.0), counter + i, noop) for i in range(num)]
+
+
+@pytest.fixture(params=[HeapQueue, CalendarQueue])
+def queue(request):
+    return request.param()
+
+
+def test_empty(queue):
+    assert len(queue) == 0
+    assert list(queue) == []
+    with pytest.raises(IndexError):
+        queue.pop()
+    with pytest.raises(IndexError):
+        queue.peek()
+
+
+def test_order(queue):
+    events = events_random(Random(1), 1000)
+    for event in events:
+        queue.push(event)
+    assert len(queue) == 1000
+    assert sorted(queue) == sorted(events)
+    popped = []
+    while len(queue) > 0:
+        assert queue.peek() is queue.peek()
+        popped.append(queue.pop())
+    assert popped == sorted(events)
+
+
+def test_order_ties(queue):
+    events = [_Event(float(t), i, noop) for i, t in enumerate([3, 1, 1, 2, 3, 1, inf, 0])]
+    for event in events:
+        queue.push(event)
+    assert [queue.pop().identifier for _ in range(len(events))] == [7, 1, 2, 5, 3, 0, 4, 6]
+
+
+def test_hold(queue):
+    # Hold model: each event popped is replaced with a later one, with a few events scheduled earlier than the last
+    # ones popped along the way.
+    rng = Random(2)
+    reference = HeapQueue()
+    events = events_random(rng, 200)
+    for event in events:
+        queue.push(event)
+        reference.push(event)
+    counter = len(events)
+    for _ in range(5000):
+        event = queue.pop()
+        assert event is reference.pop()
+        for _ in range(rng.choice([0, 1, 1, 2])):
+            later = _Event(event._timestamp + rng.expovariate(rng.choice([0.01, 1.0, 100.0])), counter, noop)
+            counter += 1
+            queue.push(later)
+            reference.push(later)
+    assert len(queue) == len(reference)
+    assert [queue.pop() for _ in range(len(queue))] == [reference.pop() for _ in range(len(reference))]
+
+
+def test_clear(queue):
+    for event in events_random(Random(3), 100):
+        queue.push(event)
+    queue.clear()
+    assert len(queue) == 0
+    event = _Event(5.0, 1000, noop)
+    queue.push(event)
+    assert queue.pop() is event
+
+
+def test_calendar_resizes():
+    queue = CalendarQueue(width=1.0)
+    for event in events_random(Random(4), 1000):
+        queue.push(event)
+    assert queue.num_buckets >= 500
+    assert queue.width < 0.1
+    while len(queue) > 1:
+        queue.pop()
+    assert queue.num_buckets <= 4
+
+
+def test_calendar_jumps_ahead():
+    queue = CalendarQueue(width=1.0, num_buckets=4)
+    event = _Event(1e6, 0, noop)
+    queue.push(event)
+    assert queue.peek() is event
+    early = _Event(2.0, 1, noop)
+    queue.push(early)
+    assert queue.pop() is early
+    assert queue.pop() is event
+
+
+@pytest.mark.parametrize("width,num_buckets", [(0.0, 2), (inf, 2), (1.0, 0)])
+def test_calendar_invalid(width, num_buckets):
+    with pytest.raises(ValueError):
+        CalendarQueue(width, num_buckets)
+
+
+def sleeper(log, rng, name):
+    for _ in range(20):
+        advance(rng.choice([0.5, 1.0, rng.expovariate(1.0)]))
+        log.append((now(), name))
+
+
+def run_model(sim, duration):
+    log = []
+    for n in range(10):
+        sim.add(sleeper, log, Random(n), n)
+    sim.run(duration)
+    return log, sim.now()
+
+
+@pytest.mark.parametrize("duration", [inf, 7.0])
+def test_simulator_same_run(duration):
+    expected = run_model(Simulator(), duration)
+    assert run_model(Simulator(queue=CalendarQueue()), duration) == expected
+    assert run_model(Simulator(queue=HeapQueue()), duration) == expected
+
+
+def test_simulator_default_heap():
+    sim = Simulator()
+    assert sim.queue is None
+    sim._schedule(1.0, noop)
+    assert isinstance(sim._events, list)
+
+
+def test_simulator_queue_interface():
+    queue = CalendarQueue()
+    sim = Simulator(queue=queue)
+    assert sim.queue is queue
+    id_event = sim._schedule(2.0, noop)
+    sim._schedule_at(1.0, noop)
+    assert len(queue) == 2
+    assert sim._time_next() == 1.0
+    sim._cancel(id_event)
+    assert [moment for moment, *_ in sim.events()] == [1.0]
+    sim.step()
+    assert sim.now() == 1.0
+    sim._run_before(5.0)
+    assert sim.now() == 5.0
+    assert sim._time_next() == inf
+    with pytest.raises(ValueError):
+        sim._schedule(-1.0, noop)
+
+
+def test_simulator_queue_instrumented():
+    sim = Simulator(queue=CalendarQueue())
+    instruments = sim.instrument(file=StringIO())
+    log, _ = run_model(sim, inf)
+    assert len(log) == 200
+    assert instruments.num_events == 210
@@ -0,0 +1,137 @@
+from io import StringIO
+
+import greenlet
+import pytest
+
+from itsim.instrumentation import Instruments, name_handler
+from itsim.simulator import Simulator, advance, now
+
+
+def ticker(log, num):
+    for _ in range(num):
+        advance(1.0)
+        log.append(now())
+
+
+def tick(sim, log):
+    log.append(sim.now())
+
+
+def run_model(sim, duration=None):
+    log = []
+    sim.add(ticker, log, 5)
+    sim.add(ticker, log, 3)
+    sim._schedule(2.5, tick, sim, log)
+    if duration is None:
+        sim.run()
+    else:
+        sim.run(duration)
+    return log
+
+
+@pytest.fixture
+def output():
+    return StringIO()
+
+
+def test_disabled_by_default(capsys):
+    sim = Simulator()
+    assert sim.instruments is None
+    run_model(sim)
+    assert capsys.readouterr() == ("", "")
+
+
+def test_same_outcome(output):
+    sim = Simulator()
+    sim.instrument(file=output)
+    assert run_model(sim) == run_model(Simulator())
+
+
+def test_counts(output):
+    sim = Simulator()
+    instruments = sim.instrument(file=output)
+    run_model(sim)
+    assert instruments.num_events == 2 + 5 + 3 + 1
+    assert instruments.num_switches == 2 * (2 + 5 + 3)
+    assert instruments.time_sim == 5.0
+    assert instruments.time_wall > 0.0
+    assert instruments.events_per_second() > 0.0
+    assert sum(instruments.histogram) == instruments.num_events
+    assert {name: stats.count for name, stats in instruments.handlers.items()} == {"process:ticker": 10, "tick": 1}
+    for stats in instruments.handlers.values():
+        assert 0.0 < stats.time_mean <= stats.time_max <= stats.time_total
+
+
+def test_summary(output):
+    sim = Simulator()
+    sim.instrument(file=output)
+    run_model(sim)
+    lines = output.getvalue().splitlines()
+    assert lines[0].startswith("Events: 11 ")
+    assert lines[2].startswith("process:ticker ")
+    assert lines[3].startswith("tick ")
+
+
+def test_no_summary(output):
+    sim = Simulator()
+    sim.instrument(summary=False, file=output)
+    run_model(sim)
+    assert output.getvalue() == ""
+
+
+def test_progress(output):
+    sim = Simulator()
+    sim.instrument(progress_every=0.0, summary=False, file=output)
+    run_model(sim)
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 11
+    assert lines[-1].startswith("sim 5 s | wall ")
+
+
+def test_run_duration_resumed(output):
+    sim = Simulator()
+    instruments = sim.instrument(file=output)
+    log = run_model(sim, 2.5)
+    assert log == [1.0, 1.0, 2.0, 2.0, 2.5]
+    assert instruments.time_sim == 2.5
+    sim.run()
+    assert log == [1.0, 1.0, 2.0, 2.0, 2.5, 3.0, 3.0, 4.0, 5.0]
+    assert instruments.time_sim == 5.0
+    assert instruments.handlers["Simulator.stop"].count == 1
+
+
+def test_disabled_again(output):
+    sim = Simulator()
+    instruments = sim.instrument(file=output)
+    sim.instruments = None
+    run_model(sim)
+    assert instruments.num_events == 0
+
+
+def test_error_restores_trace(output):
+    def fail():
+        raise ValueError()
+
+    sim = Simulator()
+    sim.instruments = Instruments(file=output)
+    sim._schedule(1.0, fail)
+    with pytest.raises(ValueError):
+        sim.run()
+    assert greenlet.gettrace() is None
+    assert not sim.is_running
+
+
+def test_name_handler():
+    sim = Simulator()
+    proc = sim.add(ticker, [], 1)
+    assert name_handler(proc.switch) == "process:ticker"
+    assert name_handler(sim.stop) == "Simulator.stop"
+    assert name_handler(tick) == "tick"
+
+
+def test_trace_switches(output):
+    sim = Simulator()
+    instruments = sim.instrument(file=output, trace_switches=True)
+    run_model(sim)
+    assert instruments.num_switches == 2 * (2 + 5 + 3)
+    assert greenlet.gettrace() is None
@@ -0,0 +1,153 @@
+from functools import partial
+from random import Random
+
+import pytest
+
+from greensim.random import constant
+
+from itsim.machine.endpoint import Endpoint
+from itsim.network.link import Link
+from itsim.network.route import Relay
+from itsim.network.router import Router
+from itsim.pdes import links_cut, lookahead, LogicalProcess, Partition, partition_by_links, run_partitioned, \
+    run_sequential
+from itsim.simulator import Simulator, advance, now
+from itsim.types import Protocol
+from itsim.units import MS, MbPS
+
+
+LATENCY_BACKBONE = 5 * MS
+PORT_ECHO = 7
+NUM_PINGS = 20
+DURATION = 10.0
+
+
+def client(context, rng, dests, log):
+    with context.node.bind(Protocol.UDP) as socket:
+        for _ in range(NUM_PINGS):
+            advance(rng.expovariate(10.0))
+            socket.send((rng.choice(dests), PORT_ECHO), rng.randint(10, 1000))
+            socket.recv()
+            log.append(now())
+
+
+def echo(context, log):
+    with context.node.bind(Protocol.UDP, PORT_ECHO) as socket:
+        while True:
+            packet = socket.recv()
+            log.append((now(), str(packet.source.hostname)))
+            socket.send(packet.source, packet.byte_size)
+
+
+def segments(num_segments, num_hosts, index):
+    sim = Simulator()
+    backbone = Link(
+        "10.0.0.0/24",
+        constant(LATENCY_BACKBONE),
+        constant(100 * MbPS),
+        latency_min=LATENCY_BACKBONE
+    )
+    nodes = []
+    hosts = []
+    for s in range(num_segments):
+        lan = Link(f"10.{s + 1}.0.0/16", constant(1 * MS), constant(100 * MbPS))
+        router = Router().connected_to_static(
+            backbone,
+            f"10.0.0.{s + 1}",
+            [Relay(f"10.0.0.{t + 1}", f"10.{t + 1}.0.0/16") for t in range(num_segments) if t != s]
+        ).connected_to_static(lan, 1)
+        nodes.append(router)
+        for h in range(num_hosts):
+            address = f"10.{s + 1}.0.{h + 10}"
+            host = Endpoint().connected_to_static(lan, address, [Relay(f"10.{s + 1}.0.1", "10.0.0.0/8")])
+            nodes.append(host)
+            hosts.append((s, address, host))
+
+    partition = Partition(sim, nodes, partition_by_links(nodes, [backbone], num_segments), index, {})
+    for n, (s, _, host) in enumerate(hosts):
+        if partition.is_local(host):
+            logs = partition.model[n] = {"pongs": [], "pings": []}
+            dests = [address for t, address, _ in hosts if t != s]
+            host.run_proc(sim, client, Random(n), dests, logs["pongs"])
+            host.run_proc(sim, echo, logs["pings"])
+    return partition
+
+
+def logs(partition):
+    return partition.model
+
+
+@pytest.fixture
+def scenario():
+    return partial(segments, 2, 2)
+
+
+def broken(index):
+    if index == 1:
+        raise RuntimeError("Partition 1 cannot be built.")
+    return segments(2, 1, index)
+
+
+def test_partition_by_links(scenario):
+    partition = scenario(None)
+    backbone = links_cut(partition.nodes, partition.assignment)
+    assert partition.assignment == [0, 0, 0, 1, 1, 1]
+    assert partition_by_links(partition.nodes, [], 2) == [0] * 6
+    assert partition_by_links(partition.nodes, backbone, 1) == [0] * 6
+
+
+def test_partition_by_links_balance():
+    partition = segments(4, 2, None)
+    backbone = links_cut(partition.nodes, partition.assignment)
+    assert partition_by_links(partition.nodes, backbone, 2) == [0, 0, 0, 1, 1, 1, 0, 0, 0, 1, 1, 1]
+
+
+def test_links_cut(scenario):
+    partition = scenario(None)
+    cut = links_cut(partition.nodes, partition.assignment)
+    assert [str(link.cidr) for link in cut] == ["10.0.0.0/24"]
+    assert lookahead(cut) == pytest.approx(LATENCY_BACKBONE)
+
+
+def test_lookahead_needs_latency_min():
+    link = Link("10.0.0.0/24", constant(1 * MS), constant(100 * MbPS))
+    with pytest.raises(ValueError):
+        lookahead([link])
+    assert lookahead([]) == float("inf")
+
+
+def test_logical_process_posts_remote(scenario):
+    partition = scenario(0)
+    lp = LogicalProcess(partition)
+    assert lp.lookahead == pytest.approx(LATENCY_BACKBONE)
+    messages = lp.run_window(1.0)
+    assert len(messages) > 0
+    for moment, index_partition, index_node, packet, bound_only in messages:
+        assert index_partition == 1
+        assert partition.assignment[index_node] == 1
+        assert moment >= LATENCY_BACKBONE
+        assert not bound_only
+    assert lp.sim.now() == 1.0
+
+
+def test_logical_process_whole_model_rejected(scenario):
+    with pytest.raises(ValueError):
+        LogicalProcess(scenario(None))
+
+
+def test_partitioned_matches_sequential(scenario):
+    expected = run_sequential(scenario, DURATION, {"logs": logs})["logs"]
+    assert sum(len(log["pongs"]) for log in expected.values()) == NUM_PINGS * len(expected)
+    results = run_partitioned(scenario, 2, DURATION, {"logs": logs})
+    assert len(results) == 2
+    merged = {}
+    for result in results:
+        assert set(merged.keys()).isdisjoint(result["logs"].keys())
+        merged.update(result["logs"])
+    assert merged == expected
+
+
+def test_partitioned_error_reported():
+    with pytest.raises(RuntimeError) as info:
+        run_partitioned(broken, 2, DURATION, {"logs": logs})
+    assert "Partition 1 failed" in str(info.value)
@@ -0,0 +1,87 @@
+from random import Random
+
+import pytest
+
+from greensim.random import constant
+
+from itsim.network.link import Link
+from itsim.random import block_constant, block_expo, block_lognormal, block_normal, block_uniform, bounded_var, \
+    num_bytes
+
+np = pytest.importorskip("numpy")
+
+
+def take_next(gen, n):
+    return [next(gen) for _ in range(n)]
+
+
+@pytest.mark.parametrize("make", [
+    lambda rng, size: block_uniform(2.0, 5.0, rng, size),
+    lambda rng, size: block_normal(10.0, 3.0, rng, size),
+    lambda rng, size: block_expo(4.0, rng, size),
+    lambda rng, size: block_lognormal(0.0, 1.0, rng, size)
+])
+def test_block_reproducible_regardless_of_block_size(make):
+    samples = take_next(make(Random(42), 4096), 100)
+    assert take_next(make(Random(42), 7), 100) == samples
+    assert take_next(make(Random(43), 4096), 100) != samples
+
+
+def test_block_samples_are_python_floats():
+    assert all(type(x) is float for x in take_next(block_normal(0.0, 1.0, Random(1), 16), 20))
+
+
+def test_block_constant():
+    assert take_next(block_constant(3.5, 4), 10) == [3.5] * 10
+
+
+def test_block_uniform_range():
+    samples = np.array(take_next(block_uniform(2.0, 5.0, Random(1), 64), 1000))
+    assert samples.min() >= 2.0
+    assert samples.max() < 5.0
+
+
+def test_block_bounded():
+    gen = bounded_var(bounded_var(block_normal(0.0, 10.0, Random(1), 64), lower=-1.0), upper=1.0)
+    samples = take_next(gen, 1000)
+    assert min(samples) == -1.0
+    assert max(samples) == 1.0
+
+
+def test_block_take():
+    gen = block_uniform(0.0, 1.0, Random(5), 8)
+    samples = take_next(block_uniform(0.0, 1.0, Random(5), 8), 30)
+    assert take_next(gen, 3) == samples[:3]
+    taken = gen.take(20)
+    assert isinstance(taken, np.ndarray)
+    assert taken.tolist() == samples[3:23]
+
+
+def test_block_size_positive():
+    with pytest.raises(ValueError):
+        block_constant(1.0, 0)
+
+
+def test_num_bytes_block():
+    sizes = take_next(num_bytes(block_normal(100.0, 80.0, Random(2), 32), header=20, upper=200), 1000)
+    assert all(type(size) is int for size in sizes)
+    assert min(sizes) == 0
+    assert max(sizes) == 200
+
+
+def test_num_bytes_block_matches_generator():
+    normal_sizes = take_next(num_bytes(iter(take_next(block_normal(100.0, 80.0, Random(2), 32), 200)), 20, 200), 200)
+    assert take_next(num_bytes(block_normal(100.0, 80.0, Random(2), 32), 20, 200), 200) == normal_sizes
+
+
+def test_link_block_sampled():
+    link = Link("10.0.0.0/24", block_normal(0.0, 1.0, Random(3), 16), block_constant(1000.0))
+    latencies = take_next(link._latency, 100)
+    assert min(latencies) == 0.0
+    assert take_next(link._bandwidth, 3) == [1000.0] * 3
+
+
+def test_link_generator_sampled():
+    link = Link("10.0.0.0/24", constant(-1.0), constant(0.0))
+    assert next(link._latency) == 0.0
+    assert next(link._bandwidth) > 0.0
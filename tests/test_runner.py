@@ -0,0 +1,122 @@
+import os
+
+import pytest
+
+from greensim.random import expo
+
+from itsim import ITObject
+from itsim.runner import replicate, replicate_all, run_replication, seed_of_params
+from itsim.simulator import Simulator, advance, now
+
+
+class Arrivals:
+
+    def __init__(self, params) -> None:
+        self.sim = Simulator()
+        self.times = []
+        self.obj = ITObject()
+        self.sim.add(self._arrive, expo(params.get("mean", 1.0) if isinstance(params, dict) else 1.0))
+
+    def _arrive(self, delays) -> None:
+        while True:
+            advance(next(delays))
+            self.times.append(now())
+
+    def run(self, duration: float) -> None:
+        self.sim.run(duration)
+
+
+def arrivals(params):
+    return Arrivals(params)
+
+
+def num_arrivals(model: Arrivals) -> int:
+    return len(model.times)
+
+
+def times(model: Arrivals):
+    return model.times
+
+
+def uuid_first(model: Arrivals):
+    return model.obj.uuid
+
+
+EXTRACTORS = {"num": num_arrivals, "times": times, "uuid": uuid_first}
+
+
+def failing(params):
+    raise RuntimeError(f"Scenario {params} fails.")
+
+
+def failing_once(path):
+    if not os.path.exists(path):
+        open(path, "w").close()
+        raise RuntimeError("First attempt fails.")
+    return Arrivals(0)
+
+
+def crashing_once(path):
+    if not os.path.exists(path):
+        open(path, "w").close()
+        os._exit(1)
+    return Arrivals(0)
+
+
+def test_seed_of_params():
+    assert seed_of_params(42) == 42
+    assert seed_of_params({"seed": 7, "mean": 2.0}) == 7
+    assert seed_of_params(("a", 1)) == seed_of_params(("a", 1))
+
+
+def test_run_replication_reproducible():
+    results = [run_replication(arrivals, 3, 3, EXTRACTORS, 10.0) for _ in range(2)]
+    assert results[0] == results[1]
+    assert results[0]["num"] > 0
+    assert results[0] != run_replication(arrivals, 4, 4, EXTRACTORS, 10.0)
+
+
+def test_replicate_matches_serial():
+    seeds = [1, 2, 3, 4, 5]
+    results = list(replicate(arrivals, seeds, EXTRACTORS, duration=10.0, max_workers=2))
+    assert sorted(r.index for r in results) == list(range(len(seeds)))
+    for result in results:
+        assert result.is_success()
+        assert result.attempts == 1
+        assert result.seed == seeds[result.index]
+        assert result.results == run_replication(arrivals, result.params, result.seed, EXTRACTORS, 10.0)
+
+
+def test_replicate_all_sorted():
+    runs = [{"seed": 10, "mean": 0.5}, {"seed": 11, "mean": 2.0}]
+    results = replicate_all(arrivals, runs, {"num": num_arrivals}, duration=20.0, max_workers=2)
+    assert [r.params for r in results] == runs
+    assert [r.seed for r in results] == [10, 11]
+
+
+def test_replicate_failure_reported():
+    results = replicate_all(failing, [1, 2], EXTRACTORS, retries=2, max_workers=1)
+    for result in results:
+        assert not result.is_success()
+        assert isinstance(result.error, RuntimeError)
+        assert result.results == {}
+        assert result.attempts == 3
+
+
+def test_replicate_retry(tmp_path):
+    path = str(tmp_path / "failed")
+    result, = replicate_all(failing_once, [path], {"num": num_arrivals}, duration=10.0, retries=1, seed_of=len)
+    assert result.is_success()
+    assert result.attempts == 2
+
+
+def test_replicate_worker_crash(tmp_path):
+    path = str(tmp_path / "crashed")
+    result, = replicate_all(crashing_once, [path], {"num": num_arrivals}, duration=10.0, retries=1, seed_of=len)
+    assert result.is_success()
+    assert result.attempts == 2
+
+
+def test_replicate_retries_negative():
+    with pytest.raises(ValueError):
+        list(replicate(arrivals, [1], EXTRACTORS, retries=-1))
@@ -0,0 +1,147 @@
+import gc
+from random import Random
+
+import greensim
+import pytest
+
+from itsim.simulator import _wait_signal, Event, set_timer, Simulator, advance, now
+from itsim.types import Timeout
+
+
+def abandon_simulation():
+    sim = Simulator()
+    sim.add(advance, 100)
+    sim.run(10)
+    # The process left hanging keeps the simulator alive through a cycle, so only the garbage collector destroys it.
+    sim._cycle = sim
+
+
+def test_collected_simulator_keeps_process_running():
+    log = []
+
+    def collect():
+        gc.collect()
+        log.append(now())
+
+    gc.disable()
+    try:
+        abandon_simulation()
+    finally:
+        gc.enable()
+    sim = Simulator()
+    sim.add_in(5, collect)
+    sim.run()
+    assert log == [5]
+
+
+def fire(log, name):
+    log.append((now(), name))
+
+
+def test_timers_fire_at_their_moment():
+    sim = Simulator()
+    log = []
+    rng = Random(1)
+    delays = [
+        rng.choice([0.0, 0.05, 0.1, 3.0, 3.0, 100.0]) + rng.random() * rng.choice([0.0, 1.0, 1e4])
+        for _ in range(300)
+    ]
+    timers = [sim.timers.set(delay, fire, log, n) for n, delay in enumerate(delays)]
+    for timer in timers[::3]:
+        timer.cancel()
+    sim.run()
+    expected = sorted((delay, n) for n, delay in enumerate(delays) if n % 3 != 0)
+    assert log == expected
+    assert all(timer.is_cancelled != timer.has_fired for timer in timers)
+    assert len(sim.timers) == 0
+
+
+def test_timers_set_along_the_run():
+    sim = Simulator()
+    log = []
+
+    def proc():
+        for k in range(50):
+            advance(7.3)
+            set_timer(k * 1.7, fire, log, k)
+
+    sim.add(proc)
+    sim.run()
+    expected = []
+    moment = 0.0
+    for k in range(50):
+        moment += 7.3
+        expected.append((moment + k * 1.7, k))
+    assert log == sorted(expected)
+
+
+def test_timer_cancelled_holds_no_event():
+    sim = Simulator()
+    timers = [sim.timers.set(1000.0 + n, fire, [], n) for n in range(1000)]
+    assert len(sim._events) == 1
+    for timer in timers:
+        timer.cancel()
+    assert len(sim.timers) == 0
+    sim.run()
+    assert sim.now() <= 1000.0
+
+
+def test_timer_negative_delay():
+    with pytest.raises(ValueError):
+        Simulator().timers.set(-1.0, fire, [], 0)
+
+
+def test_event_wait_timeout_frees_no_process():
+    sim = Simulator()
+    event = Event()
+    log = []
+
+    def waiter():
+        try:
+            event.wait(5.0)
+            log.append(("fired", now()))
+        except Timeout:
+            log.append(("timeout", now()))
+
+    def firer():
+        advance(2.0)
+        event.fire()
+
+    sim.add(waiter)
+    sim.run(1.0)
+    assert not any(isinstance(getattr(fn, "__self__", None), greensim.Process) for _, fn, _, _ in sim.events())
+    sim.add(firer)
+    sim.add_in(10.0, waiter)
+    sim.run()
+    assert log == [("fired", 3.0), ("fired", 11.0)]
+
+    sim = Simulator()
+    event = Event()
+    sim.add(waiter)
+    sim.run()
+    assert log[-1] == ("timeout", 5.0)
+
+
+def test_signal_wait_timeout_rejoins():
+    # A waiter resumed by the signal at the moment its timeout elapses, but which finds the signal off again, times
+    # out rather than wait indefinitely.
+    sim = Simulator()
+    signal = greensim.Signal().turn_off()
+    log = []
+
+    def waiter():
+        try:
+            _wait_signal(signal, 3.0)
+            log.append(("on", now()))
+        except greensim.Timeout:
+            log.append(("timeout", now()))
+
+    def toggler():
+        advance(3.0)
+        signal.turn_on()
+        signal.turn_off()
+
+    sim.add(waiter)
+    sim.add(toggler)
+    sim.run(10.0)
+    assert log == [("timeout", 3.0)]
@@ -0,0 +1,136 @@
+from io import StringIO
+import json
+
+import pytest
+
+from greensim.random import constant
+
+from itsim.machine.endpoint import Endpoint
+from itsim.machine.socket import Timeout
+from itsim.network.link import Link
+from itsim.simulator import Simulator, advance
+from itsim.tracing import get_recorder, recording, set_recorder, TraceRecorder
+from itsim.types import Protocol
+from itsim.units import MS, MbPS
+
+
+PORT = 9887
+
+
+def client(context):
+    with context.node.bind(Protocol.UDP) as socket:
+        advance(1.0)
+        socket.send(("10.11.12.20", PORT), 100, {"content": "ping"})
+        socket.recv()
+
+
+def server(context):
+    with context.node.bind(Protocol.UDP, PORT) as socket:
+        packet = socket.recv()
+        socket.send(packet.source, 200)
+        try:
+            socket.recv(1.0)
+        except Timeout:
+            pass
+
+
+def run_ping_pong():
+    sim = Simulator()
+    link = Link("10.11.12.0/24", constant(10 * MS), constant(8 * 1000 * MbPS))
+    pinger = Endpoint().connected_to_static(link, "10.11.12.10")
+    ponger = Endpoint().connected_to_static(link, "10.11.12.20")
+    pinger.run_proc(sim, client)
+    ponger.run_proc(sim, server)
+    sim.run()
+    return link, pinger, ponger
+
+
+def test_ring_buffer():
+    recorder = TraceRecorder(capacity=3)
+    for n in range(5):
+        recorder.record("test", f"span {n}", float(n), 1.0, None, "track")
+    assert len(recorder) == 3
+    assert [span.name for span in recorder] == ["span 2", "span 3", "span 4"]
+    recorder.clear()
+    assert len(recorder) == 0
+
+
+def test_sampling():
+    recorder = TraceRecorder(rate=0.25)
+    assert [recorder.sample() for _ in range(8)] == [False, False, False, True] * 2
+    assert recorder.num_sampled_out == 6
+
+
+@pytest.mark.parametrize("capacity,rate", [(0, 1.0), (10, 0.0), (10, 1.5)])
+def test_recorder_invalid(capacity, rate):
+    with pytest.raises(ValueError):
+        TraceRecorder(capacity, rate)
+
+
+def test_recording_restores():
+    assert get_recorder() is None
+    with recording() as recorder:
+        assert get_recorder() is recorder
+        with recording(TraceRecorder()) as inner:
+            assert get_recorder() is inner
+        assert get_recorder() is recorder
+    assert get_recorder() is None
+    assert set_recorder(None) is None
+
+
+def test_spans_recorded():
+    with recording() as recorder:
+        link, pinger, ponger = run_ping_pong()
+    spans = {}
+    for span in recorder:
+        spans.setdefault(span.category, []).append(span)
+    assert set(spans.keys()) == {"packet", "recv", "computation", "thread"}
+
+    ping, pong = sorted(spans["packet"], key=lambda span: span.start)
+    assert ping.group is link
+    assert ping.start == pytest.approx(1.0)
+    assert ping.duration == pytest.approx(10 * MS + 100 / (1000 * MbPS))
+    assert ping.track == "10.11.12.10"
+    assert ping.args["bytes"] == 100
+    assert pong.track == "10.11.12.20"
+
+    waits = sorted((span for span in spans["recv"] if span.group is ponger), key=lambda span: span.start)
+    assert [span.args["timeout"] for span in waits] == [False, True]
+    assert waits[0].duration == pytest.approx(ping.duration + 1.0)
+    assert waits[1].duration == pytest.approx(1.0)
+
+    computations = {span.group: span for span in spans["computation"]}
+    assert computations[pinger].name == "client"
+    assert computations[ponger].name == "server"
+    assert computations[ponger].duration == pytest.approx(waits[1].start + 1.0)
+    for span in spans["thread"]:
+        assert span.duration == computations[span.group].duration
+
+
+def test_callback_computation_recorded():
+    sim = Simulator()
+    endpoint = Endpoint()
+    with recording() as recorder:
+        endpoint._default_process_parent.exc_callback_in(sim, 2.0, lambda context: None)
+        sim.run()
+    computation, = [span for span in recorder if span.category == "computation"]
+    assert computation.start == 2.0
+    assert computation.duration == 0.0
+
+
+def test_chrome_trace():
+    with recording() as recorder:
+        run_ping_pong()
+    output = StringIO()
+    recorder.export(output)
+    trace = json.loads(output.getvalue())
+    events = trace["traceEvents"]
+    names_group = {event["args"]["name"] for event in events if event["name"] == "process_name"}
+    assert names_group == {"Link 10.11.12.0/24", "Endpoint 10.11.12.10", "Endpoint 10.11.12.20"}
+    spans = [event for event in events if event["ph"] == "X"]
+    assert len(spans) == len(recorder)
+    packet = min((event for event in spans if event["cat"] == "packet"), key=lambda event: event["ts"])
+    assert packet["ts"] == pytest.approx(1e6)
+    assert packet["name"].startswith("10.11.12.10:")
+    ids_named = {(event["pid"], event["tid"]) for event in events if event["name"] == "thread_name"}
+    assert {(event["pid"], event["tid"]) for event in spans} <= ids_named
@@ -1,11 +1,13 @@
 from ipaddress import ip_address
+import pickle
 import re
 
 import pytest
 
 from itsim import ITObject
 from itsim.network.location import Location
-from itsim.types import as_address, as_hostname, as_port, Protocol, AddressError, is_ip_address, HostnameError
+from itsim.types import as_address, as_hostname, as_port, Protocol, AddressError, is_ip_address, HostnameError, \
+    as_address_int, int_as_address, addresses_as_ints, ints_as_addresses, as_cidr, cidr_as_ints
 
 
 def test_none_as_address():
@@ -53,6 +55,47 @@ def test_as_address_hostname():
             as_address(name)
 
 
+def test_as_address_ipv6_absolute():
+    assert as_address("2001:db8::1") == ip_address("2001:db8::1")
+
+
+def test_as_address_address_unaltered():
+    address = ip_address("192.168.4.56")
+    assert as_address(address) is address
+    assert as_address(address, "0.0.0.0/0") is address
+
+
+def test_as_cidr_parsed_once():
+    assert as_cidr("10.10.128.0/17") is as_cidr("10.10.128.0/17")
+
+
+def test_address_int_round_trip():
+    for n in [0, 1, 0xc0a80438, 2**32 - 1]:
+        assert as_address_int(n) == n
+        assert int_as_address(n) == as_address(n)
+        assert as_address_int(int_as_address(n)) == n
+    assert as_address_int("192.168.4.56") == 0xc0a80438
+    assert as_address_int(4, "192.168.1.0/24") == 0xc0a80104
+    for n in [-1, 2**32]:
+        with pytest.raises(ValueError):
+            as_address_int(n)
+
+
+def test_addresses_as_ints_bulk():
+    addresses = ["10.0.0.1", 0xc0a80438, ip_address("255.255.255.255"), None]
+    ints = addresses_as_ints(addresses)
+    assert ints.itemsize == 4
+    assert list(ints) == [0x0a000001, 0xc0a80438, 2**32 - 1, 0]
+    assert ints_as_addresses(ints) == [as_address(a) for a in addresses]
+
+
+def test_cidr_as_ints():
+    network, netmask = cidr_as_ints("10.10.128.0/17")
+    assert (network, netmask) == (0x0a0a8000, 0xffff8000)
+    assert as_address_int("10.10.200.1") & netmask == network
+    assert as_address_int("10.10.1.1") & netmask != network
+
+
 def test_none_as_port():
     assert as_port(None) == 0
 
@@ -171,6 +214,27 @@ def test_location_repr():
 def test_location_hash():
     loc = Location("google.ca", 25)
     assert hash(loc) == hash(str(loc))
+    assert hash(loc) == hash(loc)
+
+
+def test_location_interned():
+    loc = Location("192.168.203.1", 9887)
+    assert Location(as_address("192.168.203.1"), 9887) is loc
+    assert Location.from_repr(("192.168.203.1", 9887)) is loc
+    assert Location("192.168.203.1", 9888) is not loc
+
+
+def test_location_immutable():
+    loc = Location("192.168.203.1", 9887)
+    with pytest.raises(AttributeError):
+        loc._port = 80
+    with pytest.raises(AttributeError):
+        loc.whatever = 80
+
+
+def test_location_pickle():
+    loc = Location("google.ca", 25)
+    assert pickle.loads(pickle.dumps(loc)) is loc
 
 
 def test_protocol_name():